@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the scalar classifiers in class_exercises against white_box.batch.
+
+Run with: python -m benchmarks.bench_batch
+"""
+import numpy as np
+
+from benchmarks.common import best_of, print_comparison
+from white_box import batch
+from white_box.class_exercises import (
+    calculate_order_total,
+    calculate_total_discount,
+    categorize_product,
+    check_number_status,
+    get_grade,
+    is_even,
+    verify_age,
+)
+
+ROWS = 200_000
+
+CASES = (
+    ("is_even", is_even, batch.are_even, (-1000, 1000)),
+    ("check_number_status", check_number_status, batch.check_number_statuses, (-5, 5)),
+    ("get_grade", get_grade, batch.get_grades, (0, 100)),
+    ("verify_age", verify_age, batch.verify_ages, (0, 100)),
+    ("categorize_product", categorize_product, batch.categorize_products, (0, 300)),
+    (
+        "calculate_total_discount",
+        calculate_total_discount,
+        batch.calculate_total_discounts,
+        (0, 1000),
+    ),
+)
+
+
+def main():
+    """
+    Runs every benchmark case and prints the results.
+    """
+    rng = np.random.default_rng(0)
+    for name, scalar, vectorized, (low, high) in CASES:
+        values = rng.integers(low, high, ROWS)
+        as_list = values.tolist()
+        scalar_seconds = best_of(lambda f=scalar, v=as_list: [f(x) for x in v])
+        batch_seconds = best_of(lambda f=vectorized, v=values: f(v))
+        print_comparison(name, ROWS, scalar_seconds, batch_seconds)
+
+    quantities = rng.integers(1, 20, ROWS)
+    prices = rng.uniform(1, 100, ROWS)
+    items = [
+        {"quantity": quantity, "price": price}
+        for quantity, price in zip(quantities.tolist(), prices.tolist())
+    ]
+    scalar_seconds = best_of(lambda: calculate_order_total(items))
+    batch_seconds = best_of(
+        lambda: batch.calculate_order_total_columnar(quantities, prices)
+    )
+    print_comparison("calculate_order_total", ROWS, scalar_seconds, batch_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the scalar card check plus a Luhn pass against white_box.cards.
+
+The headline is a NumPy bytes array, the input validate_cards is built for;
+the list line adds packing Python strings, about as costly as validating.
+
+Run with: python -m benchmarks.bench_cards
+"""
+import numpy as np
+
+from benchmarks.common import best_of, print_comparison
+from white_box.cards import luhn_checksum_valid, validate_cards
+from white_box.class_exercises import validate_credit_card
+
+ROWS = 200_000
+
+
+def scalar_loop(card_numbers):
+    """
+    What callers do today: validate_credit_card followed by a Luhn pass.
+    """
+    return [
+        validate_credit_card(number) == "Valid Card" and luhn_checksum_valid(number)
+        for number in card_numbers
+    ]
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(12, 18, ROWS)
+    card_numbers = [
+        "".join(map(str, rng.integers(0, 10, length))) for length in lengths
+    ]
+    scalar_seconds = best_of(lambda: scalar_loop(card_numbers))
+    packed = np.array(card_numbers, dtype="S16")
+    packed_seconds = best_of(lambda: validate_cards(packed, with_issuers=True))
+    print_comparison("validate_cards (S16 array)", ROWS, scalar_seconds, packed_seconds)
+
+    batch_seconds = best_of(lambda: validate_cards(card_numbers, with_issuers=True))
+    print_comparison(
+        "validate_cards (list of str)", ROWS, scalar_seconds, batch_seconds
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Login throughput of BankingSystem.authenticate with the default scrypt
+credential store, with and without its verified-session cache.
+
+Every user logs in and out LOGINS_PER_USER times, so all logins but the
+first of each user can be served from the cache.
+
+Run with: python -m benchmarks.bench_credentials
+"""
+import contextlib
+import io
+
+from benchmarks.common import best_of, print_comparison
+from white_box.class_exercises import BankingSystem
+from white_box.credentials import CredentialStore, ScryptHasher
+
+USERS = 10
+LOGINS_PER_USER = 20
+
+
+def bank(session_ttl):
+    """
+    A bank with USERS users sharing the password "password".
+    """
+    users = CredentialStore(session_ttl=session_ttl)
+    # Hash once and share: the benchmark measures logins, not sign-ups.
+    encoded = ScryptHasher().hash("password")
+    for number in range(USERS):
+        users.set_hash(f"user{number}", encoded)
+    return BankingSystem(users=users)
+
+
+def logins(banking_system):
+    """
+    Logs every user in and out LOGINS_PER_USER times.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(LOGINS_PER_USER):
+            for number in range(USERS):
+                username = f"user{number}"
+                banking_system.authenticate(username, "password")
+                banking_system.logged_in_users.discard(username)
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    uncached = bank(session_ttl=0)
+    cached = bank(session_ttl=300)
+    uncached_seconds = best_of(lambda: logins(uncached), repeat=1)
+    cached_seconds = best_of(lambda: logins(cached), repeat=1)
+    print_comparison(
+        "authenticate session cache",
+        USERS * LOGINS_PER_USER,
+        uncached_seconds,
+        cached_seconds,
+    )
+    rate = USERS * LOGINS_PER_USER
+    print(
+        f"logins/s without cache={rate / uncached_seconds:10.1f}"
+        f" with cache={rate / cached_seconds:10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
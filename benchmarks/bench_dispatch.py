@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the LOOK and SCAN dispatch policies under heavy synthetic load.
+
+Run with: python -m benchmarks.bench_dispatch
+"""
+import time
+
+from white_box.dispatch import POLICIES, Dispatcher, synthetic_calls
+
+CALLS = 50_000
+CARS = 6
+FLOORS = 30
+RATES = (0.2, 0.4)
+
+
+def main():
+    """
+    Runs every policy at every load and prints the percentiles.
+    """
+    for rate in RATES:
+        calls = synthetic_calls(CALLS, FLOORS, rate)
+        for policy in POLICIES:
+            start = time.perf_counter()
+            report = Dispatcher(CARS, FLOORS, policy).simulate(calls)
+            seconds = time.perf_counter() - start
+            waits = " ".join(
+                f"p{p}={value:6.1f}" for p, value in report.wait_percentiles.items()
+            )
+            trips = " ".join(
+                f"p{p}={value:6.1f}" for p, value in report.trip_percentiles.items()
+            )
+            print(
+                f"rate={rate:<4} {policy:<5} served={report.served:<7}"
+                f" wait[{waits}] trip[{trips}] ({seconds:.2f}s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the cost of saving a small edit to a tiny and to a large document
+with white_box.documents.Document.
+
+Run with: python -m benchmarks.bench_documents
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from white_box.documents import Document
+
+SIZES = (1 << 10, 256 << 20)
+SAVES = 200
+
+
+def save_seconds(path):
+    """
+    Average time of a one-line edit followed by a save.
+    """
+    with Document(path) as document:
+        start = time.perf_counter()
+        for number in range(SAVES):
+            document.insert(len(document) // 2, b"line %d\n" % number)
+            document.save_document()
+        return (time.perf_counter() - start) / SAVES
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        for size in SIZES:
+            path = os.path.join(directory, f"doc{size}")
+            with open(path, "wb") as file:
+                file.truncate(size)
+            start = time.perf_counter()
+            with open(path, "rb") as source, open(path + ".copy", "wb") as target:
+                shutil.copyfileobj(source, target)
+            rewrite = time.perf_counter() - start
+            print(
+                f"size={size:>11} bytes  save={save_seconds(path) * 1000:7.3f}ms"
+                f"  full rewrite={rewrite * 1000:9.3f}ms"
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares per-instance memory and transition latency of the table-driven
+state machines against the former string-comparing classes.
+
+Run with: python -m benchmarks.bench_fsm
+"""
+import tracemalloc
+
+from benchmarks.common import best_of, print_comparison
+from white_box.class_exercises import ElevatorSystem, TrafficLight
+
+INSTANCES = 200_000
+TRANSITIONS = 2_000_000
+
+
+class LegacyElevatorSystem:
+    """
+    ElevatorSystem as it was before the table-driven core.
+    """
+
+    def __init__(self):
+        """
+        Starts idle, with the state name in the instance __dict__.
+        """
+        self.state = "Idle"
+
+    def move_up(self):
+        """
+        Function to move up the elevator.
+        """
+        if self.state == "Idle":
+            self.state = "Moving Up"
+            return "Elevator moving up"
+        return "Invalid operation in current state"
+
+    def stop(self):
+        """
+        Function to stop the elevator.
+        """
+        if self.state in ["Moving Up", "Moving Down"]:
+            self.state = "Idle"
+            return "Elevator stopped"
+        return "Invalid operation in current state"
+
+
+class LegacyTrafficLight:  # pylint: disable=too-few-public-methods
+    """
+    TrafficLight as it was before the table-driven core.
+    """
+
+    def __init__(self):
+        """
+        Starts red, with the state name in the instance __dict__.
+        """
+        self.state = "Red"
+
+    def change_state(self):
+        """
+        Function that changes the traffic light state.
+        """
+        if self.state == "Red":
+            self.state = "Green"
+        elif self.state == "Green":
+            self.state = "Yellow"
+        elif self.state == "Yellow":
+            self.state = "Red"
+
+
+def bytes_per_instance(cls):
+    """
+    Measures the memory allocated per instance of cls.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls() for _ in range(INSTANCES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    # The list itself holds one pointer per instance.
+    return (after - before) / INSTANCES - 8
+
+
+def ride(elevator):
+    """
+    Fires TRANSITIONS events on one elevator.
+    """
+    move_up = elevator.move_up
+    stop = elevator.stop
+    for _ in range(TRANSITIONS // 2):
+        move_up()
+        stop()
+
+
+def cycle(light):
+    """
+    Fires TRANSITIONS events on one traffic light.
+    """
+    change_state = light.change_state
+    for _ in range(TRANSITIONS):
+        change_state()
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    legacy_bytes = bytes_per_instance(LegacyElevatorSystem)
+    table_bytes = bytes_per_instance(ElevatorSystem)
+    print(
+        f"{'bytes per instance':<28} baseline={legacy_bytes:8.1f}"
+        f" candidate={table_bytes:8.1f}"
+    )
+    legacy_seconds = best_of(lambda: ride(LegacyElevatorSystem()), repeat=7)
+    table_seconds = best_of(lambda: ride(ElevatorSystem()), repeat=7)
+    print_comparison(
+        "ElevatorSystem transitions", TRANSITIONS, legacy_seconds, table_seconds
+    )
+
+    legacy_seconds = best_of(lambda: cycle(LegacyTrafficLight()), repeat=7)
+    table_seconds = best_of(lambda: cycle(TrafficLight()), repeat=7)
+    print_comparison(
+        "TrafficLight transitions", TRANSITIONS, legacy_seconds, table_seconds
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cost of white_box.instrumentation on ElevatorSystem transitions: disabled
+(after uninstrument), counters only, and counters with latency histograms.
+
+Run with: python -m benchmarks.bench_instrumentation
+"""
+from benchmarks.common import best_of
+from white_box import instrumentation
+from white_box.class_exercises import ElevatorSystem
+
+TRANSITIONS = 2_000_000
+
+
+def ride():
+    """
+    Fires TRANSITIONS events on one elevator.
+    """
+    elevator = ElevatorSystem()
+    move_up = elevator.move_up
+    stop = elevator.stop
+    for _ in range(TRANSITIONS // 2):
+        move_up()
+        stop()
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    baseline = best_of(ride, repeat=7)
+    instrumentation.instrument(ElevatorSystem)
+    instrumentation.uninstrument(ElevatorSystem)
+    runs = [("disabled", best_of(ride, repeat=7))]
+    instrumentation.instrument(ElevatorSystem)
+    runs.append(("counters", best_of(ride, repeat=7)))
+    instrumentation.instrument(ElevatorSystem, latency=True)
+    runs.append(("counters + latency", best_of(ride, repeat=7)))
+    instrumentation.uninstrument(ElevatorSystem)
+
+    print(f"{'never instrumented':<20} {baseline * 1e9 / TRANSITIONS:7.1f} ns/event")
+    for name, seconds in runs:
+        overhead = (seconds / baseline - 1) * 100
+        print(
+            f"{name:<20} {seconds * 1e9 / TRANSITIONS:7.1f} ns/event"
+            f" ({overhead:+.1f}%)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares BankingSystem.transfer_money in a loop against
+BankingSystem.transfer_batch.
+
+Run with: python -m benchmarks.bench_ledger
+"""
+import contextlib
+import io
+
+import numpy as np
+
+from benchmarks.common import best_of, print_comparison
+from white_box.class_exercises import BankingSystem
+
+ROWS = 200_000
+PAYEES = 10_000
+
+
+def bank():
+    """
+    A bank with its mock user logged in and plenty of funds.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        banking_system = BankingSystem()
+        banking_system.authenticate("user123", "pass123")
+    banking_system.ledger.deposit("user123", 10**9)
+    return banking_system
+
+
+def single_transfers(receivers, amounts, types):
+    """
+    What callers do today: one transfer_money call per row.
+    """
+    banking_system = bank()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for receiver, amount, kind in zip(receivers, amounts, types):
+            banking_system.transfer_money("user123", receiver, amount, kind)
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    rng = np.random.default_rng(0)
+    receivers = [f"payee{number}" for number in rng.integers(0, PAYEES, ROWS)]
+    amounts = np.round(rng.uniform(1, 500, ROWS), 2)
+    types = rng.choice(["regular", "express", "scheduled"], ROWS).tolist()
+    senders = ["user123"] * ROWS
+
+    single_seconds = best_of(
+        lambda: single_transfers(receivers, amounts.tolist(), types), repeat=1
+    )
+    batch_seconds = best_of(
+        lambda: bank().transfer_batch(senders, receivers, amounts, types)
+    )
+    print_comparison("transfer_batch", ROWS, single_seconds, batch_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Login/logout throughput of white_box.sessions.SessionStore from a thread
+pool, for several shard counts (one shard is a single global lock).
+
+Run with: python -m benchmarks.bench_sessions
+"""
+import concurrent.futures
+import sys
+import time
+
+import numpy as np
+
+from white_box.sessions import SessionStore
+
+USERS = 100_000
+OPERATIONS = 400_000
+THREADS = 8
+SHARD_COUNTS = (1, 4, 16, 64, 256)
+
+
+def worker(store, user_ids):
+    """
+    Logs each user in, then out.
+    """
+    for user_id in user_ids:
+        store.login(user_id)
+        store.logout(user_id)
+
+
+def run(shards, batches):
+    """
+    Runs every batch in the pool and returns the elapsed seconds.
+    """
+    store = SessionStore(shards)
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(lambda batch: worker(store, batch), batches))
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    # Switch threads often to make lock contention visible.
+    sys.setswitchinterval(1e-5)
+    user_ids = np.random.default_rng(0).integers(0, USERS, OPERATIONS // 2)
+    batches = np.array_split(user_ids, THREADS * 4)
+    batches = [batch.tolist() for batch in batches]
+    for shards in SHARD_COUNTS:
+        seconds = run(shards, batches)
+        print(
+            f"shards={shards:<5} threads={THREADS} ops={OPERATIONS}"
+            f" throughput={OPERATIONS / seconds:10.0f} ops/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
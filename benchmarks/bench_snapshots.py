@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Startup time of white_box.snapshots.load against rebuilding every
+instance, for growing fleets.
+
+Run with: python -m benchmarks.bench_snapshots
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import best_of
+from white_box import snapshots
+from white_box.class_exercises import TrafficLight
+
+SIZES = (10_000, 1_000_000, 5_000_000)
+
+
+def rebuild(codes):
+    """
+    What a restart does today: one TrafficLight per saved state.
+    """
+    lights = []
+    for code in codes.tolist():
+        light = TrafficLight()
+        light.state_code = code
+        lights.append(light)
+    return lights
+
+
+def open_snapshot(path):
+    """
+    Opens the snapshot and touches one instance.
+    """
+    with snapshots.load(path) as snapshot:
+        return snapshot[len(snapshot) // 2]
+
+
+def compare(directory, size):
+    """
+    Prints the startup times for one fleet size.
+    """
+    codes = np.random.default_rng(0).integers(0, 3, size).astype(np.uint8)
+    path = os.path.join(directory, f"lights{size}.snap")
+    snapshots.dump_columns(path, [TrafficLight], np.zeros(size), codes)
+    rebuild_seconds = best_of(lambda: rebuild(codes), repeat=1)
+    load_seconds = best_of(lambda: open_snapshot(path))
+    print(
+        f"instances={size:<9} rebuild={rebuild_seconds * 1000:10.1f}ms"
+        f" snapshot load={load_seconds * 1e6:8.1f}us"
+    )
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        for size in SIZES:
+            compare(directory, size)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares stepping TrafficLight objects in a loop against
+white_box.traffic.TrafficLightFleet.
+
+Run with: python -m benchmarks.bench_traffic
+"""
+import numpy as np
+
+from benchmarks.common import best_of, print_comparison
+from white_box.class_exercises import TrafficLight
+from white_box.traffic import TrafficLightFleet
+
+LIGHTS = 200_000
+
+
+def object_step(lights, mask):
+    """
+    What callers do today: one change_state call per selected light.
+    """
+    for light, selected in zip(lights, mask):
+        if selected:
+            light.change_state()
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    lights = [TrafficLight() for _ in range(LIGHTS)]
+    fleet = TrafficLightFleet(LIGHTS)
+    everything = np.ones(LIGHTS, dtype=bool)
+    object_seconds = best_of(lambda: object_step(lights, everything))
+    fleet_seconds = best_of(fleet.change_state)
+    print_comparison("change_state (all)", LIGHTS, object_seconds, fleet_seconds)
+
+    mask = np.random.default_rng(0).random(LIGHTS) < 0.3
+    object_seconds = best_of(lambda: object_step(lights, mask))
+    fleet_seconds = best_of(lambda: fleet.change_state(mask))
+    print_comparison("change_state (30% mask)", LIGHTS, object_seconds, fleet_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+Transfer throughput of white_box.transfers.TransferEngine from a thread
+pool, for several thread counts and account skews, with and without
+optimistic retries.
+
+Account i is picked with a probability proportional to 1 / (i + 1) ** skew,
+so skew 0 is uniform and higher skews concentrate transfers on a few hot
+accounts.
+
+Run with: python -m benchmarks.bench_transfers
+"""
+import concurrent.futures
+import sys
+import time
+
+import numpy as np
+
+from white_box.transfers import TransferEngine
+
+ACCOUNTS = 1_000
+TRANSFERS = 100_000
+THREAD_COUNTS = (1, 2, 4, 8)
+SKEWS = (0.0, 1.0, 2.0)
+RETRIES = (0, 4)
+
+
+def engine(retries):
+    """
+    An engine with ACCOUNTS funded, logged-in accounts.
+    """
+    transfer_engine = TransferEngine(retries=retries)
+    for number in range(ACCOUNTS):
+        transfer_engine.open_account(number, 10**9)
+        transfer_engine.sessions.login(number)
+    return transfer_engine
+
+
+def transfers(skew):
+    """
+    Random (sender, receiver, amount) batches drawn with the given skew.
+    """
+    rng = np.random.default_rng(0)
+    weights = 1 / np.arange(1, ACCOUNTS + 1) ** skew
+    weights /= weights.sum()
+    senders = rng.choice(ACCOUNTS, TRANSFERS, p=weights)
+    receivers = rng.choice(ACCOUNTS, TRANSFERS, p=weights)
+    amounts = rng.integers(1, 100, TRANSFERS)
+    rows = list(zip(senders.tolist(), receivers.tolist(), amounts.tolist()))
+    return [rows[start::32] for start in range(32)]
+
+
+def worker(transfer_engine, batch):
+    """
+    Runs one batch of regular transfers.
+    """
+    for sender, receiver, amount in batch:
+        transfer_engine.transfer_money(sender, receiver, amount, "regular")
+
+
+def run(retries, threads, batches):
+    """
+    Runs every batch in the pool and returns the elapsed seconds.
+    """
+    transfer_engine = engine(retries)
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda batch: worker(transfer_engine, batch), batches))
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    # Switch threads often to make lock contention visible.
+    sys.setswitchinterval(1e-5)
+    for skew in SKEWS:
+        batches = transfers(skew)
+        for threads in THREAD_COUNTS:
+            for retries in RETRIES:
+                seconds = run(retries, threads, batches)
+                print(
+                    f"skew={skew:<4} threads={threads:<3} retries={retries:<3}"
+                    f" throughput={TRANSFERS / seconds:10.0f} transfers/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
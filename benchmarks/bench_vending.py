@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+Throughput and latency of white_box.vending.VendingService with an
+in-process generator of concurrent kiosk events.
+
+Run with: python -m benchmarks.bench_vending
+"""
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from white_box.vending import VendingService
+
+MACHINES = 5_000
+PURCHASES = 20
+
+
+async def kiosk(service, machine_id, latencies, seed):
+    """
+    Buys PURCHASES drinks, sometimes sending a second coin by mistake.
+    """
+    rng = random.Random(seed)
+    for _ in range(PURCHASES):
+        events = ["insert_coin", "select_drink"]
+        if rng.random() < 0.1:
+            events.insert(1, "insert_coin")
+        for event in events:
+            start = time.perf_counter()
+            await service.submit(machine_id, event)
+            latencies.append(time.perf_counter() - start)
+
+
+async def run():
+    """
+    Runs every kiosk concurrently and returns (seconds, latencies).
+    """
+    latencies = []
+    start = time.perf_counter()
+    async with VendingService(queue_size=16) as service:
+        await asyncio.gather(
+            *(kiosk(service, number, latencies, number) for number in range(MACHINES))
+        )
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    seconds, latencies = asyncio.run(run())
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(
+        f"machines={MACHINES} events={latencies.size}"
+        f" throughput={latencies.size / seconds:10.0f} events/s"
+        f" latency p50={p50:.2f}ms p99={p99:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+Durable transfer throughput of white_box.wal.DurableBank for several thread
+counts, against a TransferEngine that logs nothing.
+
+With one thread every transfer waits for its own fsync; with more threads,
+group commit lets one fsync acknowledge every transfer waiting for it.
+
+Run with: python -m benchmarks.bench_wal
+"""
+import concurrent.futures
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from white_box.transfers import TransferEngine
+from white_box.wal import DurableBank
+
+ACCOUNTS = 1_000
+TRANSFERS = 20_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+def fund(engine):
+    """
+    Opens ACCOUNTS funded, logged-in accounts.
+    """
+    for number in range(ACCOUNTS):
+        engine.open_account(number, 10**9)
+        engine.sessions.login(number)
+    return engine
+
+
+def transfers():
+    """
+    Random (sender, receiver, amount) batches.
+    """
+    rng = np.random.default_rng(0)
+    rows = list(
+        zip(
+            rng.integers(0, ACCOUNTS, TRANSFERS).tolist(),
+            rng.integers(0, ACCOUNTS, TRANSFERS).tolist(),
+            rng.integers(1, 100, TRANSFERS).tolist(),
+        )
+    )
+    return [rows[start::64] for start in range(64)]
+
+
+def worker(engine, batch):
+    """
+    Runs one batch of regular transfers.
+    """
+    for sender, receiver, amount in batch:
+        engine.transfer_money(sender, receiver, amount, "regular")
+
+
+def run(engine, threads, batches):
+    """
+    Runs every batch in the pool and returns the elapsed seconds.
+    """
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda batch: worker(engine, batch), batches))
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Runs the benchmark and prints the result.
+    """
+    batches = transfers()
+    seconds = run(fund(TransferEngine()), 8, batches)
+    print(
+        f"no log       threads=8   throughput={TRANSFERS / seconds:10.0f} transfers/s"
+    )
+    for threads in THREAD_COUNTS:
+        directory = tempfile.mkdtemp()
+        try:
+            bank = fund(DurableBank(directory))
+            syncs = bank.wal.syncs
+            seconds = run(bank, threads, batches)
+            syncs = bank.wal.syncs - syncs
+            bank.close()
+        finally:
+            shutil.rmtree(directory)
+        print(
+            f"group commit threads={threads:<3} throughput={TRANSFERS / seconds:10.0f}"
+            f" transfers/s transfers/fsync={TRANSFERS / syncs:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
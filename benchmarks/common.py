@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+"""
+Helpers shared by the benchmark scripts.
+"""
+import time
+
+
+def best_of(func, repeat=3):
+    """
+    Runs func several times and returns the fastest wall-clock time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_comparison(name, rows, baseline_seconds, candidate_seconds):
+    """
+    Prints one line comparing a baseline against a faster candidate.
+    """
+    speedup = baseline_seconds / candidate_seconds if candidate_seconds else 0.0
+    print(
+        f"{name:<28} rows={rows:<10} baseline={baseline_seconds:8.4f}s"
+        f" candidate={candidate_seconds:8.4f}s speedup={speedup:7.1f}x"
+    )
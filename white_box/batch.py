@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+Vectorized batch versions of the numeric classifiers in class_exercises.
+
+Every function takes a NumPy array, a list or any object exposing the buffer
+protocol and returns an array with one result per input value. Classifiers
+return small integer codes by default; pass ``labels=True`` to get the same
+strings the scalar functions return.
+"""
+import numpy as np
+
+from white_box.class_exercises import (
+    GRADE_TIERS,
+    PRODUCT_CATEGORY_TIERS,
+    QUANTITY_RATE_TIERS,
+    TOTAL_DISCOUNT_TIERS,
+)
+
+NUMBER_STATUS_LABELS = ("Negative", "Zero", "Positive")
+GRADE_LABELS = GRADE_TIERS.labels()
+AGE_LABELS = ("Not Eligible", "Eligible")
+PRODUCT_CATEGORY_LABELS = PRODUCT_CATEGORY_TIERS.labels()
+
+
+def _as_array(values):
+    """
+    Wraps the input in an ndarray without copying when possible.
+    """
+    return np.asarray(values)
+
+
+def _decode(codes, labels):
+    """
+    Maps integer codes to their string labels.
+    """
+    return np.asarray(labels)[codes]
+
+
+def are_even(values):
+    """
+    Checks which numbers are even (batch version of is_even).
+    """
+    return np.remainder(_as_array(values), 2) == 0
+
+
+def check_number_statuses(values, labels=False):
+    """
+    Classifies numbers as negative, zero or positive
+    (batch version of check_number_status).
+    """
+    values = _as_array(values)
+    # NaN is neither > 0 nor < 0, so it lands in "Zero" like the scalar one.
+    codes = np.ones(values.shape, dtype=np.int8)
+    codes += values > 0
+    codes -= values < 0
+    return _decode(codes, NUMBER_STATUS_LABELS) if labels else codes
+
+
+def get_grades(scores, labels=False):
+    """
+    Grades scores (batch version of get_grade).
+    """
+    codes = GRADE_TIERS.index_many(_as_array(scores)).astype(np.int8)
+    return _decode(codes, GRADE_LABELS) if labels else codes
+
+
+def verify_ages(ages, labels=False):
+    """
+    Checks service eligibility by age (batch version of verify_age).
+    """
+    ages = _as_array(ages)
+    codes = ((ages >= 18) & (ages <= 65)).astype(np.int8)
+    return _decode(codes, AGE_LABELS) if labels else codes
+
+
+def categorize_products(prices, labels=False):
+    """
+    Determines the price category of many products
+    (batch version of categorize_product).
+
+    Prices between the category ranges, such as 50.5 or 100.5, fall into
+    "Category D" exactly as in the scalar function.
+    """
+    codes = PRODUCT_CATEGORY_TIERS.index_many(_as_array(prices)).astype(np.int8)
+    return _decode(codes, PRODUCT_CATEGORY_LABELS) if labels else codes
+
+
+def calculate_total_discounts(total_amounts):
+    """
+    Calculates the discount for many purchases
+    (batch version of calculate_total_discount).
+    """
+    amounts = _as_array(total_amounts).astype(np.float64, copy=False)
+    rates = TOTAL_DISCOUNT_TIERS.lookup_many(amounts)
+    return np.where(rates == 0, 0.0, rates * amounts)
+
+
+def _order_columns(items, prices):
+    """
+    Returns the quantity and price columns of an order as float64 arrays.
+    """
+    if prices is not None:
+        quantities = items
+    elif isinstance(items, np.ndarray) and items.dtype.names:
+        quantities, prices = items["quantity"], items["price"]
+    else:
+        # Compatibility path for the list of {"quantity", "price"} dicts
+        # taken by calculate_order_total.
+        items = list(items)
+        count = len(items)
+        quantities = np.fromiter((item["quantity"] for item in items), float, count)
+        prices = np.fromiter((item["price"] for item in items), float, count)
+    quantities = _as_array(quantities).astype(np.float64, copy=False)
+    prices = _as_array(prices).astype(np.float64, copy=False)
+    if quantities.shape != prices.shape:
+        raise ValueError("quantities and prices must have the same shape")
+    return quantities, prices
+
+
+def calculate_order_total_columnar(items, prices=None):
+    """
+    Calculates an order total in one vectorized pass
+    (columnar version of calculate_order_total).
+
+    Accepts a quantity array together with a parallel price array, a NumPy
+    structured array with "quantity" and "price" fields, or the list of
+    dicts calculate_order_total takes. Totals match the scalar function up to
+    floating-point summation order.
+    """
+    quantities, prices = _order_columns(items, prices)
+    rates = QUANTITY_RATE_TIERS.lookup_many(quantities)
+    return float(np.sum(rates * quantities * prices))
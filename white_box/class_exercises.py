@@ -3,7 +3,68 @@
 """
 White-box code examples.
 """
-import re
+import math
+
+from white_box.credentials import CredentialStore
+from white_box.dates import is_valid_date
+from white_box.emails import is_valid_email
+from white_box.fsm import StateMachine, transition
+from white_box.ledger import Ledger, is_valid_amount
+from white_box.passwords import password_failures
+from white_box.tiers import Tier, TierTable
+
+GRADE_TIERS = TierTable(
+    [
+        Tier(90, math.inf, "A"),
+        Tier(80, 90, "B", high_closed=False),
+        Tier(70, 80, "C", high_closed=False),
+    ],
+    default="F",
+)
+
+TOTAL_DISCOUNT_TIERS = TierTable(
+    [Tier(-math.inf, 100, 0, high_closed=False), Tier(100, 500, 0.1)],
+    default=0.2,
+)
+
+PRODUCT_CATEGORY_TIERS = TierTable(
+    [
+        Tier(10, 50, "Category A"),
+        Tier(51, 100, "Category B"),
+        Tier(101, 200, "Category C"),
+    ],
+    default="Category D",
+)
+
+QUANTITY_DISCOUNT_TIERS = TierTable(
+    [Tier(1, 5, "No Discount"), Tier(6, 10, "5% Discount")],
+    default="10% Discount",
+)
+
+# Price multiplier applied by calculate_order_total for each quantity.
+QUANTITY_RATE_TIERS = TierTable([Tier(1, 5, 1), Tier(6, 10, 0.95)], default=0.9)
+
+# Shipping cost by total order weight for each shipping method.
+SHIPPING_RATE_CARDS = {
+    "standard": TierTable(
+        [Tier(-math.inf, 5, 10), Tier(5, 10, 15, low_closed=False)], default=20
+    ),
+    "express": TierTable(
+        [Tier(-math.inf, 5, 20), Tier(5, 10, 30, low_closed=False)], default=40
+    ),
+}
+
+# Balance of the accounts BankingSystem opens for its users.
+OPENING_BALANCE = 1000
+
+# Fee of each BankingSystem transfer type, as a share of the amount.
+TRANSFER_FEE_RATES = {"regular": 0.02, "express": 0.05, "scheduled": 0.01}
+
+# Password hashes of the BankingSystem mock users (user123's is "pass123").
+MOCK_PASSWORD_HASHES = {
+    "user123": "scrypt$16384,8,1$40751edfc576721483235ee89ae066e9"
+    "$e685d85cb416b0d2461db1a3efa239597550ac6ec836aae1031ac8c6bb172962"
+}
 
 
 def is_even(num):
@@ -27,15 +88,7 @@ def get_grade(score):
     """
     Grade function.
     """
-    if score >= 90:
-        grade = "A"
-    elif score >= 80:
-        grade = "B"
-    elif score >= 70:
-        grade = "C"
-    else:
-        grade = "F"
-    return grade
+    return GRADE_TIERS.lookup(score)
 
 
 def is_triangle(a, b, c):
@@ -67,21 +120,9 @@ def validate_password(password):
     """
     Validates user passwords.
     """
-    # Check length
-    if len(password) < 8:
-        return False
-
-    # Check for at least one uppercase letter, one lowercase letter,
-    # one digit, and one special character.
-    if (
-        not re.search(r"[A-Z]", password)
-        or not re.search(r"[a-z]", password)
-        or not re.search(r"\d", password)
-        or not re.search(r"[!@#$%&]", password)
-    ):
-        return False
-
-    return True
+    # Length, uppercase, lowercase, digit and special character rules are
+    # all checked in a single pass over the password.
+    return password_failures(password) == 0
 
 
 # 3
@@ -89,13 +130,11 @@ def calculate_total_discount(total_amount):
     """
     Calculates the discount for a customer's purchase based on the total amount.
     """
-    if total_amount < 100:
+    rate = TOTAL_DISCOUNT_TIERS.lookup(total_amount)
+    if rate == 0:
         return 0
 
-    if 100 <= total_amount <= 500:
-        return 0.1 * total_amount
-
-    return 0.2 * total_amount
+    return rate * total_amount
 
 
 # 4
@@ -112,12 +151,8 @@ def calculate_order_total(items):
         price_per_item = item["price"]
 
         # Apply discounts based on quantity
-        if 1 <= quantity <= 5:
-            total_price += quantity * price_per_item
-        elif 6 <= quantity <= 10:
-            total_price += 0.95 * quantity * price_per_item  # 5% discount
-        else:
-            total_price += 0.9 * quantity * price_per_item  # 10% discount
+        rate = QUANTITY_RATE_TIERS.lookup(quantity)
+        total_price += rate * quantity * price_per_item
 
     return total_price
 
@@ -131,25 +166,11 @@ def calculate_items_shipping_cost(items, shipping_method):
     """
     total_weight = sum(item["weight"] for item in items)
 
-    if shipping_method == "standard":
-        if total_weight <= 5:
-            return 10
-
-        if 5 < total_weight <= 10:
-            return 15
+    rate_card = SHIPPING_RATE_CARDS.get(shipping_method)
+    if rate_card is None:
+        raise ValueError("Invalid shipping method")
 
-        return 20
-
-    if shipping_method == "express":
-        if total_weight <= 5:
-            return 20
-
-        if 5 < total_weight <= 10:
-            return 30
-
-        return 40
-
-    raise ValueError("Invalid shipping method")
+    return rate_card.lookup(total_weight)
 
 
 # 6
@@ -179,16 +200,7 @@ def categorize_product(price):
     """
     Determines the price category of a product based on its price.
     """
-    if 10 <= price <= 50:
-        return "Category A"
-
-    if 51 <= price <= 100:
-        return "Category B"
-
-    if 101 <= price <= 200:
-        return "Category C"
-
-    return "Category D"
+    return PRODUCT_CATEGORY_TIERS.lookup(price)
 
 
 # 9
@@ -196,7 +208,7 @@ def validate_email(email):
     """
     Validates email addresses.
     """
-    if 5 <= len(email) <= 50 and "@" in email and "." in email:
+    if is_valid_email(email):
         return "Valid Email"
 
     return "Invalid Email"
@@ -229,7 +241,7 @@ def validate_date(year, month, day):
     """
     Validates dates.
     """
-    if 1900 <= year <= 2100 and 1 <= month <= 12 and 1 <= day <= 31:
+    if is_valid_date(year, month, day):
         return "Valid Date"
 
     return "Invalid Date"
@@ -262,13 +274,7 @@ def calculate_quantity_discount(quantity):
     """
     Calculates discounts based on the quantity of a product.
     """
-    if 1 <= quantity <= 5:
-        return "No Discount"
-
-    if 6 <= quantity <= 10:
-        return "5% Discount"
-
-    return "10% Discount"
+    return QUANTITY_DISCOUNT_TIERS.lookup(quantity)
 
 
 # 16
@@ -364,176 +370,126 @@ def get_weather_advisory(temperature, humidity):
 
 
 # 22
-class VendingMachine:
+class VendingMachine(StateMachine):
     """
     A simple vending machine that dispenses drinks.
     It has two states: "Ready" and "Dispensing."
     """
 
-    def __init__(self):
-        """
-        Defines the vending machine initial state.
-        """
-        self.state = "Ready"
+    __slots__ = ()
 
-    def insert_coin(self):
-        """
-        Function called when a coin is inserted.
-        """
-        if self.state == "Ready":
-            self.state = "Dispensing"
-            return "Coin Inserted. Select your drink."
+    STATES = ("Ready", "Dispensing")
+    INVALID_MESSAGE = "Invalid operation in current state."
 
-        return "Invalid operation in current state."
+    insert_coin = transition(
+        "Function called when a coin is inserted.",
+        {"Ready": ("Dispensing", "Coin Inserted. Select your drink.")},
+    )
 
-    def select_drink(self):
-        """
-        Function called after selecting a drink.
-        """
-        if self.state == "Dispensing":
-            self.state = "Ready"
-            return "Drink Dispensed. Thank you!"
-
-        return "Invalid operation in current state."
+    select_drink = transition(
+        "Function called after selecting a drink.",
+        {"Dispensing": ("Ready", "Drink Dispensed. Thank you!")},
+    )
 
 
 # 23
-class TrafficLight:
+class TrafficLight(StateMachine):
     """
     A traffic light system with three states: "Green," "Yellow," and "Red."
     """
 
-    def __init__(self):
-        """
-        Defines the traffic light initial state.
-        """
-        self.state = "Red"
+    __slots__ = ()
 
-    def change_state(self):
-        """
-        Function that changes the traffic light state.
-        """
-        if self.state == "Red":
-            self.state = "Green"
-        elif self.state == "Green":
-            self.state = "Yellow"
-        elif self.state == "Yellow":
-            self.state = "Red"
+    STATES = ("Red", "Green", "Yellow")
+
+    change_state = transition(
+        "Function that changes the traffic light state.",
+        {
+            "Red": ("Green", None),
+            "Green": ("Yellow", None),
+            "Yellow": ("Red", None),
+        },
+    )
 
     def get_current_state(self):
         """
         Provides the current traffic light state.
         """
-        return self.state
+        return self.STATES[self._state]
 
 
 # 24
-class UserAuthentication:
+class UserAuthentication(StateMachine):
     """
     A user authentication system with states "Logged Out" and "Logged In."
     """
 
-    def __init__(self):
-        """
-        Defines the user initial state.
-        """
-        self.state = "Logged Out"
+    __slots__ = ()
 
-    def login(self):
-        """
-        Function to login a user.
-        """
-        if self.state == "Logged Out":
-            self.state = "Logged In"
-            return "Login successful"
+    STATES = ("Logged Out", "Logged In")
+    INVALID_MESSAGE = "Invalid operation in current state"
 
-        return "Invalid operation in current state"
+    login = transition(
+        "Function to login a user.",
+        {"Logged Out": ("Logged In", "Login successful")},
+    )
 
-    def logout(self):
-        """
-        Function to logout a user.
-        """
-        if self.state == "Logged In":
-            self.state = "Logged Out"
-            return "Logout successful"
-
-        return "Invalid operation in current state"
+    logout = transition(
+        "Function to logout a user.",
+        {"Logged In": ("Logged Out", "Logout successful")},
+    )
 
 
 # 25
-class DocumentEditingSystem:
+class DocumentEditingSystem(StateMachine):
     """
     A document editing system with states "Editing" and "Saved."
     """
 
-    def __init__(self):
-        """
-        Defines the initial state.
-        """
-        self.state = "Editing"
-
-    def save_document(self):
-        """
-        Function to save a document.
-        """
-        if self.state == "Editing":
-            self.state = "Saved"
-            return "Document saved successfully"
+    __slots__ = ()
 
-        return "Invalid operation in current state"
+    STATES = ("Editing", "Saved")
+    INVALID_MESSAGE = "Invalid operation in current state"
 
-    def edit_document(self):
-        """
-        Function to edit a document.
-        """
-        if self.state == "Saved":
-            self.state = "Editing"
-            return "Editing resumed"
+    save_document = transition(
+        "Function to save a document.",
+        {"Editing": ("Saved", "Document saved successfully")},
+    )
 
-        return "Invalid operation in current state"
+    edit_document = transition(
+        "Function to edit a document.",
+        {"Saved": ("Editing", "Editing resumed")},
+    )
 
 
 # 26
-class ElevatorSystem:
+class ElevatorSystem(StateMachine):
     """
     An elevator system with states "Idle," "Moving Up," and "Moving Down."
     """
 
-    def __init__(self):
-        """
-        Defines the elevator initial state.
-        """
-        self.state = "Idle"
+    __slots__ = ()
 
-    def move_up(self):
-        """
-        Function to move up the elevator.
-        """
-        if self.state == "Idle":
-            self.state = "Moving Up"
-            return "Elevator moving up"
+    STATES = ("Idle", "Moving Up", "Moving Down")
+    INVALID_MESSAGE = "Invalid operation in current state"
 
-        return "Invalid operation in current state"
+    move_up = transition(
+        "Function to move up the elevator.",
+        {"Idle": ("Moving Up", "Elevator moving up")},
+    )
 
-    def move_down(self):
-        """
-        Function to move down the elevator.
-        """
-        if self.state == "Idle":
-            self.state = "Moving Down"
-            return "Elevator moving down"
-
-        return "Invalid operation in current state"
-
-    def stop(self):
-        """
-        Function to stop the elevator.
-        """
-        if self.state in ["Moving Up", "Moving Down"]:
-            self.state = "Idle"
-            return "Elevator stopped"
+    move_down = transition(
+        "Function to move down the elevator.",
+        {"Idle": ("Moving Down", "Elevator moving down")},
+    )
 
-        return "Invalid operation in current state"
+    stop = transition(
+        "Function to stop the elevator.",
+        {
+            "Moving Up": ("Idle", "Elevator stopped"),
+            "Moving Down": ("Idle", "Elevator stopped"),
+        },
+    )
 
 
 # 27
@@ -566,18 +522,26 @@ class BankingSystem:
     Banking system class.
     """
 
-    def __init__(self):
+    def __init__(self, ledger=None, users=None):
         """
-        Mock users.
+        Users (a CredentialStore with the mock users by default), with an
+        OPENING_BALANCE account each in the ledger.
         """
-        self.users = {"user123": "pass123"}  # Simplified user database
+        if users is None:
+            users = CredentialStore()
+            for username, encoded in MOCK_PASSWORD_HASHES.items():
+                users.set_hash(username, encoded)
+        self.users = users
         self.logged_in_users = set()
+        self.ledger = Ledger() if ledger is None else ledger
+        for username in self.users:
+            self.ledger.ensure_account(username, OPENING_BALANCE)
 
     def authenticate(self, username, password):
         """
         User authentication function.
         """
-        if username in self.users and self.users[username] == password:
+        if self.users.verify(username, password):
             if username not in self.logged_in_users:
                 self.logged_in_users.add(username)
                 print(f"User {username} authenticated successfully.")
@@ -597,19 +561,18 @@ class BankingSystem:
             print("Sender not authenticated.")
             return False
 
-        # Simulate transaction processing logic
-        if transaction_type == "regular":
-            fee = 0.02 * amount
-        elif transaction_type == "express":
-            fee = 0.05 * amount
-        elif transaction_type == "scheduled":
-            fee = 0.01 * amount
-        else:
+        fee_rate = TRANSFER_FEE_RATES.get(transaction_type)
+        if fee_rate is None:
             print("Invalid transaction type.")
             return False
 
-        # Simulate checking for sufficient funds
-        if BankAccount(sender, 1000).balance < (amount + fee):
+        fee = fee_rate * amount
+        if not is_valid_amount(amount, fee):
+            print("Invalid amount.")
+            return False
+
+        # Receivers outside the bank get an empty account on first transfer.
+        if not self.ledger.transfer(sender, receiver, amount, fee):
             print("Insufficient funds.")
             return False
 
@@ -619,6 +582,28 @@ class BankingSystem:
         )
         return True
 
+    def transfer_batch(self, senders, receivers, amounts, transaction_types):
+        """
+        Function to perform many money transfers at once, without printing.
+
+        Returns a status code per transfer, indexing
+        white_box.ledger.TRANSFER_STATUS_LABELS.
+        """
+        return self.ledger.transfer_batch(
+            senders,
+            receivers,
+            amounts,
+            transaction_types,
+            TRANSFER_FEE_RATES,
+            authorized=self.logged_in_users,
+        )
+
+    def view_account(self, account_number):
+        """
+        Function to display the account details from the ledger.
+        """
+        return self.ledger.view_account(account_number)
+
 
 # 28
 class Product:  # pylint: disable=too-few-public-methods
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hashed credentials with a cache of recently verified logins.
+
+A CredentialStore keeps, for every user, a salted hash of the password made
+with a deliberately slow key derivation function (scrypt by default, or
+PBKDF2-HMAC-SHA256), encoded as "scheme$parameters$salt$hash" so that the
+parameters can be raised later without invalidating stored hashes. Digests
+are compared with hmac.compare_digest, and unknown users are checked against
+a dummy hash so that they take as long as wrong passwords.
+
+A successful verification caches a session token for the user: an HMAC of
+the username and password under a random key that never leaves the process.
+Until it expires (session_ttl seconds), the same credentials are accepted by
+recomputing the token, which skips the key derivation. The cache holds at
+most max_sessions users, dropping the least recently used one, and a user's
+entry is dropped when their password changes.
+
+When set, on_change is called with the username and the encoded hash every
+time a hash is stored, while the store lock is held, so that the changes can
+be persisted in the order they happened.
+"""
+import collections
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class ScryptHasher:
+    """
+    Password hashes made with hashlib.scrypt.
+    """
+
+    scheme = "scrypt"
+
+    def __init__(self, n=2**14, r=8, p=1):
+        """
+        Takes the scrypt cost parameters.
+        """
+        self.n = n
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def derive(password, salt, n, r, p):
+        """
+        Derives the key of a password.
+        """
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * r * n,
+            dklen=KEY_BYTES,
+        )
+
+    def hash(self, password):
+        """
+        Encodes a new salted hash of a password.
+        """
+        salt = secrets.token_bytes(SALT_BYTES)
+        key = self.derive(password, salt, self.n, self.r, self.p)
+        return f"{self.scheme}${self.n},{self.r},{self.p}${salt.hex()}${key.hex()}"
+
+    @classmethod
+    def verify(cls, password, encoded):
+        """
+        Checks a password against a hash made by hash.
+        """
+        _, parameters, salt, key = encoded.split("$")
+        n, r, p = map(int, parameters.split(","))
+        derived = cls.derive(password, bytes.fromhex(salt), n, r, p)
+        return hmac.compare_digest(derived, bytes.fromhex(key))
+
+
+class Pbkdf2Hasher:
+    """
+    Password hashes made with hashlib.pbkdf2_hmac over SHA-256.
+    """
+
+    scheme = "pbkdf2_sha256"
+
+    def __init__(self, iterations=600_000):
+        """
+        Takes the number of iterations.
+        """
+        self.iterations = iterations
+
+    @staticmethod
+    def derive(password, salt, iterations):
+        """
+        Derives the key of a password.
+        """
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), salt, iterations, KEY_BYTES
+        )
+
+    def hash(self, password):
+        """
+        Encodes a new salted hash of a password.
+        """
+        salt = secrets.token_bytes(SALT_BYTES)
+        key = self.derive(password, salt, self.iterations)
+        return f"{self.scheme}${self.iterations}${salt.hex()}${key.hex()}"
+
+    @classmethod
+    def verify(cls, password, encoded):
+        """
+        Checks a password against a hash made by hash.
+        """
+        _, iterations, salt, key = encoded.split("$")
+        derived = cls.derive(password, bytes.fromhex(salt), int(iterations))
+        return hmac.compare_digest(derived, bytes.fromhex(key))
+
+
+HASHERS = {hasher.scheme: hasher for hasher in (ScryptHasher, Pbkdf2Hasher)}
+
+
+def verify_password(password, encoded):
+    """
+    Checks a password against an encoded hash of any known scheme.
+    """
+    scheme = encoded.partition("$")[0]
+    try:
+        hasher = HASHERS[scheme]
+    except KeyError:
+        raise ValueError(f"Unknown password hash scheme: {scheme!r}") from None
+    return hasher.verify(password, encoded)
+
+
+class CredentialStore:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe hashed passwords of many users.
+    """
+
+    def __init__(
+        self, hasher=None, session_ttl=300, max_sessions=10_000, clock=time.monotonic
+    ):
+        """
+        New passwords are hashed with hasher (a ScryptHasher by default).
+        Verified logins are cached for session_ttl seconds, as measured by
+        clock; a session_ttl of 0 disables the cache.
+        """
+        self.hasher = ScryptHasher() if hasher is None else hasher
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self.cache_hits = 0
+        self.on_change = None
+        self._hashes = {}
+        self._dummy_hash = None
+        self._session_key = secrets.token_bytes(KEY_BYTES)
+        self._sessions = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, username):
+        """
+        Tells whether a user exists.
+        """
+        return username in self._hashes
+
+    def __iter__(self):
+        """
+        Iterates over the usernames.
+        """
+        return iter(list(self._hashes))
+
+    def __len__(self):
+        """
+        Number of users.
+        """
+        return len(self._hashes)
+
+    def set_password(self, username, password):
+        """
+        Stores a new hash of a user's password.
+        """
+        self.set_hash(username, self.hasher.hash(password))
+
+    def set_hash(self, username, encoded):
+        """
+        Stores an already encoded password hash of a user.
+        """
+        with self._lock:
+            self._hashes[username] = encoded
+            self._sessions.pop(username, None)
+            if self.on_change is not None:
+                self.on_change(username, encoded)
+
+    def hashes(self):
+        """
+        Encoded password hashes by username.
+        """
+        with self._lock:
+            return dict(self._hashes)
+
+    def _session_token(self, username, password):
+        """
+        Token cached for verified credentials.
+        """
+        message = f"{username}\0{password}".encode("utf-8")
+        return hmac.new(self._session_key, message, hashlib.sha256).digest()
+
+    def verify(self, username, password):
+        """
+        Checks a user's password, through the session cache when the same
+        credentials were verified recently.
+        """
+        if self.session_ttl > 0:
+            token = self._session_token(username, password)
+            with self._lock:
+                session = self._sessions.get(username)
+                if session is not None:
+                    cached, expires = session
+                    if self.clock() >= expires:
+                        del self._sessions[username]
+                    elif hmac.compare_digest(cached, token):
+                        self._sessions.move_to_end(username)
+                        self.cache_hits += 1
+                        return True
+
+        encoded = self._hashes.get(username)
+        if encoded is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = self.hasher.hash(secrets.token_hex(KEY_BYTES))
+            # Unknown users cost a key derivation too.
+            verify_password(password, self._dummy_hash)
+            return False
+        if not verify_password(password, encoded):
+            return False
+
+        if self.session_ttl > 0:
+            with self._lock:
+                if self._hashes.get(username) == encoded:
+                    self._sessions[username] = (token, self.clock() + self.session_ttl)
+                    self._sessions.move_to_end(username)
+                    while len(self._sessions) > self.max_sessions:
+                        self._sessions.popitem(last=False)
+        return True
+
+    def forget_session(self, username):
+        """
+        Drops the cached login of a user, so that the next verification
+        derives the key again.
+        """
+        with self._lock:
+            self._sessions.pop(username, None)
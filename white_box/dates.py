@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+Calendar-aware date validation backed by a precomputed lookup table.
+
+DAYS_IN_MONTH holds the length of every month from FIRST_YEAR to LAST_YEAR,
+with leap years already applied, so validating a date is a range check plus
+one table lookup, both for single dates and for whole year/month/day columns.
+"""
+import math
+import numbers
+
+import numpy as np
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+_MONTH_LENGTHS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def is_leap_year(year):
+    """
+    Tells whether a year is a leap year in the Gregorian calendar.
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _build_days_in_month():
+    """
+    Builds the (year - FIRST_YEAR, month) -> number of days table.
+
+    Column 0 is a zero-day sentinel so months can be used as indexes directly.
+    """
+    table = np.zeros((LAST_YEAR - FIRST_YEAR + 1, 13), dtype=np.int8)
+    table[:, 1:] = _MONTH_LENGTHS
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        if is_leap_year(year):
+            table[year - FIRST_YEAR, 2] = 29
+    return table
+
+
+DAYS_IN_MONTH = _build_days_in_month()
+# Plain tuples are faster than NumPy indexing for one date at a time.
+_DAYS_IN_MONTH_ROWS = tuple(tuple(row) for row in DAYS_IN_MONTH.tolist())
+
+
+def _is_whole(value):
+    """
+    Tells whether a scalar is a whole number, such as 2020 or 2020.0.
+    """
+    if isinstance(value, numbers.Integral):
+        return True
+    return (
+        isinstance(value, numbers.Real)
+        and math.isfinite(value)
+        and float(value).is_integer()
+    )
+
+
+def is_valid_date(year, month, day):
+    """
+    Tells whether year/month/day is a real date between FIRST_YEAR and
+    LAST_YEAR. Whole floats such as 2020.0 count as integers, as in
+    validate_dates; other non-integer values are never valid.
+    """
+    if not (
+        isinstance(year, numbers.Integral)
+        and isinstance(month, numbers.Integral)
+        and isinstance(day, numbers.Integral)
+    ):
+        if not (_is_whole(year) and _is_whole(month) and _is_whole(day)):
+            return False
+        year, month, day = int(year), int(month), int(day)
+    if not (FIRST_YEAR <= year <= LAST_YEAR and 1 <= month <= 12):
+        return False
+    return 1 <= day <= _DAYS_IN_MONTH_ROWS[year - FIRST_YEAR][month]
+
+
+def _integral(values):
+    """
+    Converts a column to int64, returning it with a mask of integral entries.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        return values.astype(np.int64, copy=False), np.ones(values.shape, bool)
+    values = values.astype(np.float64, copy=False)
+    integral = np.isfinite(values) & (values == np.floor(values))
+    return np.where(integral, values, 0).astype(np.int64), integral
+
+
+def validate_dates(years, months, days):
+    """
+    Validates year/month/day integer columns, returning a boolean mask.
+    """
+    years, valid = _integral(years)
+    months, integral = _integral(months)
+    valid &= integral
+    days, integral = _integral(days)
+    valid &= integral
+
+    valid &= (years >= FIRST_YEAR) & (years <= LAST_YEAR)
+    valid &= (months >= 1) & (months <= 12)
+    # Out-of-range rows are already invalid; clip them to stay inside the table.
+    rows = np.clip(years - FIRST_YEAR, 0, LAST_YEAR - FIRST_YEAR)
+    month_lengths = DAYS_IN_MONTH[rows, np.clip(months, 0, 12)]
+    valid &= (days >= 1) & (days <= month_lengths)
+    return valid
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+"""
+Multi-car elevator dispatching and its discrete-event simulation.
+
+Every car wraps an ElevatorSystem for its direction (Idle, Moving Up, Moving
+Down) and keeps the floors it must stop at in two heaps: floors above it,
+served in ascending order on the way up, and floors below it (negated, so
+the highest comes first), served on the way down. Hall calls are assigned to
+the car with the shortest estimated travel along its current sweep, and wait
+per direction: a car only picks up the calls going the way it leaves their
+floor in, so the others wait until it comes back or turns around there.
+
+Two sweep policies are supported:
+
+- "look" reverses as soon as there are no more stops ahead;
+- "scan" always runs to the last floor before reversing.
+"""
+import collections
+import heapq
+import itertools
+
+import numpy as np
+
+from white_box.class_exercises import ElevatorSystem
+
+POLICIES = ("look", "scan")
+
+# Direction of travel for each ElevatorSystem state code.
+DIRECTIONS = (0, 1, -1)
+
+Call = collections.namedtuple("Call", "time origin destination")
+Call.__doc__ = """
+A hall call: a passenger at origin asks at the given time to go to
+destination.
+"""
+
+SimulationReport = collections.namedtuple(
+    "SimulationReport", "served waits trips wait_percentiles trip_percentiles"
+)
+SimulationReport.__doc__ = """
+Result of Dispatcher.simulate. waits holds the time from call to pick-up and
+trips the time from call to arrival for every served passenger; the
+percentile dicts map each requested percentile to its value.
+"""
+
+
+class Car:
+    """
+    One elevator car of a bank.
+    """
+
+    def __init__(self, floor=0):
+        """
+        Creates an idle car at the given floor.
+        """
+        self.motion = ElevatorSystem()
+        self.floor = floor
+        self.up_stops = []
+        self.down_stops = []
+        # Waiting calls by direction (1 up, -1 down), then by floor.
+        self.waiting = {
+            1: collections.defaultdict(list),
+            -1: collections.defaultdict(list),
+        }
+        self.riding = collections.defaultdict(list)
+        self.scheduled = False
+
+    @property
+    def direction(self):
+        """
+        1 moving up, -1 moving down, 0 idle.
+        """
+        return DIRECTIONS[self.motion.state_code]
+
+    def add_stop(self, floor):
+        """
+        Queues a stop, on the up or down heap depending on where it is.
+        """
+        if floor > self.floor or (floor == self.floor and self.direction >= 0):
+            heapq.heappush(self.up_stops, floor)
+        else:
+            heapq.heappush(self.down_stops, -floor)
+
+    def set_direction(self, direction):
+        """
+        Drives the ElevatorSystem to the given direction.
+        """
+        if direction == self.direction:
+            return
+        if self.direction:
+            self.motion.stop()
+        if direction > 0:
+            self.motion.move_up()
+        elif direction < 0:
+            self.motion.move_down()
+
+
+class Dispatcher:  # pylint: disable=too-many-instance-attributes
+    """
+    Assigns hall calls to a bank of cars and simulates their service.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, cars, floors, policy="look", floor_time=1.0, stop_time=3.0
+    ):
+        """
+        A bank of cars serving floors 0 to floors - 1. floor_time is the
+        time to travel one floor and stop_time the time spent at a stop.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy!r}")
+        if cars < 1 or floors < 2:
+            raise ValueError("A bank needs at least one car and two floors")
+        self.policy = policy
+        self.floors = floors
+        self.floor_time = floor_time
+        self.stop_time = stop_time
+        self.cars = [Car() for _ in range(cars)]
+        self._events = []
+        self._sequence = itertools.count()
+        self._waits = []
+        self._trips = []
+
+    def _turn_floors(self, car):
+        """
+        Floors where the car will turn around at the top and the bottom of
+        its current sweep.
+        """
+        if self.policy == "scan":
+            return self.floors - 1, 0
+        top = max(car.up_stops, default=car.floor)
+        bottom = -max(car.down_stops, default=-car.floor)
+        return max(top, car.floor), min(bottom, car.floor)
+
+    def distance(self, car, origin, going_up):
+        """
+        Floors the car travels before it can pick up a call at origin going
+        in the given direction, following its current sweep.
+        """
+        floor, direction = car.floor, car.direction
+        if direction == 0:
+            return abs(floor - origin)
+        top, bottom = self._turn_floors(car)
+        if direction < 0:
+            # Mirror the bank so that the car moves up.
+            floor, origin = -floor, -origin
+            top, bottom = -bottom, -top
+            going_up = not going_up
+        top = max(top, origin)
+        bottom = min(bottom, origin)
+        if going_up and origin >= floor:
+            return origin - floor
+        if not going_up:
+            return (top - floor) + (top - origin)
+        return (top - floor) + (top - bottom) + (origin - bottom)
+
+    def assign(self, call):
+        """
+        Picks the car for a call, queues the call on it and returns the
+        index of the car.
+        """
+        if call.origin == call.destination:
+            raise ValueError("A call must go to another floor")
+        if not (0 <= call.origin < self.floors and 0 <= call.destination < self.floors):
+            raise ValueError("Floor out of range")
+        going_up = call.destination > call.origin
+        index = min(
+            range(len(self.cars)),
+            key=lambda i: (
+                self.distance(self.cars[i], call.origin, going_up),
+                len(self.cars[i].up_stops) + len(self.cars[i].down_stops),
+            ),
+        )
+        car = self.cars[index]
+        car.waiting[1 if going_up else -1][call.origin].append(call)
+        car.add_stop(call.origin)
+        return index
+
+    def _schedule(self, time, index):
+        """
+        Schedules the arrival of a car at its current floor.
+        """
+        self.cars[index].scheduled = True
+        heapq.heappush(self._events, (time, next(self._sequence), index, None))
+
+    def _board(self, car, direction, now):
+        """
+        Picks up the passengers waiting at the current floor to go in the
+        given direction, telling whether there were any.
+        """
+        calls = car.waiting[direction].pop(car.floor, ())
+        for call in calls:
+            self._waits.append(now - call.time)
+            car.riding[call.destination].append(call)
+            car.add_stop(call.destination)
+        return bool(calls)
+
+    def _serve(self, car, now):
+        """
+        Drops off passengers at the current floor and picks up those going
+        the way the car leaves in.
+
+        Tells whether the car stopped there.
+        """
+        floor = car.floor
+        while car.up_stops and car.up_stops[0] == floor:
+            heapq.heappop(car.up_stops)
+        while car.down_stops and -car.down_stops[0] == floor:
+            heapq.heappop(car.down_stops)
+        riders = car.riding.pop(floor, ())
+        for call in riders:
+            self._trips.append(now - call.time)
+
+        direction = car.direction or self._next_direction(car)
+        if not direction:
+            direction = 1 if floor in car.waiting[1] else -1
+        car.set_direction(direction)
+        boarded = self._board(car, direction, now)
+        if self._next_direction(car) != direction:
+            # The car turns around here, so the other calls board too.
+            boarded = self._board(car, -direction, now) or boarded
+        elif floor in car.waiting[-direction]:
+            # Come back for them on the sweep the other way.
+            if direction > 0:
+                heapq.heappush(car.down_stops, -floor)
+            else:
+                heapq.heappush(car.up_stops, floor)
+        return boarded or bool(riders)
+
+    def _next_direction(self, car):
+        """
+        Direction the car leaves its current floor in.
+        """
+        if not (car.up_stops or car.down_stops):
+            return 0
+        direction = car.direction
+        if self.policy == "scan":
+            if direction > 0 and car.floor < self.floors - 1:
+                return 1
+            if direction < 0 < car.floor:
+                return -1
+        if direction >= 0 and car.up_stops:
+            return 1
+        if direction <= 0 and car.down_stops:
+            return -1
+        return 1 if car.up_stops else -1
+
+    def _arrive(self, index, now):
+        """
+        Handles a car reaching a floor.
+        """
+        car = self.cars[index]
+        car.scheduled = False
+        stopped = self._serve(car, now)
+        direction = self._next_direction(car)
+        car.set_direction(direction)
+        if direction:
+            car.floor += direction
+            delay = self.floor_time + (self.stop_time if stopped else 0)
+            self._schedule(now + delay, index)
+
+    def simulate(self, calls, percentiles=(50, 90, 99)):
+        """
+        Serves calls (in any order) from an idle bank at floor 0 and reports
+        the wait and trip times.
+        """
+        self.cars = [Car() for _ in self.cars]
+        self._waits, self._trips = [], []
+        self._events = [(call.time, next(self._sequence), None, call) for call in calls]
+        heapq.heapify(self._events)
+        while self._events:
+            now, _, index, call = heapq.heappop(self._events)
+            if call is not None:
+                index = self.assign(call)
+                if self.cars[index].scheduled:
+                    continue
+            self._arrive(index, now)
+
+        waits = np.array(self._waits)
+        trips = np.array(self._trips)
+        return SimulationReport(
+            len(trips),
+            waits,
+            trips,
+            _percentiles(waits, percentiles),
+            _percentiles(trips, percentiles),
+        )
+
+
+def _percentiles(values, percentiles):
+    """
+    Maps each percentile to its value (NaN without values).
+    """
+    if values.size == 0:
+        return {p: float("nan") for p in percentiles}
+    return dict(zip(percentiles, np.percentile(values, percentiles).tolist()))
+
+
+def synthetic_calls(count, floors, rate, lobby_share=0.5, seed=0):
+    """
+    Random hall calls arriving as a Poisson process of the given rate.
+
+    A lobby_share of the calls start at floor 0 (morning up-peak traffic);
+    the others go between random floors.
+    """
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.exponential(1 / rate, count))
+    origins = np.where(
+        rng.random(count) < lobby_share, 0, rng.integers(0, floors, count)
+    )
+    # Destination offsets in 1..floors-1 never land on the origin.
+    destinations = (origins + rng.integers(1, floors, count)) % floors
+    return [
+        Call(time, origin, destination)
+        for time, origin, destination in zip(
+            times.tolist(), origins.tolist(), destinations.tolist()
+        )
+    ]
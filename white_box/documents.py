@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+"""
+Piece-table documents with journaled, incremental saves.
+
+The text of a Document is a PieceTable: the file as it was opened (memory
+mapped, never copied) plus an append-only buffer of inserted bytes, and a
+list of pieces pointing into either of them. Edits only touch the piece
+list, and saving appends the edits made since the last save to a journal
+file next to the document, so a save costs the size of the edits and not
+the size of the document.
+
+When the journal outgrows both compact_bytes and the document itself, the
+document is rewritten in full and the journal is emptied. Compaction is
+thus proportional to the bytes journaled since the previous one.
+
+Journal records are a 13-byte header (kind, offset, length) followed, for
+insertions, by the inserted bytes. A save ends with a commit record, and
+records after the last commit are ignored when the document is opened, so
+a save interrupted by a crash is lost as a whole. A compaction is announced
+by a compact record written after the new document is complete on disk.
+"""
+import mmap
+import os
+import struct
+
+from white_box.class_exercises import DocumentEditingSystem
+
+JOURNAL_SUFFIX = ".journal"
+COMPACT_SUFFIX = ".compact"
+
+_RECORD = struct.Struct("<cQI")
+_INSERT = b"I"
+_DELETE = b"D"
+_COMMIT = b"C"
+_COMPACT = b"K"
+
+_ORIGINAL = 0
+_ADDED = 1
+
+
+class PieceTable:
+    """
+    Editable byte sequence over a read-only original buffer.
+    """
+
+    def __init__(self, original=b""):
+        """
+        Starts with the content of original (bytes, mmap or memoryview).
+        """
+        self._buffers = (original, bytearray())
+        self._pieces = [(_ORIGINAL, 0, len(original))] if len(original) else []
+        self._length = len(original)
+
+    def __len__(self):
+        """
+        Length of the content in bytes.
+        """
+        return self._length
+
+    def __bytes__(self):
+        """
+        The whole content.
+        """
+        return self.read()
+
+    def _locate(self, offset):
+        """
+        Returns (piece index, offset inside that piece) for a content offset.
+        """
+        if not 0 <= offset <= self._length:
+            raise IndexError("offset out of range")
+        for index, (_, _, length) in enumerate(self._pieces):
+            if offset < length:
+                return index, offset
+            offset -= length
+        return len(self._pieces), 0
+
+    def insert(self, offset, data):
+        """
+        Inserts data before the byte at offset.
+        """
+        if not data:
+            return
+        index, inner = self._locate(offset)
+        added = self._buffers[_ADDED]
+        piece = (_ADDED, len(added), len(data))
+        added += data
+        self._length += len(data)
+        if inner:
+            buffer, start, length = self._pieces[index]
+            self._pieces[index : index + 1] = [
+                (buffer, start, inner),
+                piece,
+                (buffer, start + inner, length - inner),
+            ]
+            return
+        previous = self._pieces[index - 1] if index else None
+        if previous and previous[0] == _ADDED and sum(previous[1:]) == piece[1]:
+            # Typing: extend the piece that ends where the new bytes start.
+            self._pieces[index - 1] = (_ADDED, previous[1], previous[2] + len(data))
+        else:
+            self._pieces.insert(index, piece)
+
+    def delete(self, offset, length):
+        """
+        Removes length bytes starting at offset.
+        """
+        if length <= 0:
+            return
+        if offset + length > self._length:
+            raise IndexError("deletion past the end")
+        index, inner = self._locate(offset)
+        kept = []
+        if inner:
+            buffer, start, _ = self._pieces[index]
+            kept.append((buffer, start, inner))
+        end = index
+        remaining = inner + length
+        while remaining:
+            buffer, start, size = self._pieces[end]
+            end += 1
+            if remaining < size:
+                kept.append((buffer, start + remaining, size - remaining))
+                break
+            remaining -= size
+        self._pieces[index:end] = kept
+        self._length -= length
+
+    def read(self, offset=0, length=None):
+        """
+        Returns length bytes (everything by default) from offset.
+        """
+        length = self._length - offset if length is None else length
+        length = max(0, min(length, self._length - offset))
+        index, inner = self._locate(offset)
+        chunks = []
+        while length:
+            buffer, start, size = self._pieces[index]
+            take = min(size - inner, length)
+            chunks.append(self._buffers[buffer][start + inner : start + inner + take])
+            length -= take
+            index, inner = index + 1, 0
+        return b"".join(chunks)
+
+    def write_to(self, file):
+        """
+        Writes the whole content to a binary file, piece by piece.
+        """
+        for buffer, start, length in self._pieces:
+            file.write(memoryview(self._buffers[buffer])[start : start + length])
+
+
+class Document(DocumentEditingSystem):
+    """
+    A DocumentEditingSystem holding the content of a file.
+    """
+
+    __slots__ = ("path", "buffer", "compact_bytes", "_pending", "_dirty", "_mmap")
+
+    def __init__(self, path, compact_bytes=1 << 20):
+        """
+        Opens (or creates) the document at path and replays its journal.
+        """
+        super().__init__()
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self._pending = []
+        self._dirty = []
+        self._mmap = None
+        self.buffer = PieceTable()
+        self._recover()
+        self._load()
+        self.state = "Saved"
+
+    def __enter__(self):
+        """
+        Returns the document itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Closes the document without saving it.
+        """
+        self.close()
+
+    @property
+    def journal_path(self):
+        """
+        Path of the journal file.
+        """
+        return self.path + JOURNAL_SUFFIX
+
+    def _recover(self):
+        """
+        Finishes a compaction interrupted after its compact record.
+        """
+        records = list(_read_journal(self.journal_path))
+        if not any(kind == _COMPACT for kind, _, _ in records):
+            return
+        if os.path.exists(self.path + COMPACT_SUFFIX):
+            os.replace(self.path + COMPACT_SUFFIX, self.path)
+        _truncate(self.journal_path)
+
+    def _load(self):
+        """
+        Maps the document file and applies the committed journal records.
+        """
+        with open(self.path, "ab+") as file:
+            if os.fstat(file.fileno()).st_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = PieceTable(self._mmap if self._mmap is not None else b"")
+        for kind, offset, value in _read_journal(self.journal_path):
+            if kind == _INSERT:
+                self.buffer.insert(offset, value)
+            elif kind == _DELETE:
+                self.buffer.delete(offset, value)
+
+    def __len__(self):
+        """
+        Length of the content in bytes.
+        """
+        return len(self.buffer)
+
+    def read(self, offset=0, length=None):
+        """
+        Returns length bytes (everything by default) from offset.
+        """
+        return self.buffer.read(offset, length)
+
+    def _edit(self):
+        """
+        Resumes editing when the document is saved.
+        """
+        if self.state == "Saved":
+            self.edit_document()
+
+    def insert(self, offset, data):
+        """
+        Inserts data before the byte at offset.
+        """
+        data = bytes(data)
+        self.buffer.insert(offset, data)
+        self._edit()
+        self._pending.append((_INSERT, offset, data))
+        self._dirty = _shift_ranges(self._dirty, offset, len(data))
+        self._dirty = _add_range(self._dirty, offset, offset + len(data))
+
+    def delete(self, offset, length):
+        """
+        Removes length bytes starting at offset.
+        """
+        self.buffer.delete(offset, length)
+        self._edit()
+        self._pending.append((_DELETE, offset, length))
+        self._dirty = _shift_ranges(self._dirty, offset, -length)
+        self._dirty = _add_range(self._dirty, offset, offset)
+
+    @property
+    def dirty_ranges(self):
+        """
+        (start, end) ranges of the content changed since the last save.
+
+        Empty ranges mark where bytes were deleted.
+        """
+        return list(self._dirty)
+
+    def save_document(self):
+        """
+        Function to save a document.
+
+        Appends the edits made since the last save to the journal, and
+        compacts the document when the journal has grown too large.
+        """
+        if self.state == "Editing" and self._pending:
+            with open(self.journal_path, "ab") as journal:
+                for kind, offset, value in self._pending:
+                    if kind == _INSERT:
+                        journal.write(_RECORD.pack(kind, offset, len(value)))
+                        journal.write(value)
+                    else:
+                        journal.write(_RECORD.pack(kind, offset, value))
+                journal.write(_RECORD.pack(_COMMIT, 0, len(self._pending)))
+                journal.flush()
+                os.fsync(journal.fileno())
+                journal_size = journal.tell()
+            self._pending = []
+            self._dirty = []
+            if journal_size > max(self.compact_bytes, len(self.buffer)):
+                self.compact()
+        return super().save_document()
+
+    def compact(self):
+        """
+        Rewrites the document with its saved content and empties the journal.
+        """
+        if self._pending:
+            raise RuntimeError("Save the document before compacting it")
+        compacted = self.path + COMPACT_SUFFIX
+        with open(compacted, "wb") as file:
+            self.buffer.write_to(file)
+            file.flush()
+            os.fsync(file.fileno())
+        with open(self.journal_path, "ab") as journal:
+            journal.write(_RECORD.pack(_COMPACT, 0, 0))
+            journal.flush()
+            os.fsync(journal.fileno())
+        self.close()
+        os.replace(compacted, self.path)
+        _truncate(self.journal_path)
+        self._load()
+
+    def close(self):
+        """
+        Releases the memory map of the document file.
+        """
+        self.buffer = PieceTable()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def _read_journal(path):
+    """
+    Yields the committed (kind, offset, data or length) journal records.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as file:
+        content = file.read()
+    position = 0
+    transaction = []
+    while position + _RECORD.size <= len(content):
+        kind, offset, length = _RECORD.unpack_from(content, position)
+        position += _RECORD.size
+        if kind == _INSERT:
+            if position + length > len(content):
+                break
+            transaction.append((kind, offset, content[position : position + length]))
+            position += length
+        elif kind == _DELETE:
+            transaction.append((kind, offset, length))
+        elif kind in (_COMMIT, _COMPACT):
+            transaction.append((kind, offset, length))
+            yield from transaction
+            transaction = []
+        else:
+            break
+
+
+def _truncate(path):
+    """
+    Empties a journal file.
+    """
+    with open(path, "wb") as file:
+        os.fsync(file.fileno())
+
+
+def _shift_ranges(ranges, offset, delta):
+    """
+    Moves range bounds after offset by delta bytes. With a negative delta
+    (a deletion) the bounds inside the deleted bytes collapse onto offset.
+    """
+    shifted = []
+    for bounds in ranges:
+        if delta >= 0:
+            bounds = [bound if bound < offset else bound + delta for bound in bounds]
+        else:
+            bounds = [
+                bound if bound <= offset else max(offset, bound + delta)
+                for bound in bounds
+            ]
+        shifted.append(tuple(bounds))
+    return shifted
+
+
+def _add_range(ranges, start, end):
+    """
+    Adds a range to a sorted list of ranges, merging the ones it touches.
+    """
+    merged = []
+    for low, high in sorted(ranges + [(start, end)]):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
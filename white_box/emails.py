@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+Email validation backed by precompiled DFAs, with a batch entry point.
+
+An address is split at its last "@". The local part is checked by one DFA
+(dot-separated atoms of letters, digits and the RFC 5322 symbols) and the
+domain by another (dot-separated labels that do not start or end with a
+hyphen, ending in an alphabetic top-level label of two or more letters).
+Domain results are kept in an index, so each distinct domain is run through
+its DFA only once.
+"""
+import string
+
+MIN_LENGTH = 5
+MAX_LENGTH = 50
+MAX_DOMAINS = 100_000
+
+VALID_EMAIL = "Valid Email"
+INVALID_EMAIL = "Invalid Email"
+
+REJECT = -1
+
+# Character classes.
+LETTER, DIGIT, HYPHEN, DOT, SYMBOL, OTHER = range(6)
+
+_CHAR_CLASSES = {
+    **dict.fromkeys(string.ascii_letters, LETTER),
+    **dict.fromkeys(string.digits, DIGIT),
+    **dict.fromkeys("!#$%&'*+/=?^_`{|}~", SYMBOL),
+    "-": HYPHEN,
+    ".": DOT,
+}
+
+
+class Dfa:  # pylint: disable=too-few-public-methods
+    """
+    Deterministic finite automaton over the character classes above.
+    """
+
+    def __init__(self, transitions, start, accepting):
+        """
+        Compiles a {state: {class: next_state}} mapping into a dense table.
+        """
+        self.start = start
+        self.accepting = frozenset(accepting)
+        size = max(transitions) + 1
+        self.table = tuple(
+            tuple(
+                transitions.get(state, {}).get(cls, REJECT) for cls in range(OTHER + 1)
+            )
+            for state in range(size)
+        )
+
+    def accepts(self, text):
+        """
+        Runs the automaton over text and tells whether it ends accepting.
+        """
+        table = self.table
+        classes = _CHAR_CLASSES
+        state = self.start
+        for char in text:
+            state = table[state][classes.get(char, OTHER)]
+            if state == REJECT:
+                return False
+        return state in self.accepting
+
+
+def _atom(next_state):
+    """
+    Transitions for any character allowed inside a local-part atom.
+    """
+    return {
+        LETTER: next_state,
+        DIGIT: next_state,
+        HYPHEN: next_state,
+        SYMBOL: next_state,
+    }
+
+
+# 0: start, 1: inside an atom, 2: right after a dot.
+LOCAL_PART_DFA = Dfa(
+    {0: _atom(1), 1: {**_atom(1), DOT: 2}, 2: _atom(1)},
+    start=0,
+    accepting={1},
+)
+
+# Before the first dot -> 0: label start, 1: inside a label, 2: after a hyphen.
+# After a dot -> 3: label start, 4: one letter, 5: letters only,
+# 6: label with digits or hyphens, 7: after a hyphen.
+DOMAIN_DFA = Dfa(
+    {
+        0: {LETTER: 1, DIGIT: 1},
+        1: {LETTER: 1, DIGIT: 1, HYPHEN: 2, DOT: 3},
+        2: {LETTER: 1, DIGIT: 1, HYPHEN: 2},
+        3: {LETTER: 4, DIGIT: 6},
+        4: {LETTER: 5, DIGIT: 6, HYPHEN: 7, DOT: 3},
+        5: {LETTER: 5, DIGIT: 6, HYPHEN: 7, DOT: 3},
+        6: {LETTER: 6, DIGIT: 6, HYPHEN: 7, DOT: 3},
+        7: {LETTER: 6, DIGIT: 6, HYPHEN: 7},
+    },
+    start=0,
+    accepting={5},
+)
+
+
+class EmailValidator:
+    """
+    Validates email addresses, remembering the verdict for every domain seen.
+    """
+
+    def __init__(self, max_domains=MAX_DOMAINS):
+        """
+        Creates an empty domain index holding at most max_domains entries.
+        """
+        self.max_domains = max_domains
+        self.domains = {}
+
+    def is_domain_valid(self, domain):
+        """
+        Classifies a domain, running the DFA only the first time it is seen.
+        """
+        valid = self.domains.get(domain)
+        if valid is None:
+            valid = DOMAIN_DFA.accepts(domain)
+            if len(self.domains) < self.max_domains:
+                self.domains[domain] = valid
+        return valid
+
+    def is_valid(self, email):
+        """
+        Tells whether an email address is valid.
+        """
+        if not MIN_LENGTH <= len(email) <= MAX_LENGTH:
+            return False
+        local_part, at, domain = email.rpartition("@")
+        return bool(
+            at and self.is_domain_valid(domain) and LOCAL_PART_DFA.accepts(local_part)
+        )
+
+    def validate(self, email):
+        """
+        Returns "Valid Email" or "Invalid Email", like validate_email.
+        """
+        return VALID_EMAIL if self.is_valid(email) else INVALID_EMAIL
+
+    def validate_emails(self, emails):
+        """
+        Lazily yields the validate result for every address, in input order.
+        """
+        is_valid = self.is_valid
+        for email in emails:
+            yield VALID_EMAIL if is_valid(email) else INVALID_EMAIL
+
+
+_DEFAULT_VALIDATOR = EmailValidator()
+
+
+def is_valid_email(email):
+    """
+    Tells whether an email address is valid, sharing a module-wide domain index.
+    """
+    return _DEFAULT_VALIDATOR.is_valid(email)
+
+
+def validate_emails(emails, validator=None):
+    """
+    Lazily validates many email addresses.
+
+    A fresh EmailValidator is used unless one is given, so the domain index
+    lives as long as the stream.
+    """
+    return (validator or EmailValidator()).validate_emails(emails)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+Table-driven finite-state-machine core.
+
+A state machine class lists its state names in STATES and declares each
+event with transition(), mapping the states where the event is valid to the
+next state and the message to return. When the class is created, every event
+is compiled into a tuple indexed by the integer code of the current state, and
+then into a method generated with its results as constants: an event taking
+every state where it is valid to the same next state and message, the common
+case, compares the code once, as cheaply as a string comparison; any other
+event does one tuple lookup. Instances only hold the integer code in a
+__slots__ slot.
+"""
+import ast
+
+
+def _constant(value, name, namespace):
+    """
+    Source text of value: its repr when that reads back as an equal literal,
+    else name, bound to value in namespace.
+    """
+    try:
+        if ast.literal_eval(repr(value)) == value:
+            return repr(value)
+    except (ValueError, SyntaxError):
+        pass
+    namespace[name] = value
+    return name
+
+
+def _body(row, invalid, namespace):
+    """
+    Source lines of an event firing the transitions compiled in row.
+
+    An event taking every state where it is valid to the same change tests
+    the state code once; any other event indexes row.
+    """
+    sources = [code for code, change in enumerate(row) if change != (code, invalid)]
+    changes = {row[code] for code in sources}
+    if len(changes) != 1:
+        row = _constant(row, "ROW", namespace)
+        return [f"self._state, message = {row}[self._state]", "return message"]
+    next_code, message = changes.pop()
+    if len(sources) == 1:
+        test = f"== {sources[0]}"
+    elif len(sources) == len(row) - 1:
+        test = f"!= {min(set(range(len(row))).difference(sources))}"
+    else:
+        test = f"in {tuple(sources)}"
+    return [
+        f"if self._state {test}:",
+        f"    self._state = {next_code}",
+        f"    return {_constant(message, 'MESSAGE', namespace)}",
+        f"return {_constant(invalid, 'INVALID', namespace)}",
+    ]
+
+
+def _event(row, invalid=None):
+    """
+    Event method firing the transitions compiled in row, generated with its
+    results as constants of the code.
+    """
+    namespace = {}
+    lines = ["def fire(self):"]
+    lines.extend("    " + line for line in _body(row, invalid, namespace))
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, "<fsm event>", "exec"), namespace)  # pylint: disable=exec-used
+    fire = namespace["fire"]
+    fire.fsm_row = row
+    return fire
+
+
+def transition(doc, changes):
+    """
+    Declares an event method.
+
+    changes maps a state name to a (next state name, message) pair. In any
+    other state the event leaves the state alone and returns the class
+    INVALID_MESSAGE.
+    """
+    fire = _event(())
+    fire.__doc__ = doc
+    fire.fsm_changes = changes
+    return fire
+
+
+class StateMachine:
+    """
+    Base class of the table-driven state machines.
+    """
+
+    __slots__ = ("_state",)
+
+    STATES = ()
+    INITIAL_STATE = None
+    INVALID_MESSAGE = None
+
+    STATE_CODES = {}
+    EVENTS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Compiles the transitions declared by a subclass.
+        """
+        super().__init_subclass__(**kwargs)
+        if not cls.STATES:
+            return
+        cls.STATE_CODES = {name: code for code, name in enumerate(cls.STATES)}
+        # Methods overriding an inherited event replace it in the registry.
+        cls.EVENTS = {name: getattr(cls, name) for name in cls.EVENTS}
+        for name, member in list(vars(cls).items()):
+            changes = getattr(member, "fsm_changes", None)
+            if changes is None:
+                continue
+            row = [(code, cls.INVALID_MESSAGE) for code in range(len(cls.STATES))]
+            for state, (next_state, message) in changes.items():
+                row[cls.STATE_CODES[state]] = (cls.STATE_CODES[next_state], message)
+            # A fresh function per class, closing over an immutable row.
+            event = _event(tuple(row), cls.INVALID_MESSAGE)
+            event.__doc__ = member.__doc__
+            event.__module__ = cls.__module__
+            event.__name__ = name
+            event.__qualname__ = f"{cls.__qualname__}.{name}"
+            event.fsm_changes = changes
+            setattr(cls, name, event)
+            cls.EVENTS[name] = event
+
+    def __init__(self):
+        """
+        Starts the machine in its initial state.
+        """
+        self._state = self.STATE_CODES[self.INITIAL_STATE or self.STATES[0]]
+
+    @property
+    def state(self):
+        """
+        Name of the current state.
+        """
+        return self.STATES[self._state]
+
+    @state.setter
+    def state(self, name):
+        """
+        Moves the machine to the named state.
+        """
+        try:
+            self._state = self.STATE_CODES[name]
+        except KeyError:
+            raise ValueError(f"Unknown state: {name!r}") from None
+
+    @property
+    def state_code(self):
+        """
+        Integer code of the current state (its index in STATES).
+        """
+        return self._state
+
+    @state_code.setter
+    def state_code(self, code):
+        """
+        Moves the machine to the state with the given code.
+        """
+        if not 0 <= code < len(self.STATES):
+            raise ValueError(f"Unknown state code: {code!r}")
+        self._state = code
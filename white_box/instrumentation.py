@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in transition metrics for the table-driven state machines.
+
+instrument(cls) swaps the event methods of a StateMachine class for
+wrappers that count events by the state they were fired in, which gives
+both the transitions taken and the invalid operations, and optionally
+record a latency histogram. uninstrument(cls) puts the original methods
+back, so a class that is not instrumented runs exactly the code it would
+run without this module.
+
+Counters are plain list increments: under threads a few counts may be
+lost, which is accepted for monitoring.
+"""
+import bisect
+import functools
+import time
+
+# Upper bounds of the latency buckets, in nanoseconds.
+LATENCY_BUCKETS_NS = (100, 250, 500, 1_000, 2_500, 5_000, 10_000, 100_000, 1_000_000)
+
+_METRICS = {}
+
+
+class _EventMetrics:  # pylint: disable=too-few-public-methods
+    """
+    Counters of one instrumented event.
+    """
+
+    def __init__(self, cls, name):
+        """
+        Zeroed counters for event name of cls.
+        """
+        self.original = cls.EVENTS[name]
+        self.changes = _declared_changes(cls, name)
+        self.counts = [0] * len(cls.STATES)
+        self.histogram = [0] * (len(LATENCY_BUCKETS_NS) + 1)
+        self.total_ns = [0]
+
+
+def _declared_changes(cls, name):
+    """
+    The transition() changes of an event, looked up along the MRO so that
+    overriding methods are covered.
+    """
+    for klass in cls.__mro__:
+        changes = getattr(vars(klass).get(name), "fsm_changes", None)
+        if changes is not None:
+            return changes
+    return {}
+
+
+def _counting(fire, counts):
+    """
+    Wraps an event method to count it by source state.
+    """
+
+    row = getattr(fire, "fsm_row", None)
+    if row is None:
+
+        @functools.wraps(fire)
+        def event(self):
+            counts[self._state] += 1  # pylint: disable=protected-access
+            return fire(self)
+
+        return event
+
+    # A compiled transition: count and fire inline, saving a call.
+    @functools.wraps(fire)
+    def transition(self):
+        state = self._state  # pylint: disable=protected-access
+        counts[state] += 1
+        self._state, message = row[state]  # pylint: disable=protected-access
+        return message
+
+    return transition
+
+
+def _timing(fire, counts, histogram, total_ns):
+    """
+    Wraps an event method to count it and record its latency.
+    """
+    clock = time.perf_counter_ns
+    locate = bisect.bisect_left
+    bounds = LATENCY_BUCKETS_NS
+
+    @functools.wraps(fire)
+    def event(self):
+        counts[self._state] += 1  # pylint: disable=protected-access
+        start = clock()
+        message = fire(self)
+        elapsed = clock() - start
+        histogram[locate(bounds, elapsed)] += 1
+        total_ns[0] += elapsed
+        return message
+
+    return event
+
+
+def instrument(*classes, latency=False):
+    """
+    Starts collecting metrics for the given StateMachine classes.
+    """
+    for cls in classes:
+        uninstrument(cls)
+        metrics = {name: _EventMetrics(cls, name) for name in cls.EVENTS}
+        for name, event in metrics.items():
+            if latency:
+                wrapper = _timing(
+                    event.original, event.counts, event.histogram, event.total_ns
+                )
+            else:
+                wrapper = _counting(event.original, event.counts)
+            setattr(cls, name, wrapper)
+            cls.EVENTS[name] = wrapper
+        _METRICS[cls] = metrics
+
+
+def uninstrument(*classes):
+    """
+    Restores the original event methods and drops the metrics.
+    """
+    for cls in classes:
+        for name, event in _METRICS.pop(cls, {}).items():
+            setattr(cls, name, event.original)
+            cls.EVENTS[name] = event.original
+
+
+def is_instrumented(cls):
+    """
+    Tells whether metrics are being collected for a class.
+    """
+    return cls in _METRICS
+
+
+def snapshot():
+    """
+    Current metrics of every instrumented class as a JSON-friendly dict:
+    {class: {event: {"transitions", "invalid", "latency"}}}.
+    """
+    result = {}
+    for cls, metrics in _METRICS.items():
+        events = result[cls.__name__] = {}
+        for name, event in metrics.items():
+            transitions, invalid = {}, {}
+            for code, count in enumerate(event.counts):
+                state = cls.STATES[code]
+                if state in event.changes:
+                    target = event.changes[state][0]
+                    transitions[f"{state} -> {target}"] = count
+                elif count:
+                    invalid[state] = count
+            events[name] = {
+                "transitions": transitions,
+                "invalid": invalid,
+                "latency": {
+                    "buckets_ns": dict(
+                        zip(LATENCY_BUCKETS_NS + ("+Inf",), event.histogram)
+                    ),
+                    "sum_ns": event.total_ns[0],
+                    "count": sum(event.histogram),
+                },
+            }
+    return result
+
+
+def _labels(**labels):
+    """
+    Prometheus label set.
+    """
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _histogram_lines(name, labels, histogram):
+    """
+    Prometheus lines of one latency histogram.
+    """
+    lines = []
+    cumulative = 0
+    for bound, count in histogram["buckets_ns"].items():
+        cumulative += count
+        le = bound if bound == "+Inf" else repr(bound / 1e9)
+        lines.append(f"{name}_bucket{_labels(**labels, le=le)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram['sum_ns'] / 1e9!r}")
+    lines.append(f"{name}_count{_labels(**labels)} {cumulative}")
+    return lines
+
+
+def prometheus_text(prefix="white_box_fsm"):
+    """
+    Current metrics in the Prometheus text exposition format.
+    """
+    transitions = [
+        f"# HELP {prefix}_transitions_total State machine transitions taken.",
+        f"# TYPE {prefix}_transitions_total counter",
+    ]
+    invalid = [
+        f"# HELP {prefix}_invalid_total Events rejected in the current state.",
+        f"# TYPE {prefix}_invalid_total counter",
+    ]
+    latency = [
+        f"# HELP {prefix}_event_seconds Time spent handling events.",
+        f"# TYPE {prefix}_event_seconds histogram",
+    ]
+    for machine, events in snapshot().items():
+        for event, metrics in events.items():
+            labels = {"machine": machine, "event": event}
+            for transition, count in metrics["transitions"].items():
+                source, target = transition.split(" -> ")
+                edge = dict(labels, **{"from": source, "to": target})
+                transitions.append(
+                    f"{prefix}_transitions_total{_labels(**edge)} {count}"
+                )
+            for state, count in metrics["invalid"].items():
+                invalid.append(
+                    f"{prefix}_invalid_total{_labels(**labels, state=state)} {count}"
+                )
+            if metrics["latency"]["count"]:
+                latency += _histogram_lines(
+                    f"{prefix}_event_seconds", labels, metrics["latency"]
+                )
+    return "\n".join(transitions + invalid + latency) + "\n"
+
+
+def reset():
+    """
+    Zeroes the metrics of every instrumented class.
+    """
+    for metrics in _METRICS.values():
+        for event in metrics.values():
+            event.counts[:] = [0] * len(event.counts)
+            event.histogram[:] = [0] * len(event.histogram)
+            event.total_ns[0] = 0
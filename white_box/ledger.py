@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-memory account ledger.
+
+Balances are kept in whole cents in one growable int64 NumPy array, and a
+dict maps every account number to its row, so lookups are O(1) and each
+account costs one array slot plus its dict entry. Working in cents keeps
+repeated fee postings free of floating point drift.
+"""
+import bisect
+import itertools
+import math
+
+import numpy as np
+
+FEE_ACCOUNT = "fees"
+
+# Largest amount plus fee of a transfer, in cents. Batch sums go through
+# float64, which holds integers exactly up to 2**53.
+MAX_TRANSFER_CENTS = 2**53
+
+# Status codes of transfer_batch rows.
+(
+    TRANSFER_OK,
+    NOT_AUTHENTICATED,
+    INVALID_TRANSACTION_TYPE,
+    INVALID_AMOUNT,
+    UNKNOWN_ACCOUNT,
+    INSUFFICIENT_FUNDS,
+) = range(6)
+TRANSFER_STATUS_LABELS = (
+    "OK",
+    "Sender not authenticated.",
+    "Invalid transaction type.",
+    "Invalid amount.",
+    "Unknown account.",
+    "Insufficient funds.",
+)
+
+
+def to_cents(amount):
+    """
+    Converts an amount of money to whole cents.
+    """
+    return int(round(amount * 100))
+
+
+def is_valid_amount(amount, fee=0):
+    """
+    Tells whether a transfer amount and its fee are finite, not negative,
+    and no more than MAX_TRANSFER_CENTS together.
+    """
+    return (
+        math.isfinite(amount)
+        and math.isfinite(fee)
+        and amount >= 0
+        and fee >= 0
+        and to_cents(amount) + to_cents(fee) <= MAX_TRANSFER_CENTS
+    )
+
+
+def from_cents(cents):
+    """
+    Converts cents back to an amount, an int when there are no cents.
+    """
+    cents = int(cents)
+    return cents // 100 if cents % 100 == 0 else cents / 100
+
+
+def _as_list(values):
+    """
+    A batch column as a list of Python objects.
+    """
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def fee_rates_of(transaction_types, fee_rates):
+    """
+    Fee rate of every transaction type, NaN for unknown types.
+    """
+    types = _as_list(transaction_types)
+    rates = map(fee_rates.get, types, itertools.repeat(np.nan))
+    return np.fromiter(rates, np.float64, len(types))
+
+
+class Ledger:
+    """
+    Accounts and balances of a bank.
+    """
+
+    def __init__(self, capacity=1024, fee_account=FEE_ACCOUNT):
+        """
+        Creates an empty ledger with room for capacity accounts before it
+        has to grow, and the account receiving the fees.
+        """
+        self._balances = np.zeros(max(1, capacity), dtype=np.int64)
+        self._rows = {}
+        self.fee_account = fee_account
+        self.open_account(fee_account)
+
+    def __len__(self):
+        """
+        Number of accounts, the fee account included.
+        """
+        return len(self._rows)
+
+    def __contains__(self, account_number):
+        """
+        Tells whether an account exists.
+        """
+        return account_number in self._rows
+
+    def __iter__(self):
+        """
+        Iterates over the account numbers in opening order.
+        """
+        return iter(self._rows)
+
+    @property
+    def capacity(self):
+        """
+        Number of accounts the ledger holds before it has to grow.
+        """
+        return self._balances.size
+
+    def row(self, account_number):
+        """
+        Row of an account in the balance array.
+        """
+        try:
+            return self._rows[account_number]
+        except KeyError:
+            raise KeyError(f"Unknown account: {account_number}") from None
+
+    def open_account(self, account_number, balance=0):
+        """
+        Opens an account with an opening balance and returns its row.
+        """
+        if account_number in self._rows:
+            raise ValueError(f"Account {account_number} already exists")
+        row = len(self._rows)
+        if row == self._balances.size:
+            self._balances = np.concatenate(
+                (self._balances, np.zeros_like(self._balances))
+            )
+        self._balances[row] = to_cents(balance)
+        self._rows[account_number] = row
+        return row
+
+    def ensure_account(self, account_number, balance=0):
+        """
+        Returns the row of an account, opening it when missing.
+        """
+        row = self._rows.get(account_number)
+        return self.open_account(account_number, balance) if row is None else row
+
+    def balance(self, account_number):
+        """
+        Balance of an account.
+        """
+        return from_cents(self._balances[self.row(account_number)])
+
+    def balances(self):
+        """
+        Read-only view of the balances in cents, indexed by row.
+        """
+        view = self._balances[: len(self._rows)]
+        view.flags.writeable = False
+        return view
+
+    def deposit(self, account_number, amount):
+        """
+        Credits an account.
+        """
+        if amount < 0:
+            raise ValueError("amount must not be negative")
+        self._balances[self.row(account_number)] += to_cents(amount)
+
+    def debit_row(self, row, cents):
+        """
+        Takes cents from the account at a row.
+
+        Returns False, taking nothing, when the balance cannot cover them.
+        """
+        if self._balances[row] < cents:
+            return False
+        self._balances[row] -= cents
+        return True
+
+    def credit_row(self, row, cents):
+        """
+        Adds cents to the account at a row.
+        """
+        self._balances[row] += cents
+
+    def transfer(self, sender, receiver, amount, fee=0):
+        """
+        Moves amount from sender to receiver and fee from sender to the fee
+        account, all or nothing. A missing receiver gets an empty account
+        once the transfer is accepted, as in transfer_batch.
+
+        Returns False, moving nothing, when the sender cannot cover both.
+        """
+        if amount < 0 or fee < 0:
+            raise ValueError("amount and fee must not be negative")
+        sender_row = self.row(sender)
+        amount_cents = to_cents(amount)
+        fee_cents = to_cents(fee)
+        if self._balances[sender_row] < amount_cents + fee_cents:
+            return False
+        receiver_row = self.ensure_account(receiver)
+        balances = self._balances
+        balances[sender_row] -= amount_cents + fee_cents
+        balances[receiver_row] += amount_cents
+        balances[self._rows[self.fee_account]] += fee_cents
+        return True
+
+    def rows_of(self, account_numbers):
+        """
+        Rows of many accounts, -1 for unknown ones.
+        """
+        numbers = _as_list(account_numbers)
+        get = self._rows.get
+        return np.fromiter(
+            (get(number, -1) for number in numbers), np.int64, len(numbers)
+        )
+
+    def _batch_status(self, senders, amounts, rates, authorized):
+        """
+        Validates a batch of transfers, returning their status codes and
+        sender rows.
+        """
+        status = np.full(amounts.shape, TRANSFER_OK, dtype=np.int8)
+        sender_rows = self.rows_of(senders)
+        status[sender_rows < 0] = UNKNOWN_ACCOUNT
+        debits = np.abs(amounts) * (1 + np.nan_to_num(rates)) * 100
+        status[~((amounts >= 0) & (debits <= MAX_TRANSFER_CENTS))] = INVALID_AMOUNT
+        status[np.isnan(rates)] = INVALID_TRANSACTION_TYPE
+        if authorized is not None:
+            allowed = np.fromiter(
+                map(authorized.__contains__, senders), bool, len(senders)
+            )
+            status[~allowed] = NOT_AUTHENTICATED
+        return status, sender_rows
+
+    def _apply_net(self, sender_rows, receiver_rows, amount_cents, fee_cents):
+        """
+        Adds the net effect of accepted transfers to the balances at once.
+        """
+        balances = self._balances[: len(self._rows)]
+        net = np.bincount(receiver_rows, weights=amount_cents, minlength=balances.size)
+        net -= np.bincount(
+            sender_rows, weights=amount_cents + fee_cents, minlength=balances.size
+        )
+        net[self._rows[self.fee_account]] += fee_cents.sum()
+        balances += np.rint(net).astype(np.int64)
+
+    def _receiver_rows(self, receivers, valid):
+        """
+        Rows of the receivers, numbering the receivers of valid transfers
+        that are outside the bank after the last account, in order of first
+        appearance. Returns the rows and the account numbers of those
+        receivers.
+        """
+        rows = self.rows_of(receivers)
+        outside = {}
+        base = len(self._rows)
+        for index in np.flatnonzero(valid & (rows < 0)).tolist():
+            rows[index] = base + outside.setdefault(receivers[index], len(outside))
+        return rows, list(outside)
+
+    def _open_receivers(self, rows, outside):
+        """
+        Opens an empty account for the receivers outside the bank that
+        appear in rows, and returns rows numbered after these accounts.
+        """
+        base = len(self._rows)
+        used = np.zeros(len(outside), dtype=bool)
+        used[rows[rows >= base] - base] = True
+        renumbered = np.arange(base + len(outside))
+        for index in np.flatnonzero(used).tolist():
+            renumbered[base + index] = self.open_account(outside[index])
+        return renumbered[rows]
+
+    def transfer_batch(  # pylint: disable=too-many-arguments,too-many-locals
+        self, senders, receivers, amounts, transaction_types, fee_rates, authorized=None
+    ):
+        """
+        Performs many transfers at once and returns an int8 status code
+        (see TRANSFER_STATUS_LABELS) for each of them.
+
+        fee_rates maps transaction types to the fee share of the amount;
+        authorized, when given, is the collection of senders allowed to
+        transfer. Balance changes are netted per account and written in one
+        step: a sender's transfers are accepted in row order up to the first
+        one that its balance, plus what it receives in the batch, cannot
+        cover.
+        """
+        senders = _as_list(senders)
+        receivers = _as_list(receivers)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        rates = fee_rates_of(transaction_types, fee_rates)
+        status, sender_rows = self._batch_status(senders, amounts, rates, authorized)
+        receiver_rows, outside = self._receiver_rows(receivers, status == TRANSFER_OK)
+
+        valid = np.flatnonzero(status == TRANSFER_OK)
+        sender_rows = sender_rows[valid]
+        receiver_rows = receiver_rows[valid]
+        amount_cents = np.rint(amounts[valid] * 100).astype(np.int64)
+        fee_cents = np.rint(amounts[valid] * rates[valid] * 100).astype(np.int64)
+
+        accepted = _accept_in_order(
+            self._balances[: len(self._rows)],
+            sender_rows,
+            receiver_rows,
+            amount_cents + fee_cents,
+            amount_cents,
+        )
+        status[valid[~accepted]] = INSUFFICIENT_FUNDS
+        # Receivers outside the bank only get an account when paid.
+        self._apply_net(
+            sender_rows[accepted],
+            self._open_receivers(receiver_rows[accepted], outside),
+            amount_cents[accepted],
+            fee_cents[accepted],
+        )
+        return status
+
+    def view_account(self, account_number):
+        """
+        Function to display the account details.
+        """
+        return (
+            "The account "
+            + str(account_number)
+            + " has a balance of "
+            + str(self.balance(account_number))
+        )
+
+
+def _spent_in_order(senders, debits):
+    """
+    Running total of the debits of every sender, for rows sorted by
+    sender, and whether that total can be covered at all.
+    """
+    starts = np.ones(senders.size, dtype=bool)
+    starts[1:] = senders[1:] != senders[:-1]
+    # Position of the first row of every sender. The running sum may wrap
+    # around in long batches, but differences of it stay exact.
+    first = np.maximum.accumulate(np.where(starts, np.arange(senders.size), 0))
+    running = np.cumsum(debits)
+    spent = running - (running - debits)[first]
+    # Spending more than an int64 holds is never covered (and would wrap).
+    running = np.cumsum(debits, dtype=np.float64)
+    return spent, running - (running - debits)[first] < 2.0**62
+
+
+def _shrink_prefixes(groups, stops, spent, received, transfers):
+    """
+    Propagates rejected transfers through the accepted prefixes of the
+    senders.
+
+    groups maps every sender row to its (index, first position, end
+    position, balance) and stops holds the end of the accepted prefix of
+    every sender, which is shortened in place. transfers holds the
+    (receiver row, incoming amount) of every position, received what every
+    row gets from the transfers accepted so far.
+    """
+    pending = [
+        (stops[index], end)
+        for index, _, end, _ in groups.values()
+        if stops[index] < end
+    ]
+    while pending:
+        low, high = pending.pop()
+        for receiver, amount in transfers[low:high]:
+            received[receiver] -= amount
+            group = groups.get(receiver)
+            if group is None:
+                continue
+            index, first, _, balance = group
+            stop = bisect.bisect_right(
+                spent, balance + received[receiver], first, stops[index]
+            )
+            if stop < stops[index]:
+                pending.append((stop, stops[index]))
+                stops[index] = stop
+
+
+def _sender_groups(sorted_senders, balances, covered):
+    """
+    Groups rows sorted by sender. Returns a dict mapping every sender row to
+    its (index, first position, end position, balance), the end of the
+    covered prefix of every sender and its number of rows.
+    """
+    starts = np.flatnonzero(np.diff(sorted_senders, prepend=-1) != 0)
+    lengths = np.diff(starts, append=sorted_senders.size)
+    stops = starts + np.add.reduceat(covered.astype(np.int64), starts)
+    group_senders = sorted_senders[starts]
+    groups = {
+        sender: group
+        for sender, *group in zip(
+            group_senders.tolist(),
+            range(starts.size),
+            starts.tolist(),
+            (starts + lengths).tolist(),
+            balances[group_senders].tolist(),
+        )
+    }
+    return groups, stops.tolist(), lengths
+
+
+def _accept_in_order(balances, senders, receivers, debits, incoming):
+    """
+    Accepts, per sender and in row order, the transfers covered by the
+    sender balance plus the incoming amounts of the accepted transfers.
+
+    The accepted transfers of a sender are a prefix of its rows. Starting
+    from every transfer accepted, each rejected transfer lowers what its
+    receiver gets, which may shorten the prefix of that receiver in turn.
+    These rejections are propagated with a worklist; prefixes only ever
+    shrink, so every row is handled at most once.
+    """
+    order = np.argsort(senders, kind="stable")
+    sorted_senders = senders[order]
+    spent, coverable = _spent_in_order(sorted_senders, debits[order])
+    received = np.bincount(receivers, weights=incoming, minlength=balances.size)
+    covered = coverable & (spent <= balances[sorted_senders] + received[sorted_senders])
+    groups, stops, lengths = _sender_groups(sorted_senders, balances, covered)
+    _shrink_prefixes(
+        groups,
+        stops,
+        spent.tolist(),
+        received.tolist(),
+        list(zip(receivers[order].tolist(), incoming[order].tolist())),
+    )
+
+    accepted = np.empty(senders.size, dtype=bool)
+    accepted[order] = np.arange(senders.size) < np.repeat(stops, lengths)
+    return accepted
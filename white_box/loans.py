@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming loan-eligibility scoring over large applicant files.
+
+Applicant files (CSV with a header row, or JSON Lines) are read in chunks of
+lines. Each chunk is parsed, scored with one vectorized selection over its
+income and credit_score columns and written out before the next one is read,
+so memory depends on the chunk size and not on the file size. With processes
+set, chunks are parsed and scored in a worker pool while the main process
+keeps reading and writing in order.
+
+CSV chunks are split on line boundaries, so quoted fields must not contain
+newlines.
+"""
+import collections
+import csv
+import functools
+import io
+import json
+
+import numpy as np
+
+from white_box.parallel import chunked, imap_bounded
+
+INCOME_FIELD = "income"
+CREDIT_SCORE_FIELD = "credit_score"
+RESULT_FIELD = "loan"
+
+NOT_ELIGIBLE, SECURED, STANDARD, PREMIUM = range(4)
+LOAN_LABELS = ("Not Eligible", "Secured Loan", "Standard Loan", "Premium Loan")
+
+
+def score_applicants(incomes, credit_scores, labels=False):
+    """
+    Scores many applicants at once (batch version of check_loan_eligibility).
+
+    Returns codes indexing LOAN_LABELS, or the labels themselves.
+    """
+    incomes = np.asarray(incomes, dtype=np.float64)
+    credit_scores = np.asarray(credit_scores, dtype=np.float64)
+    middle = (incomes >= 30000) & (incomes <= 60000)
+    codes = np.select(
+        [
+            incomes < 30000,
+            middle & (credit_scores > 700),
+            middle,
+            credit_scores > 750,
+        ],
+        [NOT_ELIGIBLE, STANDARD, SECURED, PREMIUM],
+        default=STANDARD,
+    ).astype(np.int8)
+    return np.asarray(LOAN_LABELS)[codes] if labels else codes
+
+
+def _file_format(path):
+    """
+    Picks "csv" or "jsonl" from a file name.
+    """
+    if str(path).endswith(".csv"):
+        return "csv"
+    if str(path).endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Unsupported applicant file: {path}")
+
+
+def _parse(lines, file_format, fieldnames):
+    """
+    Parses a chunk of lines into a list of row dicts.
+    """
+    if file_format == "csv":
+        return list(csv.DictReader(lines, fieldnames=fieldnames))
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def _format(rows, file_format, fieldnames):
+    """
+    Serializes scored rows back to text.
+    """
+    if file_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames + [RESULT_FIELD])
+        writer.writerows(rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def score_lines(lines, file_format="jsonl", fieldnames=None):
+    """
+    Parses, scores and serializes one chunk of applicant lines.
+
+    Returns the output text and a Counter of the labels given.
+    """
+    rows = _parse(lines, file_format, fieldnames)
+    incomes = np.fromiter((row[INCOME_FIELD] for row in rows), float, len(rows))
+    credit_scores = np.fromiter(
+        (row[CREDIT_SCORE_FIELD] for row in rows), float, len(rows)
+    )
+    decisions = score_applicants(incomes, credit_scores, labels=True).tolist()
+    for row, decision in zip(rows, decisions):
+        row[RESULT_FIELD] = decision
+    return _format(rows, file_format, fieldnames), collections.Counter(decisions)
+
+
+def score_file(input_path, output_path, chunksize=10000, processes=None):
+    """
+    Scores every applicant of a CSV or JSON Lines file.
+
+    The output file has the input format with an extra "loan" column, and is
+    written chunk by chunk. Returns a Counter of the labels given.
+    """
+    file_format = _file_format(input_path)
+    totals = collections.Counter()
+    with open(input_path, encoding="utf-8", newline="") as source, open(
+        output_path, "w", encoding="utf-8", newline=""
+    ) as target:
+        fieldnames = None
+        if file_format == "csv":
+            fieldnames = next(csv.reader([source.readline()]), [])
+            writer = csv.writer(target)
+            writer.writerow(fieldnames + [RESULT_FIELD])
+
+        worker = functools.partial(
+            score_lines, file_format=file_format, fieldnames=fieldnames
+        )
+        chunks = chunked(source, chunksize)
+        if processes:
+            results = imap_bounded(worker, chunks, processes)
+        else:
+            results = map(worker, chunks)
+
+        for text, counts in results:
+            target.write(text)
+            totals.update(counts)
+    return totals
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""
+Helpers to stream work through a process pool with bounded memory.
+"""
+import collections
+import itertools
+import multiprocessing
+
+
+def chunked(iterable, size):
+    """
+    Splits an iterable into lists of at most size elements.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def imap_bounded(func, chunks, processes, window=None):
+    """
+    Applies func to every chunk in a process pool and yields the results in
+    input order.
+
+    Unlike Pool.imap, at most window chunks (twice the number of processes by
+    default) are in flight at once, so the input is consumed lazily and memory
+    stays bounded however long the input is.
+    """
+    window = window or 2 * processes
+    pending = collections.deque()
+    with multiprocessing.Pool(processes) as pool:
+        for chunk in chunks:
+            pending.append(pool.apply_async(func, (chunk,)))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+Single-pass password validation with per-rule failure reasons.
+"""
+import string
+
+from white_box.parallel import chunked, imap_bounded
+
+MIN_LENGTH = 8
+SPECIAL_CHARACTERS = "!@#$%&"
+
+RULE_LENGTH = 1
+RULE_UPPER = 2
+RULE_LOWER = 4
+RULE_DIGIT = 8
+RULE_SPECIAL = 16
+
+RULE_NAMES = {
+    RULE_LENGTH: "length",
+    RULE_UPPER: "upper",
+    RULE_LOWER: "lower",
+    RULE_DIGIT: "digit",
+    RULE_SPECIAL: "special",
+}
+
+_CHARACTER_RULES = RULE_UPPER | RULE_LOWER | RULE_DIGIT | RULE_SPECIAL
+
+# Character -> rule it satisfies, built once at import time.
+_CHAR_CLASSES = {
+    **dict.fromkeys(string.ascii_uppercase, RULE_UPPER),
+    **dict.fromkeys(string.ascii_lowercase, RULE_LOWER),
+    **dict.fromkeys(string.digits, RULE_DIGIT),
+    **dict.fromkeys(SPECIAL_CHARACTERS, RULE_SPECIAL),
+}
+
+
+def password_failures(password):
+    """
+    Returns the bitmask of rules the password fails, 0 meaning valid.
+    """
+    failures = RULE_LENGTH if len(password) < MIN_LENGTH else 0
+    missing = _CHARACTER_RULES
+    for char in set(password):
+        rule = _CHAR_CLASSES.get(char)
+        if rule is None:
+            # Like re's \d, non-ASCII decimal digits count as digits.
+            rule = RULE_DIGIT if char.isdecimal() else 0
+        missing &= ~rule
+    return failures | missing
+
+
+def describe_failures(mask):
+    """
+    Lists the names of the rules set in a failure bitmask.
+    """
+    return [name for rule, name in RULE_NAMES.items() if mask & rule]
+
+
+def _chunk_failures(passwords):
+    """
+    Validates a chunk of passwords inside a worker process.
+    """
+    return [password_failures(password) for password in passwords]
+
+
+def validate_passwords(passwords, processes=None, chunksize=1024):
+    """
+    Lazily yields the failure bitmask of every password, in input order.
+
+    With processes set, chunks of chunksize passwords are validated in a
+    process pool while the input is still being read.
+    """
+    if not processes:
+        for password in passwords:
+            yield password_failures(password)
+        return
+
+    for masks in imap_bounded(
+        _chunk_failures, chunked(passwords, chunksize), processes
+    ):
+        yield from masks
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+Replay of recorded elevator events with resumable checkpoints.
+
+An event log has one "car_id,event" line per event, where event is one of
+the ElevatorSystem events (move_up, move_down or stop). ElevatorReplay applies
+the log to one ElevatorSystem per car id, records the events that were
+invalid in the state of their car, and every checkpoint_every events writes a
+small JSON checkpoint with the byte offset reached in the log and the state
+code of every car. ElevatorReplay.resume restarts from the newest checkpoint
+instead of from the start of the log.
+"""
+import collections
+import json
+import os
+
+from white_box.class_exercises import ElevatorSystem
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_PREFIX = "checkpoint-"
+
+InvalidOperation = collections.namedtuple(
+    "InvalidOperation", "offset car_id event state"
+)
+InvalidOperation.__doc__ = """
+An event rejected by its car: the byte offset of its line in the log, the car
+id, the event name and the state the car was in.
+"""
+
+
+class ElevatorReplay:  # pylint: disable=too-many-instance-attributes
+    """
+    Applies elevator event logs to a set of ElevatorSystem cars.
+    """
+
+    def __init__(self, checkpoint_dir=None, checkpoint_every=100_000, keep=3):
+        """
+        Checkpoints are written to checkpoint_dir, when given, every
+        checkpoint_every events; only the newest keep are kept.
+        """
+        if checkpoint_every < 1 or keep < 1:
+            raise ValueError("checkpoint_every and keep must be at least 1")
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.keep = keep
+        self.cars = {}
+        self.offset = 0
+        self.events = 0
+        self.invalid_count = 0
+        self.invalid = []
+
+    def car(self, car_id):
+        """
+        Returns the elevator of a car, creating it idle on first use.
+        """
+        elevator = self.cars.get(car_id)
+        if elevator is None:
+            elevator = self.cars[car_id] = ElevatorSystem()
+        return elevator
+
+    def replay(self, log_path):
+        """
+        Applies the log from the current offset to its end.
+
+        Returns the number of events applied by this call.
+        """
+        events = ElevatorSystem.EVENTS
+        invalid_message = ElevatorSystem.INVALID_MESSAGE
+        cars = self.cars
+        every = self.checkpoint_every
+        applied = 0
+        with open(log_path, "rb") as file:
+            file.seek(self.offset)
+            for line in file:
+                # The offset only moves past lines that have been applied.
+                offset = self.offset
+                car_id, _, event = line.decode("utf-8").strip().partition(",")
+                if not event:
+                    self.offset = offset + len(line)
+                    continue
+                fire = events.get(event)
+                if fire is None:
+                    raise ValueError(f"Unknown elevator event at byte {offset}")
+                elevator = cars.get(car_id) or self.car(car_id)
+                if fire(elevator) == invalid_message:
+                    # Invalid events leave the state alone.
+                    self.invalid_count += 1
+                    self.invalid.append(
+                        InvalidOperation(offset, car_id, event, elevator.state)
+                    )
+                self.offset = offset + len(line)
+                applied += 1
+                self.events += 1
+                if self.checkpoint_dir and self.events % every == 0:
+                    self.checkpoint()
+        if self.checkpoint_dir and applied:
+            self.checkpoint()
+        return applied
+
+    def snapshot(self):
+        """
+        Compact dict with everything needed to resume the replay.
+        """
+        return {
+            "version": CHECKPOINT_VERSION,
+            "offset": self.offset,
+            "events": self.events,
+            "invalid_count": self.invalid_count,
+            "states": {
+                car_id: elevator.state_code for car_id, elevator in self.cars.items()
+            },
+        }
+
+    def restore(self, snapshot):
+        """
+        Loads a dict made by snapshot.
+        """
+        if snapshot.get("version") != CHECKPOINT_VERSION:
+            raise ValueError("Unsupported checkpoint version")
+        self.offset = snapshot["offset"]
+        self.events = snapshot["events"]
+        self.invalid_count = snapshot["invalid_count"]
+        self.invalid = []
+        self.cars = {}
+        for car_id, code in snapshot["states"].items():
+            self.car(car_id).state_code = code
+
+    def checkpoint(self):
+        """
+        Writes a checkpoint of the current position and returns its path.
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        name = f"{CHECKPOINT_PREFIX}{self.events:012d}.json"
+        path = os.path.join(self.checkpoint_dir, name)
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, separators=(",", ":"))
+        os.replace(temporary, path)
+        for old in checkpoints(self.checkpoint_dir)[: -self.keep]:
+            os.remove(old)
+        return path
+
+    @classmethod
+    def resume(cls, checkpoint_dir, **kwargs):
+        """
+        Creates a replay positioned at the newest checkpoint of
+        checkpoint_dir, or at the start when there is none.
+        """
+        replay = cls(checkpoint_dir, **kwargs)
+        paths = checkpoints(checkpoint_dir)
+        if paths:
+            with open(paths[-1], encoding="utf-8") as file:
+                replay.restore(json.load(file))
+        return replay
+
+
+def checkpoints(checkpoint_dir):
+    """
+    Paths of the checkpoints in a directory, oldest first.
+    """
+    if not os.path.isdir(checkpoint_dir):
+        return []
+    names = sorted(
+        name
+        for name in os.listdir(checkpoint_dir)
+        if name.startswith(CHECKPOINT_PREFIX) and name.endswith(".json")
+    )
+    return [os.path.join(checkpoint_dir, name) for name in names]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lock-striped login state of many users.
+
+SessionStore splits users over a fixed number of shards, each with its own
+lock and dict, so threads handling different users rarely wait on each
+other. Only logged-in users are stored: a user missing from its shard is
+logged out, as a new UserAuthentication would be. Transitions use the
+compiled UserAuthentication rows and return the same messages.
+
+An on_change callback, when set, sees every login and logout while the
+shard lock is held, so the changes of one user reach it in order.
+"""
+import threading
+
+from white_box.class_exercises import UserAuthentication
+
+LOGGED_OUT = UserAuthentication.STATE_CODES["Logged Out"]
+LOGGED_IN = UserAuthentication.STATE_CODES["Logged In"]
+
+
+class SessionStore:
+    """
+    Thread-safe login state of many users.
+    """
+
+    def __init__(self, shards=64):
+        """
+        Creates an empty store striped over the given number of shards.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._sessions = [{} for _ in range(shards)]
+        # Called as on_change(user_id, logged_in) under the shard lock.
+        self.on_change = None
+
+    @property
+    def shards(self):
+        """
+        Number of shards.
+        """
+        return len(self._locks)
+
+    def _fire(self, event, user_id):
+        """
+        Applies a UserAuthentication event to one user under its shard lock.
+        """
+        shard = hash(user_id) % len(self._locks)
+        sessions = self._sessions[shard]
+        with self._locks[shard]:
+            previous = sessions.get(user_id, LOGGED_OUT)
+            state, message = event.fsm_row[previous]
+            if state == LOGGED_OUT:
+                sessions.pop(user_id, None)
+            else:
+                sessions[user_id] = state
+            if state != previous and self.on_change is not None:
+                self.on_change(user_id, state == LOGGED_IN)
+        return message
+
+    def login(self, user_id):
+        """
+        Function to login a user.
+        """
+        return self._fire(UserAuthentication.login, user_id)
+
+    def logout(self, user_id):
+        """
+        Function to logout a user.
+        """
+        return self._fire(UserAuthentication.logout, user_id)
+
+    def state(self, user_id):
+        """
+        Login state name of a user.
+        """
+        sessions = self._sessions[hash(user_id) % len(self._locks)]
+        return UserAuthentication.STATES[sessions.get(user_id, LOGGED_OUT)]
+
+    def is_logged_in(self, user_id):
+        """
+        Tells whether a user is logged in.
+        """
+        return self.state(user_id) == "Logged In"
+
+    def __len__(self):
+        """
+        Number of logged-in users.
+        """
+        return sum(map(len, self._sessions))
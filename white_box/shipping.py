@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batched shipping quotes over many orders.
+
+Item weights are summed per order with a segmented sum (np.bincount over the
+order ids), and every order is then priced through the precompiled rate card
+of its shipping method. Orders with an unknown method are flagged in the
+status column instead of aborting the whole batch.
+"""
+import collections
+import collections.abc
+
+import numpy as np
+
+from white_box.class_exercises import SHIPPING_RATE_CARDS
+
+# Status codes.
+OK = 0
+INVALID_METHOD = 1
+
+Quotes = collections.namedtuple("Quotes", "order_ids total_weights costs status")
+Quotes.__doc__ = """
+Per-order results of RateCardEngine.quote_orders, sorted by order id.
+Costs of orders with an invalid method are NaN.
+"""
+
+
+class RateCardEngine:
+    """
+    Quotes shipping costs for many orders at once.
+    """
+
+    def __init__(self, rate_cards=None):
+        """
+        Takes a {method: TierTable} mapping, SHIPPING_RATE_CARDS by default.
+        """
+        rate_cards = SHIPPING_RATE_CARDS if rate_cards is None else rate_cards
+        self.methods = tuple(rate_cards)
+        self._codes = {method: code for code, method in enumerate(self.methods)}
+        self._rate_cards = tuple(rate_cards[method] for method in self.methods)
+
+    def method_codes(self, methods):
+        """
+        Maps method names to codes (indexes into methods), -1 when unknown.
+        """
+        methods = np.asarray(methods, dtype=object)
+        if methods.size == 0:
+            return np.zeros(methods.shape, dtype=np.int64)
+        names, inverse = np.unique(methods.astype(str), return_inverse=True)
+        codes = np.array([self._codes.get(name, -1) for name in names])
+        return codes[inverse].reshape(methods.shape)
+
+    def quote_weights(self, total_weights, methods):
+        """
+        Prices orders from their total weights and methods.
+
+        Returns (costs, status) arrays with one entry per order.
+        """
+        total_weights = np.asarray(total_weights, dtype=np.float64)
+        codes = self.method_codes(methods)
+        if codes.shape != total_weights.shape:
+            raise ValueError("total_weights and methods must have the same shape")
+        costs = np.full(total_weights.shape, np.nan)
+        for code, rate_card in enumerate(self._rate_cards):
+            selected = codes == code
+            costs[selected] = rate_card.lookup_many(total_weights[selected])
+        status = np.where(codes < 0, INVALID_METHOD, OK).astype(np.int8)
+        return costs, status
+
+    def quote_orders(self, order_ids, weights, methods):
+        """
+        Quotes every order of a batch of items.
+
+        order_ids and weights have one entry per item; items of the same
+        order do not need to be contiguous. methods is either a mapping from
+        order id to method or a sequence with one method per distinct order
+        id, in sorted order id order.
+        """
+        order_ids = np.asarray(order_ids)
+        weights = np.asarray(weights, dtype=np.float64)
+        if order_ids.shape != weights.shape:
+            raise ValueError("order_ids and weights must have the same shape")
+        orders, inverse = np.unique(order_ids, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=weights.ravel())
+        totals = totals.reshape(orders.shape)
+        if isinstance(methods, collections.abc.Mapping):
+            methods = [methods.get(order_id) for order_id in orders.tolist()]
+        costs, status = self.quote_weights(totals, methods)
+        return Quotes(orders, totals, costs, status)
+
+
+def quote_packages(weights, lengths, widths, heights):
+    """
+    Calculates the shipping cost of many packages
+    (batch version of calculate_shipping_cost).
+    """
+    weights = np.asarray(weights)
+    lengths = np.asarray(lengths)
+    widths = np.asarray(widths)
+    heights = np.asarray(heights)
+    small = (weights <= 1) & (lengths <= 10) & (widths <= 10) & (heights <= 10)
+    medium = (
+        (weights > 1)
+        & (weights <= 5)
+        & (lengths >= 11)
+        & (lengths <= 30)
+        & (widths >= 11)
+        & (widths <= 30)
+        & (heights >= 11)
+        & (heights <= 30)
+    )
+    return np.select([small, medium], [5, 10], default=20)
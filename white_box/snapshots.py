@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact binary snapshots of many state machine instances.
+
+A snapshot file holds a fixed header (magic, format version, instance count
+and class table length), a JSON class table naming every StateMachine
+class with its STATES, and two one-byte columns: the class of each
+instance (an index into the table) and its state code.
+
+Only StateMachine subclasses whose constructor takes no arguments can be
+saved, and restoring looks class names up among the StateMachine subclasses
+already defined, so a snapshot never imports a module or builds anything
+else. Import the modules defining the classes before loading.
+
+Restoring memory-maps the file and only parses the header and the class
+table; the columns are NumPy views of the mapping, and instances are built
+when they are first accessed, so opening a snapshot takes the same time
+whatever the number of instances.
+"""
+import inspect
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from white_box.fsm import StateMachine
+
+MAGIC = b"WBSM"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQI")
+
+
+def _class_name(cls):
+    """
+    Importable name of a class.
+    """
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _state_machine_classes():
+    """
+    Every StateMachine subclass defined so far, by importable name.
+    """
+    classes = {}
+    pending = [StateMachine]
+    while pending:
+        for cls in pending.pop().__subclasses__():
+            classes.setdefault(_class_name(cls), cls)
+            pending.append(cls)
+    return classes
+
+
+def _check_class(cls):
+    """
+    Raises ValueError unless instances of cls can be rebuilt from a snapshot.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, StateMachine)):
+        raise ValueError(f"{cls!r} is not a StateMachine class")
+    required = [
+        parameter.name
+        for parameter in inspect.signature(cls).parameters.values()
+        if parameter.default is parameter.empty
+        and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+    ]
+    if required:
+        raise ValueError(
+            f"{_class_name(cls)} needs arguments to be built: {', '.join(required)}"
+        )
+
+
+def dump(path, machines):
+    """
+    Writes a snapshot of the given StateMachine instances.
+    """
+    machines = list(machines)
+    indexes = {}
+    for machine in machines:
+        indexes.setdefault(type(machine), len(indexes))
+    if len(indexes) > 256:
+        raise ValueError("A snapshot holds at most 256 classes")
+    classes = np.fromiter(
+        (indexes[type(machine)] for machine in machines), np.uint8, len(machines)
+    )
+    codes = np.fromiter(
+        (machine.state_code for machine in machines), np.uint8, len(machines)
+    )
+    dump_columns(path, list(indexes), classes, codes)
+
+
+def dump_columns(path, classes, class_column, codes):
+    """
+    Writes a snapshot from columns: classes lists the StateMachine classes,
+    class_column indexes it for every instance and codes holds their state
+    codes. This skips building instances, e.g. for TrafficLightFleet.states.
+    """
+    for cls in classes:
+        _check_class(cls)
+    class_column = np.asarray(class_column, dtype=np.uint8)
+    codes = np.asarray(codes, dtype=np.uint8)
+    if class_column.shape != codes.shape or codes.ndim != 1:
+        raise ValueError("class_column and codes must be 1-D and the same size")
+    table = json.dumps(
+        [{"class": _class_name(cls), "states": list(cls.STATES)} for cls in classes],
+        separators=(",", ":"),
+    ).encode("utf-8")
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, codes.size, len(table)))
+        file.write(table)
+        file.write(class_column.tobytes())
+        file.write(codes.tobytes())
+
+
+class Snapshot:
+    """
+    Read-only, lazily rehydrated view of a snapshot file.
+    """
+
+    def __init__(self, path):
+        """
+        Maps the file and checks its header and class table.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+        self._instances = {}
+
+    def _parse(self):
+        """
+        Reads the header, the class table and the column views.
+        """
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError("Not a state machine snapshot")
+        magic, version, _, count, table_length = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError("Not a state machine snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        start = _HEADER.size + table_length
+        if len(self._mmap) != start + 2 * count:
+            raise ValueError("Truncated state machine snapshot")
+        table = json.loads(self._mmap[_HEADER.size : start].decode("utf-8"))
+        known = _state_machine_classes()
+        self.classes = []
+        for entry in table:
+            cls = known.get(entry["class"])
+            if cls is None:
+                raise ValueError(f"Unknown state machine class: {entry['class']}")
+            _check_class(cls)
+            if list(cls.STATES) != entry["states"]:
+                raise ValueError(f"States of {entry['class']} have changed")
+            self.classes.append(cls)
+        self.class_column = np.frombuffer(self._mmap, np.uint8, count, start)
+        self.codes = np.frombuffer(self._mmap, np.uint8, count, start + count)
+
+    def __enter__(self):
+        """
+        Returns the snapshot itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Unmaps the file.
+        """
+        self.close()
+
+    def __len__(self):
+        """
+        Number of instances.
+        """
+        return self.codes.size
+
+    @property
+    def rehydrated(self):
+        """
+        Number of instances built so far.
+        """
+        return len(self._instances)
+
+    def __getitem__(self, index):
+        """
+        The instance at index, built on first access.
+        """
+        index = range(len(self))[index]
+        machine = self._instances.get(index)
+        if machine is None:
+            machine = self.classes[self.class_column[index]]()
+            machine.state_code = int(self.codes[index])
+            self._instances[index] = machine
+        return machine
+
+    def __iter__(self):
+        """
+        Iterates over every instance.
+        """
+        return (self[index] for index in range(len(self)))
+
+    def close(self):
+        """
+        Unmaps the file; built instances stay usable.
+
+        While views of the columns are still referenced elsewhere, the
+        mapping is released only when the last of them goes away.
+        """
+        self.class_column = self.codes = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def load(path):
+    """
+    Opens a snapshot written by dump or dump_columns.
+    """
+    return Snapshot(path)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch classifier unit tests.
+"""
+import array
+import unittest
+
+import numpy as np
+
+from white_box import batch
+from white_box.class_exercises import (
+    calculate_order_total,
+    calculate_total_discount,
+    categorize_product,
+    check_number_status,
+    get_grade,
+    is_even,
+    verify_age,
+)
+
+VALUES = [
+    -10,
+    -0.5,
+    0,
+    1,
+    2,
+    9.99,
+    10,
+    17,
+    18,
+    50,
+    50.5,
+    51,
+    65,
+    65.5,
+    69.9,
+    70,
+    80,
+    90,
+    99.5,
+    100,
+    100.5,
+    101,
+    200,
+    200.5,
+    500,
+    500.01,
+    1000,
+]
+
+
+class TestBatch(unittest.TestCase):
+    """
+    Checks every batch function agrees with its scalar counterpart.
+    """
+
+    def setUp(self):
+        """
+        Builds the input array shared by the tests.
+        """
+        self.values = np.array(VALUES, dtype=np.float64)
+
+    def test_are_even(self):
+        """
+        Checks are_even matches is_even.
+        """
+        expected = [is_even(value) for value in VALUES]
+        self.assertEqual(batch.are_even(self.values).tolist(), expected)
+
+    def test_check_number_statuses(self):
+        """
+        Checks check_number_statuses labels match check_number_status.
+        """
+        expected = [check_number_status(value) for value in VALUES]
+        result = batch.check_number_statuses(self.values, labels=True)
+        self.assertEqual(result.tolist(), expected)
+
+    def test_check_number_statuses_nan_is_zero(self):
+        """
+        Checks NaN is classified as "Zero" like the scalar function.
+        """
+        result = batch.check_number_statuses([float("nan")], labels=True)
+        self.assertEqual(result.tolist(), [check_number_status(float("nan"))])
+
+    def test_get_grades(self):
+        """
+        Checks get_grades labels match get_grade.
+        """
+        expected = [get_grade(value) for value in VALUES]
+        self.assertEqual(batch.get_grades(self.values, labels=True).tolist(), expected)
+
+    def test_get_grades_codes(self):
+        """
+        Checks get_grades returns codes indexing GRADE_LABELS by default.
+        """
+        codes = batch.get_grades([95, 85, 75, 65])
+        self.assertEqual(codes.dtype, np.int8)
+        self.assertEqual([batch.GRADE_LABELS[code] for code in codes], list("ABCF"))
+
+    def test_verify_ages(self):
+        """
+        Checks verify_ages labels match verify_age.
+        """
+        expected = [verify_age(value) for value in VALUES]
+        self.assertEqual(batch.verify_ages(self.values, labels=True).tolist(), expected)
+
+    def test_categorize_products(self):
+        """
+        Checks categorize_products labels match categorize_product, gaps included.
+        """
+        expected = [categorize_product(value) for value in VALUES]
+        result = batch.categorize_products(self.values, labels=True)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(
+            batch.categorize_products([50.5, 100.5], labels=True).tolist(),
+            ["Category D", "Category D"],
+        )
+
+    def test_calculate_total_discounts(self):
+        """
+        Checks calculate_total_discounts matches calculate_total_discount.
+        """
+        expected = [calculate_total_discount(value) for value in VALUES]
+        self.assertEqual(
+            batch.calculate_total_discounts(self.values).tolist(), expected
+        )
+
+    def test_buffer_input(self):
+        """
+        Checks objects exposing the buffer protocol are accepted.
+        """
+        ages = array.array("i", [10, 18, 65, 66])
+        self.assertEqual(batch.verify_ages(ages).tolist(), [0, 1, 1, 0])
+
+
+class TestOrderTotalColumnar(unittest.TestCase):
+    """
+    calculate_order_total_columnar unit tests.
+    """
+
+    def setUp(self):
+        """
+        Builds an order touching every quantity discount.
+        """
+        rng = np.random.default_rng(0)
+        self.quantities = rng.integers(0, 20, 1000)
+        self.prices = rng.uniform(0.5, 500, 1000).round(2)
+        self.items = [
+            {"quantity": int(quantity), "price": float(price)}
+            for quantity, price in zip(self.quantities, self.prices)
+        ]
+        self.expected = calculate_order_total(self.items)
+
+    def test_parallel_arrays(self):
+        """
+        Checks quantity and price arrays match the scalar total.
+        """
+        result = batch.calculate_order_total_columnar(self.quantities, self.prices)
+        self.assertAlmostEqual(result, self.expected, places=6)
+
+    def test_structured_array(self):
+        """
+        Checks a structured array with quantity and price fields.
+        """
+        order = np.zeros(1000, dtype=[("quantity", np.int32), ("price", np.float64)])
+        order["quantity"] = self.quantities
+        order["price"] = self.prices
+        result = batch.calculate_order_total_columnar(order)
+        self.assertAlmostEqual(result, self.expected, places=6)
+
+    def test_dict_list(self):
+        """
+        Checks the list-of-dicts compatibility path.
+        """
+        result = batch.calculate_order_total_columnar(self.items)
+        self.assertAlmostEqual(result, self.expected, places=6)
+
+    def test_discount_boundaries(self):
+        """
+        Checks the 5, 6, 10 and 11 quantity boundaries.
+        """
+        result = batch.calculate_order_total_columnar([5, 6, 10, 11], [1, 1, 1, 1])
+        self.assertAlmostEqual(result, 5 + 0.95 * 6 + 0.95 * 10 + 0.9 * 11)
+
+    def test_empty_order(self):
+        """
+        Checks an empty order totals zero.
+        """
+        self.assertEqual(batch.calculate_order_total_columnar([]), 0)
+
+    def test_shape_mismatch(self):
+        """
+        Checks columns of different lengths raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            batch.calculate_order_total_columnar([1, 2], [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
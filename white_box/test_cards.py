@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch credit card validation unit tests.
+"""
+import unittest
+
+import numpy as np
+
+from white_box.cards import (
+    AMEX,
+    DINERS,
+    DISCOVER,
+    INVALID_CHARACTERS,
+    INVALID_CHECKSUM,
+    INVALID_LENGTH,
+    JCB,
+    MASTERCARD,
+    UNKNOWN,
+    VALID,
+    VISA,
+    luhn_checksum_valid,
+    pack_cards,
+    validate_cards,
+)
+
+TEST_CARDS = {
+    "4111111111111111": VISA,
+    "4222222222222": VISA,
+    "5555555555554444": MASTERCARD,
+    "2223003122003222": MASTERCARD,
+    "378282246310005": AMEX,
+    "6011111111111117": DISCOVER,
+    "30569309025904": DINERS,
+    "3530111333300000": JCB,
+    "9999999999999995": UNKNOWN,
+}
+
+
+class TestLuhn(unittest.TestCase):
+    """
+    Scalar Luhn reference unit tests.
+    """
+
+    def test_valid_numbers(self):
+        """
+        Checks well-known test card numbers pass the checksum.
+        """
+        for number in TEST_CARDS:
+            with self.subTest(number=number):
+                self.assertTrue(luhn_checksum_valid(number))
+
+    def test_invalid_number(self):
+        """
+        Checks a changed digit breaks the checksum.
+        """
+        self.assertFalse(luhn_checksum_valid("4111111111111112"))
+
+
+class TestValidateCards(unittest.TestCase):
+    """
+    validate_cards unit tests.
+    """
+
+    def test_pack_cards(self):
+        """
+        Checks numbers are packed left-aligned with NUL padding.
+        """
+        chars, lengths = pack_cards(["4222222222222", "1" * 20])
+        self.assertEqual(chars.shape, (2, 16))
+        self.assertEqual(chars.dtype, np.uint8)
+        self.assertEqual(bytes(chars[0]), b"4222222222222\0\0\0")
+        self.assertEqual(lengths.tolist(), [13, 20])
+
+    def test_valid_cards_and_issuers(self):
+        """
+        Checks valid numbers of every length get their issuer.
+        """
+        status, issuers = validate_cards(list(TEST_CARDS), with_issuers=True)
+        self.assertEqual(status.tolist(), [VALID] * len(TEST_CARDS))
+        self.assertEqual(issuers.tolist(), list(TEST_CARDS.values()))
+
+    def test_status_codes(self):
+        """
+        Checks each failure gets its own status code.
+        """
+        status, issuers = validate_cards(
+            [
+                "4111111111111112",
+                "411111111111",
+                "41111111111111111",
+                "4111-1111111111",
+                "4111 111111111",
+                "411111111111111١",
+                "41111111\x001111111",
+                "4111111111111\x00",
+                "",
+            ],
+            with_issuers=True,
+        )
+        self.assertEqual(
+            status.tolist(),
+            [
+                INVALID_CHECKSUM,
+                INVALID_LENGTH,
+                INVALID_LENGTH,
+                INVALID_CHARACTERS,
+                INVALID_CHARACTERS,
+                INVALID_CHARACTERS,
+                INVALID_CHARACTERS,
+                INVALID_CHARACTERS,
+                INVALID_LENGTH,
+            ],
+        )
+        self.assertEqual(issuers.tolist(), [UNKNOWN] * 9)
+
+    def test_matches_scalar_loop(self):
+        """
+        Checks random numbers agree with length, digit and Luhn checks.
+        """
+        rng = np.random.default_rng(0)
+        numbers = [
+            "".join(map(str, rng.integers(0, 10, length)))
+            for length in rng.integers(11, 18, 2000)
+        ]
+        expected = [
+            13 <= len(number) <= 16 and luhn_checksum_valid(number)
+            for number in numbers
+        ]
+        self.assertEqual((validate_cards(numbers) == VALID).tolist(), expected)
+
+    def test_bytes_array_input(self):
+        """
+        Checks a NumPy bytes array gives the same result as a list.
+        """
+        numbers = list(TEST_CARDS) + ["4111111111111112", "12"]
+        self.assertEqual(
+            validate_cards(np.array(numbers, dtype="S")).tolist(),
+            validate_cards(numbers).tolist(),
+        )
+
+    def test_empty_input(self):
+        """
+        Checks an empty batch returns an empty status array.
+        """
+        self.assertEqual(validate_cards([]).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hashed credential store unit tests.
+"""
+import unittest
+from unittest.mock import patch
+
+from white_box.class_exercises import BankingSystem
+from white_box.credentials import (
+    CredentialStore,
+    Pbkdf2Hasher,
+    ScryptHasher,
+    verify_password,
+)
+from white_box.timing import ManualClock
+
+# Cheap parameters, the tests only check behavior.
+FAST_SCRYPT = ScryptHasher(n=2**8)
+FAST_PBKDF2 = Pbkdf2Hasher(iterations=1_000)
+
+
+class TestHashers(unittest.TestCase):
+    """
+    Password hasher unit tests.
+    """
+
+    def test_round_trip(self):
+        """
+        Checks hashes verify their own password only, and are salted.
+        """
+        for hasher in (FAST_SCRYPT, FAST_PBKDF2):
+            encoded = hasher.hash("pass123")
+            self.assertTrue(encoded.startswith(hasher.scheme + "$"))
+            self.assertNotIn("pass123", encoded)
+            self.assertTrue(verify_password("pass123", encoded))
+            self.assertFalse(verify_password("pass124", encoded))
+            self.assertNotEqual(hasher.hash("pass123"), encoded)
+
+    def test_unknown_scheme(self):
+        """
+        Checks hashes of unknown schemes are refused.
+        """
+        with self.assertRaises(ValueError):
+            verify_password("pass123", "md5$abc")
+
+
+class TestCredentialStore(unittest.TestCase):
+    """
+    CredentialStore unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates a store with one user.
+        """
+        self.clock = ManualClock()
+        self.store = CredentialStore(FAST_SCRYPT, session_ttl=60, clock=self.clock)
+        self.store.set_password("alice", "s3cret")
+
+    def test_verify(self):
+        """
+        Checks passwords are verified and unknown users refused.
+        """
+        self.assertIn("alice", self.store)
+        self.assertEqual(list(self.store), ["alice"])
+        self.assertTrue(self.store.verify("alice", "s3cret"))
+        self.assertFalse(self.store.verify("alice", "wrong"))
+        self.assertFalse(self.store.verify("bob", "s3cret"))
+
+    def test_session_cache(self):
+        """
+        Checks repeat logins skip the key derivation until they expire.
+        """
+        store = self.store
+        with patch.object(ScryptHasher, "derive", wraps=ScryptHasher.derive) as derive:
+            for _ in range(5):
+                self.assertTrue(store.verify("alice", "s3cret"))
+            self.assertEqual(derive.call_count, 1)
+            self.assertEqual(store.cache_hits, 4)
+
+            self.assertFalse(store.verify("alice", "wrong"))
+            self.clock.sleep(61)
+            self.assertTrue(store.verify("alice", "s3cret"))
+            self.assertEqual(derive.call_count, 3)
+
+            store.forget_session("alice")
+            self.assertTrue(store.verify("alice", "s3cret"))
+            self.assertEqual(derive.call_count, 4)
+
+    def test_password_change_drops_session(self):
+        """
+        Checks a cached login does not outlive a password change.
+        """
+        self.store.verify("alice", "s3cret")
+        self.store.set_password("alice", "n3w")
+        self.assertFalse(self.store.verify("alice", "s3cret"))
+        self.assertTrue(self.store.verify("alice", "n3w"))
+
+    def test_bounded_cache(self):
+        """
+        Checks the least recently used sessions are dropped first.
+        """
+        store = CredentialStore(FAST_PBKDF2, max_sessions=2)
+        for username in ("a", "b", "c"):
+            store.set_password(username, username)
+        store.verify("a", "a")
+        store.verify("b", "b")
+        store.verify("a", "a")
+        store.verify("c", "c")
+        hits = store.cache_hits
+        store.verify("a", "a")
+        store.verify("b", "b")
+        self.assertEqual(store.cache_hits, hits + 1)
+
+    def test_disabled_cache(self):
+        """
+        Checks a session_ttl of 0 always derives the key.
+        """
+        store = CredentialStore(FAST_SCRYPT, session_ttl=0)
+        store.set_password("alice", "s3cret")
+        store.verify("alice", "s3cret")
+        self.assertTrue(store.verify("alice", "s3cret"))
+        self.assertEqual(store.cache_hits, 0)
+
+
+class TestBankingSystemCredentials(unittest.TestCase):
+    """
+    BankingSystem authentication through a CredentialStore.
+    """
+
+    @patch("builtins.print")
+    def test_mock_user(self, _):
+        """
+        Checks the mock user logs in with its password, stored hashed.
+        """
+        bank = BankingSystem()
+        self.assertNotIn("pass123", repr(bank.users.__dict__))
+        self.assertFalse(bank.authenticate("user123", "wrong"))
+        self.assertTrue(bank.authenticate("user123", "pass123"))
+
+    @patch("builtins.print")
+    def test_custom_store(self, _):
+        """
+        Checks a bank takes its users from a given store.
+        """
+        users = CredentialStore(FAST_PBKDF2)
+        users.set_password("carol", "pw")
+        bank = BankingSystem(users=users)
+        self.assertEqual(bank.ledger.balance("carol"), 1000)
+        self.assertTrue(bank.authenticate("carol", "pw"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+Calendar-aware date validation unit tests.
+"""
+import datetime
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import validate_date
+from white_box.dates import (
+    DAYS_IN_MONTH,
+    FIRST_YEAR,
+    LAST_YEAR,
+    is_leap_year,
+    is_valid_date,
+    validate_dates,
+)
+
+
+class TestDaysInMonth(unittest.TestCase):
+    """
+    Lookup table unit tests.
+    """
+
+    def test_leap_years(self):
+        """
+        Checks the century rules of the Gregorian calendar.
+        """
+        self.assertTrue(is_leap_year(2000))
+        self.assertTrue(is_leap_year(2024))
+        self.assertFalse(is_leap_year(1900))
+        self.assertFalse(is_leap_year(2100))
+        self.assertFalse(is_leap_year(2023))
+
+    def test_table_matches_datetime(self):
+        """
+        Checks every month length against the standard library.
+        """
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            for month in range(1, 13):
+                following = datetime.date(year + month // 12, month % 12 + 1, 1)
+                length = (following - datetime.timedelta(days=1)).day
+                self.assertEqual(DAYS_IN_MONTH[year - FIRST_YEAR, month], length)
+
+
+class TestIsValidDate(unittest.TestCase):
+    """
+    Scalar validation unit tests.
+    """
+
+    def test_february(self):
+        """
+        Checks February 29th only exists in leap years.
+        """
+        self.assertTrue(is_valid_date(2024, 2, 29))
+        self.assertTrue(is_valid_date(2000, 2, 29))
+        self.assertFalse(is_valid_date(1900, 2, 29))
+        self.assertFalse(is_valid_date(2023, 2, 29))
+        self.assertFalse(is_valid_date(2024, 2, 30))
+
+    def test_short_months(self):
+        """
+        Checks the 31st is rejected in 30-day months.
+        """
+        self.assertFalse(is_valid_date(2024, 4, 31))
+        self.assertTrue(is_valid_date(2024, 5, 31))
+
+    def test_bounds(self):
+        """
+        Checks the supported year range and month and day bounds.
+        """
+        self.assertTrue(is_valid_date(1900, 1, 1))
+        self.assertTrue(is_valid_date(2100, 12, 31))
+        self.assertFalse(is_valid_date(1899, 12, 31))
+        self.assertFalse(is_valid_date(2101, 1, 1))
+        self.assertFalse(is_valid_date(2000, 0, 1))
+        self.assertFalse(is_valid_date(2000, 1, 0))
+
+    def test_non_integers(self):
+        """
+        Checks non-integer values are invalid, and whole floats are not.
+        """
+        self.assertFalse(is_valid_date(2000.5, 1, 1))
+        self.assertFalse(is_valid_date(2000, 1, 1.5))
+        self.assertFalse(is_valid_date(float("nan"), 1, 1))
+        self.assertFalse(is_valid_date(2000, float("inf"), 1))
+        self.assertTrue(is_valid_date(np.int64(2000), np.int8(1), 1))
+        self.assertTrue(is_valid_date(2020.0, 1.0, np.float64(31)))
+        self.assertFalse(is_valid_date(2020.0, 2.0, 30.0))
+        self.assertEqual(validate_date(2020.0, 1, 1), "Valid Date")
+
+    def test_scalar_matches_columns_on_floats(self):
+        """
+        Checks is_valid_date and validate_dates agree on float values.
+        """
+        values = [(2020.0, 1, 1), (2020.5, 1, 1), (2020, 2.0, 29.0), (2021, 2, 29.0)]
+        expected = [is_valid_date(*value) for value in values]
+        self.assertEqual(expected, [True, False, True, False])
+        columns = [[float(value[index]) for value in values] for index in range(3)]
+        self.assertEqual(validate_dates(*columns).tolist(), expected)
+
+    def test_validate_date_string_api(self):
+        """
+        Checks validate_date keeps its string results.
+        """
+        self.assertEqual(validate_date(2024, 2, 29), "Valid Date")
+        self.assertEqual(validate_date(2023, 2, 31), "Invalid Date")
+
+
+class TestValidateDates(unittest.TestCase):
+    """
+    Columnar validation unit tests.
+    """
+
+    def test_matches_scalar(self):
+        """
+        Checks the mask agrees with is_valid_date on random columns.
+        """
+        rng = np.random.default_rng(0)
+        years = rng.integers(1890, 2110, 5000)
+        months = rng.integers(-1, 14, 5000)
+        days = rng.integers(-1, 33, 5000)
+        expected = [
+            is_valid_date(int(year), int(month), int(day))
+            for year, month, day in zip(years, months, days)
+        ]
+        self.assertEqual(validate_dates(years, months, days).tolist(), expected)
+
+    def test_float_columns(self):
+        """
+        Checks float columns only accept integral values.
+        """
+        mask = validate_dates(
+            [2024.0, 2024.0, 2024.0, np.nan],
+            [2.0, 2.5, 2.0, 2.0],
+            [29.0, 1.0, 1.5, 1.0],
+        )
+        self.assertEqual(mask.tolist(), [True, False, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+"""
+Elevator dispatching unit tests.
+"""
+import unittest
+
+import numpy as np
+
+from white_box.dispatch import Call, Car, Dispatcher, synthetic_calls
+
+
+def moving_car(floor, direction, stops):
+    """
+    A car at floor moving in direction with the given stops queued.
+    """
+    car = Car(floor)
+    car.set_direction(direction)
+    for stop in stops:
+        car.add_stop(stop)
+    return car
+
+
+class TestDispatcher(unittest.TestCase):
+    """
+    Dispatcher unit tests.
+    """
+
+    def test_single_call_timing(self):
+        """
+        Checks the wait and trip time of one call with one car.
+        """
+        dispatcher = Dispatcher(1, 10, floor_time=1.0, stop_time=3.0)
+        report = dispatcher.simulate([Call(0.0, 3, 1)])
+        self.assertEqual(report.served, 1)
+        self.assertEqual(report.waits.tolist(), [3.0])
+        self.assertEqual(report.trips.tolist(), [8.0])
+        self.assertEqual(dispatcher.cars[0].motion.state, "Idle")
+        self.assertEqual(dispatcher.cars[0].floor, 1)
+
+    def test_opposite_call_waits_for_the_sweep(self):
+        """
+        Checks a call going against the car boards on its way back, and
+        waits as long as distance() estimates.
+        """
+        for policy, wait in (("look", 14.0), ("scan", 16.0)):
+            dispatcher = Dispatcher(1, 12, policy, stop_time=0)
+            car = moving_car(1, 1, [10])
+            self.assertEqual(dispatcher.distance(car, 5, False), wait)
+            report = dispatcher.simulate([Call(0.0, 0, 10), Call(1.0, 5, 0)])
+            self.assertEqual(report.waits.tolist(), [0.0, wait])
+            self.assertEqual(report.trips.tolist(), [10.0, wait + 5])
+
+    def test_distance_look_and_scan(self):
+        """
+        Checks LOOK turns at the last stop and SCAN at the last floor.
+        """
+        car = moving_car(5, 1, [8])
+        look = Dispatcher(1, 10, "look")
+        scan = Dispatcher(1, 10, "scan")
+        self.assertEqual(look.distance(car, 7, True), 2)
+        self.assertEqual(look.distance(car, 2, False), 9)
+        self.assertEqual(scan.distance(car, 2, False), 11)
+        self.assertEqual(look.distance(car, 2, True), 9)
+        self.assertEqual(look.distance(moving_car(5, -1, [1]), 7, True), 10)
+
+    def test_assigns_closest_car(self):
+        """
+        Checks a call goes to the car that reaches it first.
+        """
+        dispatcher = Dispatcher(2, 10)
+        dispatcher.cars[1] = Car(6)
+        self.assertEqual(dispatcher.assign(Call(0.0, 7, 0)), 1)
+        self.assertEqual(dispatcher.assign(Call(0.0, 1, 0)), 0)
+
+    def test_heavy_load(self):
+        """
+        Checks every call of a heavy load is served by both policies.
+        """
+        calls = synthetic_calls(2000, 15, rate=0.5)
+        for policy in ("look", "scan"):
+            report = Dispatcher(3, 15, policy).simulate(calls)
+            self.assertEqual(report.served, 2000)
+            self.assertTrue((np.sort(report.trips) > np.sort(report.waits)).all())
+            self.assertLessEqual(
+                report.wait_percentiles[50], report.wait_percentiles[99]
+            )
+
+    def test_synthetic_calls(self):
+        """
+        Checks synthetic calls are ordered and never go to their own floor.
+        """
+        calls = synthetic_calls(500, 8, rate=1.0)
+        self.assertEqual(
+            [call.time for call in calls], sorted(call.time for call in calls)
+        )
+        self.assertTrue(all(call.origin != call.destination for call in calls))
+        self.assertTrue(all(0 <= call.destination < 8 for call in calls))
+
+    def test_invalid_arguments(self):
+        """
+        Checks bad policies and calls raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            Dispatcher(1, 10, "random")
+        with self.assertRaises(ValueError):
+            Dispatcher(1, 10).assign(Call(0.0, 2, 2))
+        with self.assertRaises(ValueError):
+            Dispatcher(1, 10).assign(Call(0.0, 2, 10))
+
+    def test_no_calls(self):
+        """
+        Checks an empty simulation reports NaN percentiles.
+        """
+        report = Dispatcher(1, 10).simulate([])
+        self.assertEqual(report.served, 0)
+        self.assertNotEqual(report.trip_percentiles[50], report.trip_percentiles[50])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+Piece-table document unit tests.
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from white_box.documents import COMPACT_SUFFIX, Document, PieceTable
+
+
+class TestPieceTable(unittest.TestCase):
+    """
+    PieceTable unit tests.
+    """
+
+    def test_random_edits(self):
+        """
+        Checks random insertions and deletions against a bytearray.
+        """
+        rng = random.Random(0)
+        expected = bytearray(b"0123456789" * 5)
+        table = PieceTable(bytes(expected))
+        for _ in range(500):
+            offset = rng.randint(0, len(expected))
+            if rng.random() < 0.6:
+                data = bytes(rng.choices(b"abcdef", k=rng.randint(1, 5)))
+                expected[offset:offset] = data
+                table.insert(offset, data)
+            else:
+                length = rng.randint(0, len(expected) - offset)
+                del expected[offset : offset + length]
+                table.delete(offset, length)
+            self.assertEqual(len(table), len(expected))
+        self.assertEqual(bytes(table), bytes(expected))
+        self.assertEqual(table.read(3, 7), bytes(expected[3:10]))
+
+    def test_out_of_range(self):
+        """
+        Checks edits outside the content raise IndexError.
+        """
+        table = PieceTable(b"abc")
+        with self.assertRaises(IndexError):
+            table.insert(4, b"x")
+        with self.assertRaises(IndexError):
+            table.delete(2, 2)
+
+
+class TestDocument(unittest.TestCase):
+    """
+    Document unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates a scratch directory with a document.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "doc.txt")
+        with open(self.path, "wb") as file:
+            file.write(b"Hello world")
+
+    def tearDown(self):
+        """
+        Removes the scratch directory.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_states_and_messages(self):
+        """
+        Checks edits resume editing and saves keep the usual messages.
+        """
+        with Document(self.path) as document:
+            self.assertEqual(document.state, "Saved")
+            document.insert(5, b",")
+            self.assertEqual(document.state, "Editing")
+            self.assertEqual(document.save_document(), "Document saved successfully")
+            self.assertEqual(
+                document.save_document(), "Invalid operation in current state"
+            )
+
+    def test_events_registry(self):
+        """
+        Checks the overriding save_document replaces the inherited event.
+        """
+        self.assertIs(Document.EVENTS["save_document"], Document.save_document)
+
+    def test_save_and_reopen(self):
+        """
+        Checks saved edits survive reopening and the file is left alone.
+        """
+        with Document(self.path) as document:
+            document.insert(5, b",")
+            document.delete(0, 1)
+            document.insert(0, b"J")
+            document.save_document()
+            document.insert(len(document), b"!")
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), b"Hello world")
+        with Document(self.path) as document:
+            self.assertEqual(document.read(), b"Jello, world")
+
+    def test_dirty_ranges(self):
+        """
+        Checks changed ranges are tracked and cleared by a save.
+        """
+        with Document(self.path) as document:
+            document.insert(0, b">> ")
+            document.insert(9, b"XX")
+            document.delete(3, 2)
+            self.assertEqual(document.dirty_ranges, [(0, 3), (7, 9)])
+            document.save_document()
+            self.assertEqual(document.dirty_ranges, [])
+
+    def test_save_cost_follows_edits(self):
+        """
+        Checks a save journals the edits only, whatever the document size.
+        """
+        with open(self.path, "wb") as file:
+            file.write(b"x" * 5_000_000)
+        with Document(self.path, compact_bytes=1 << 30) as document:
+            document.insert(2_500_000, b"edit")
+            document.save_document()
+        self.assertLess(os.path.getsize(document.journal_path), 64)
+
+    def test_compaction(self):
+        """
+        Checks a large journal is folded back into the document.
+        """
+        with Document(self.path, compact_bytes=100) as document:
+            for _ in range(20):
+                document.insert(len(document), b"0123456789")
+                document.save_document()
+            expected = document.read()
+        self.assertLess(os.path.getsize(document.journal_path), 200)
+        with Document(self.path) as document:
+            self.assertEqual(document.read(), expected)
+
+    def test_uncommitted_tail_ignored(self):
+        """
+        Checks a save cut short by a crash is dropped as a whole.
+        """
+        with Document(self.path) as document:
+            document.insert(0, b"A")
+            document.save_document()
+            document.insert(0, b"B")
+            document.save_document()
+        with open(document.journal_path, "r+b") as journal:
+            journal.truncate(os.path.getsize(document.journal_path) - 5)
+        with Document(self.path) as document:
+            self.assertEqual(document.read(), b"AHello world")
+
+    def test_interrupted_compaction(self):
+        """
+        Checks a compaction interrupted before the rename is finished.
+        """
+        with Document(self.path) as document:
+            document.insert(0, b"A")
+            document.save_document()
+        with open(self.path + COMPACT_SUFFIX, "wb") as file:
+            file.write(b"AHello world")
+        with open(document.journal_path, "ab") as journal:
+            journal.write(b"K" + bytes(12))
+        with Document(self.path) as document:
+            self.assertEqual(document.read(), b"AHello world")
+        self.assertEqual(os.path.getsize(document.journal_path), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+Email validation engine unit tests.
+"""
+import unittest
+from unittest.mock import patch
+
+from white_box.class_exercises import validate_email
+from white_box.emails import (
+    DOMAIN_DFA,
+    LOCAL_PART_DFA,
+    EmailValidator,
+    is_valid_email,
+    validate_emails,
+)
+
+
+class TestDfas(unittest.TestCase):
+    """
+    Local part and domain automata unit tests.
+    """
+
+    def test_local_part_accepts(self):
+        """
+        Checks dot-separated atoms with symbols are accepted.
+        """
+        for local_part in ("user", "first.last", "a+tag", "o'neil", "x_y-z"):
+            with self.subTest(local_part=local_part):
+                self.assertTrue(LOCAL_PART_DFA.accepts(local_part))
+
+    def test_local_part_rejects(self):
+        """
+        Checks empty parts, stray dots and forbidden characters are rejected.
+        """
+        for local_part in ("", ".user", "user.", "a..b", "a b", "a@b", "añ"):
+            with self.subTest(local_part=local_part):
+                self.assertFalse(LOCAL_PART_DFA.accepts(local_part))
+
+    def test_domain_accepts(self):
+        """
+        Checks multi-label domains with an alphabetic top-level label.
+        """
+        for domain in ("example.com", "mail.iteso.mx", "a-b.c1.org", "1x.io"):
+            with self.subTest(domain=domain):
+                self.assertTrue(DOMAIN_DFA.accepts(domain))
+
+    def test_domain_rejects(self):
+        """
+        Checks malformed domains are rejected.
+        """
+        for domain in (
+            "",
+            "examplecom",
+            "example.c",
+            "example.c0m",
+            "-example.com",
+            "example-.com",
+            "example..com",
+            "example.com.",
+            ".example.com",
+        ):
+            with self.subTest(domain=domain):
+                self.assertFalse(DOMAIN_DFA.accepts(domain))
+
+
+class TestEmailValidator(unittest.TestCase):
+    """
+    EmailValidator unit tests.
+    """
+
+    def test_valid_and_invalid(self):
+        """
+        Checks addresses that the old substring check accepted are rejected.
+        """
+        self.assertTrue(is_valid_email("user@example.com"))
+        for email in ("@.....", "a.@b.com", "user@@x.com", "us er@x.com", ".@a.bc"):
+            with self.subTest(email=email):
+                self.assertFalse(is_valid_email(email))
+
+    def test_length_bounds(self):
+        """
+        Checks the 5 to 50 character bounds of validate_email are kept.
+        """
+        self.assertFalse(is_valid_email("a@b"))
+        self.assertTrue(is_valid_email("u" * 41 + "@test.com"))
+        self.assertFalse(is_valid_email("u" * 42 + "@test.com"))
+
+    @patch("white_box.emails.DOMAIN_DFA")
+    def test_domain_index(self, mock_dfa):
+        """
+        Checks every distinct domain is classified only once.
+        """
+        mock_dfa.accepts.side_effect = lambda domain: domain == "x.com"
+        validator = EmailValidator()
+
+        emails = ["a@x.com", "b@x.com", "c@bad", "d@bad", "e@x.com"]
+        result = list(validator.validate_emails(emails))
+
+        self.assertEqual(result.count("Valid Email"), 3)
+        self.assertEqual(validator.domains, {"x.com": True, "bad": False})
+        self.assertEqual(mock_dfa.accepts.call_count, 2)
+
+    def test_domain_index_is_bounded(self):
+        """
+        Checks the index stops growing at max_domains.
+        """
+        validator = EmailValidator(max_domains=1)
+        validator.is_valid("a@one.com")
+        validator.is_valid("a@two.com")
+        self.assertEqual(list(validator.domains), ["one.com"])
+
+    def test_validate_emails(self):
+        """
+        Checks the batch entry point streams the validate_email strings.
+        """
+        emails = ["user@example.com", "userexample.com", "user@examplecom"]
+        result = validate_emails(iter(emails))
+        self.assertEqual(next(result), "Valid Email")
+        self.assertEqual(list(result), ["Invalid Email", "Invalid Email"])
+
+    def test_matches_validate_email(self):
+        """
+        Checks validate_email is backed by the same engine.
+        """
+        emails = ["user@example.com", "x@y.z", "first.last@mail.iteso.mx"]
+        self.assertEqual(
+            [validate_email(email) for email in emails],
+            list(validate_emails(emails)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
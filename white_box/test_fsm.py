@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Table-driven state machine core unit tests.
+"""
+import unittest
+
+from white_box.class_exercises import ElevatorSystem, TrafficLight, VendingMachine
+from white_box.fsm import StateMachine, transition
+
+
+class Door(StateMachine):
+    """
+    Minimal machine used by the tests.
+    """
+
+    __slots__ = ()
+
+    STATES = ("Closed", "Open", "Locked")
+    INITIAL_STATE = "Locked"
+    INVALID_MESSAGE = "No"
+
+    open = transition("Opens the door.", {"Closed": ("Open", "Opened")})
+    close = transition("Closes the door.", {"Open": ("Closed", "Closed")})
+    unlock = transition("Unlocks the door.", {"Locked": ("Closed", "Unlocked")})
+
+
+class TestStateMachine(unittest.TestCase):
+    """
+    StateMachine unit tests.
+    """
+
+    def test_initial_state(self):
+        """
+        Checks INITIAL_STATE overrides the first state.
+        """
+        self.assertEqual(Door().state, "Locked")
+        self.assertEqual(Door().state_code, 2)
+        self.assertEqual(VendingMachine().state, "Ready")
+
+    def test_transitions(self):
+        """
+        Checks valid events move the machine and return their message.
+        """
+        door = Door()
+        self.assertEqual(door.unlock(), "Unlocked")
+        self.assertEqual(door.open(), "Opened")
+        self.assertEqual(door.state, "Open")
+
+    def test_invalid_event_keeps_state(self):
+        """
+        Checks invalid events return INVALID_MESSAGE and keep the state.
+        """
+        door = Door()
+        self.assertEqual(door.open(), "No")
+        self.assertEqual(door.state, "Locked")
+
+    def test_shared_event_row(self):
+        """
+        Checks one event can leave from several states.
+        """
+        elevator = ElevatorSystem()
+        elevator.move_down()
+        self.assertEqual(elevator.stop(), "Elevator stopped")
+        self.assertEqual(elevator.state, "Idle")
+
+    def test_state_setters(self):
+        """
+        Checks state and state_code can be set and are validated.
+        """
+        light = TrafficLight()
+        light.state = "Yellow"
+        self.assertEqual(light.state_code, 2)
+        light.state_code = 1
+        self.assertEqual(light.get_current_state(), "Green")
+        with self.assertRaises(ValueError):
+            light.state = "Blue"
+        with self.assertRaises(ValueError):
+            light.state_code = 3
+
+    def test_slots(self):
+        """
+        Checks instances have no __dict__.
+        """
+        self.assertFalse(hasattr(VendingMachine(), "__dict__"))
+        with self.assertRaises(AttributeError):
+            setattr(Door(), "color", "red")
+
+    def test_events_registry(self):
+        """
+        Checks the declared events are listed and keep their docstring.
+        """
+        self.assertEqual(sorted(Door.EVENTS), ["close", "open", "unlock"])
+        self.assertEqual(Door.open.__doc__, "Opens the door.")
+
+    def test_event_names(self):
+        """
+        Checks events are named after their attribute, for tracebacks and
+        profiles.
+        """
+        self.assertEqual(Door.open.__name__, "open")
+        self.assertEqual(Door.open.__qualname__, "Door.open")
+        self.assertEqual(ElevatorSystem.stop.__qualname__, "ElevatorSystem.stop")
+        self.assertEqual(ElevatorSystem.stop.__module__, ElevatorSystem.__module__)
+
+    def test_events_follow_their_row(self):
+        """
+        Checks every event, generated or indexing its row, fires the
+        transitions of fsm_row, messages without a literal form included.
+        """
+        token = object()
+
+        class Valve(StateMachine):
+            """
+            Machine whose messages have no literal form.
+            """
+
+            __slots__ = ()
+
+            STATES = ("Shut", "Half", "Full")
+            INVALID_MESSAGE = token
+
+            turn = transition(
+                "Turns the valve.",
+                {"Shut": ("Half", 1.5j), "Half": ("Full", token)},
+            )
+            shut = transition(
+                "Shuts the valve.",
+                {"Half": ("Shut", token), "Full": ("Shut", token)},
+            )
+
+        for cls in (Door, ElevatorSystem, TrafficLight, VendingMachine, Valve):
+            for name, event in cls.EVENTS.items():
+                for code, (next_code, message) in enumerate(event.fsm_row):
+                    machine = cls()
+                    machine.state_code = code
+                    self.assertEqual(getattr(machine, name)(), message)
+                    self.assertEqual(machine.state_code, next_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+State machine instrumentation unit tests.
+"""
+import unittest
+
+from white_box import instrumentation
+from white_box.class_exercises import ElevatorSystem, TrafficLight, VendingMachine
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    instrument/snapshot/prometheus_text unit tests.
+    """
+
+    def tearDown(self):
+        """
+        Leaves every class uninstrumented.
+        """
+        instrumentation.uninstrument(VendingMachine, ElevatorSystem, TrafficLight)
+
+    def test_counts_transitions_and_invalid(self):
+        """
+        Checks transitions and invalid operations are counted per state.
+        """
+        instrumentation.instrument(VendingMachine)
+        machine = VendingMachine()
+        machine.insert_coin()
+        machine.insert_coin()
+        machine.select_drink()
+        machine.select_drink()
+        events = instrumentation.snapshot()["VendingMachine"]
+        self.assertEqual(
+            events["insert_coin"]["transitions"], {"Ready -> Dispensing": 1}
+        )
+        self.assertEqual(events["insert_coin"]["invalid"], {"Dispensing": 1})
+        self.assertEqual(events["select_drink"]["invalid"], {"Ready": 1})
+        self.assertEqual(events["select_drink"]["latency"]["count"], 0)
+
+    def test_behaviour_unchanged(self):
+        """
+        Checks instrumented events keep their messages and docstrings.
+        """
+        instrumentation.instrument(ElevatorSystem, latency=True)
+        elevator = ElevatorSystem()
+        self.assertEqual(elevator.move_up(), "Elevator moving up")
+        self.assertEqual(elevator.move_up(), "Invalid operation in current state")
+        self.assertEqual(ElevatorSystem.stop.__doc__, "Function to stop the elevator.")
+        self.assertIs(ElevatorSystem.EVENTS["stop"], ElevatorSystem.stop)
+
+    def test_uninstrument_restores_methods(self):
+        """
+        Checks the disabled path is the original method.
+        """
+        original = TrafficLight.change_state
+        instrumentation.instrument(TrafficLight)
+        self.assertTrue(instrumentation.is_instrumented(TrafficLight))
+        self.assertIsNot(TrafficLight.change_state, original)
+        instrumentation.uninstrument(TrafficLight)
+        self.assertIs(TrafficLight.change_state, original)
+        self.assertIs(TrafficLight.EVENTS["change_state"], original)
+        self.assertNotIn("TrafficLight", instrumentation.snapshot())
+
+    def test_latency_histogram(self):
+        """
+        Checks latencies are recorded when enabled.
+        """
+        instrumentation.instrument(TrafficLight, latency=True)
+        light = TrafficLight()
+        for _ in range(6):
+            light.change_state()
+        latency = instrumentation.snapshot()["TrafficLight"]["change_state"]["latency"]
+        self.assertEqual(latency["count"], 6)
+        self.assertEqual(sum(latency["buckets_ns"].values()), 6)
+        instrumentation.reset()
+        latency = instrumentation.snapshot()["TrafficLight"]["change_state"]["latency"]
+        self.assertEqual(latency["count"], 0)
+
+    def test_prometheus_text(self):
+        """
+        Checks the Prometheus exposition lines.
+        """
+        instrumentation.instrument(VendingMachine, latency=True)
+        machine = VendingMachine()
+        machine.insert_coin()
+        machine.insert_coin()
+        lines = instrumentation.prometheus_text().splitlines()
+        self.assertIn(
+            'white_box_fsm_transitions_total{machine="VendingMachine",'
+            'event="insert_coin",from="Ready",to="Dispensing"} 1',
+            lines,
+        )
+        self.assertIn(
+            'white_box_fsm_invalid_total{machine="VendingMachine",'
+            'event="insert_coin",state="Dispensing"} 1',
+            lines,
+        )
+        self.assertIn(
+            'white_box_fsm_event_seconds_count{machine="VendingMachine",'
+            'event="insert_coin"} 2',
+            lines,
+        )
+        self.assertIn("# TYPE white_box_fsm_event_seconds histogram", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
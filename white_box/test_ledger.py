@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+
+"""
+Account ledger unit tests.
+"""
+import math
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from white_box.class_exercises import BankingSystem
+from white_box.ledger import (
+    FEE_ACCOUNT,
+    INSUFFICIENT_FUNDS,
+    INVALID_AMOUNT,
+    INVALID_TRANSACTION_TYPE,
+    NOT_AUTHENTICATED,
+    TRANSFER_OK,
+    UNKNOWN_ACCOUNT,
+    Ledger,
+)
+
+
+class TestLedger(unittest.TestCase):
+    """
+    Ledger unit tests.
+    """
+
+    def test_open_and_grow(self):
+        """
+        Checks accounts keep their balance while the ledger grows.
+        """
+        ledger = Ledger(capacity=2)
+        for number in range(100):
+            ledger.open_account(f"ACC{number:03d}", number)
+        self.assertEqual(len(ledger), 101)
+        self.assertEqual(ledger.balance("ACC042"), 42)
+        self.assertEqual(ledger.balances()[ledger.row("ACC099")], 9900)
+        with self.assertRaises(ValueError):
+            ledger.open_account("ACC001")
+        with self.assertRaises(KeyError):
+            ledger.balance("missing")
+
+    def test_transfer_posts_fee(self):
+        """
+        Checks a transfer debits, credits and posts the fee.
+        """
+        ledger = Ledger()
+        ledger.open_account("a", 100)
+        ledger.open_account("b")
+        self.assertTrue(ledger.transfer("a", "b", 50, 1.5))
+        self.assertEqual(ledger.balance("a"), 48.5)
+        self.assertEqual(ledger.balance("b"), 50)
+        self.assertEqual(ledger.balance(FEE_ACCOUNT), 1.5)
+
+    def test_transfer_all_or_nothing(self):
+        """
+        Checks an uncovered transfer moves nothing.
+        """
+        ledger = Ledger()
+        ledger.open_account("a", 100)
+        ledger.open_account("b")
+        self.assertFalse(ledger.transfer("a", "b", 99, 2))
+        self.assertEqual((ledger.balance("a"), ledger.balance("b")), (100, 0))
+        with self.assertRaises(ValueError):
+            ledger.transfer("a", "b", -1)
+
+    def test_cents_do_not_drift(self):
+        """
+        Checks many small fees add up exactly.
+        """
+        ledger = Ledger()
+        ledger.open_account("a", 1000)
+        ledger.open_account("b")
+        for _ in range(1000):
+            ledger.transfer("a", "b", 0.1, 0.01)
+        self.assertEqual(ledger.balance("b"), 100)
+        self.assertEqual(ledger.balance(FEE_ACCOUNT), 10)
+        self.assertEqual(ledger.balance("a"), 890)
+
+
+class TestBankingSystemLedger(unittest.TestCase):
+    """
+    BankingSystem transfers through the ledger.
+    """
+
+    def setUp(self):
+        """
+        Logs the mock user in.
+        """
+        with patch("builtins.print"):
+            self.bank = BankingSystem()
+            self.bank.authenticate("user123", "pass123")
+
+    @patch("builtins.print")
+    def test_transfer_moves_money(self, _):
+        """
+        Checks both accounts and the fee account are updated.
+        """
+        self.assertTrue(self.bank.transfer_money("user123", "user456", 100, "express"))
+        self.assertEqual(self.bank.ledger.balance("user123"), 895)
+        self.assertEqual(self.bank.ledger.balance("user456"), 100)
+        self.assertEqual(self.bank.ledger.balance(FEE_ACCOUNT), 5)
+        self.assertEqual(
+            self.bank.view_account("user456"),
+            "The account user456 has a balance of 100",
+        )
+
+    @patch("builtins.print")
+    def test_funds_run_out(self, mock_print):
+        """
+        Checks the balance left by earlier transfers is enforced.
+        """
+        self.assertTrue(self.bank.transfer_money("user123", "user456", 900, "regular"))
+        self.assertFalse(self.bank.transfer_money("user123", "user456", 90, "regular"))
+        mock_print.assert_called_with("Insufficient funds.")
+        self.assertEqual(
+            self.bank.view_account("user123"),
+            "The account user123 has a balance of 82",
+        )
+
+    @patch("builtins.print")
+    def test_invalid_amounts(self, mock_print):
+        """
+        Checks negative, infinite and huge amounts are refused.
+        """
+        for amount in (-10, math.inf, math.nan, 1e17):
+            self.assertFalse(
+                self.bank.transfer_money("user123", "user456", amount, "regular")
+            )
+            mock_print.assert_called_with("Invalid amount.")
+        self.assertEqual(self.bank.ledger.balance("user123"), 1000)
+
+    @patch("builtins.print")
+    def test_rejected_transfer_opens_nothing(self, mock_print):
+        """
+        Checks a receiver gets an account only once a transfer is accepted.
+        """
+        self.assertFalse(self.bank.transfer_money("user123", "ACC9", 2000, "regular"))
+        mock_print.assert_called_with("Insufficient funds.")
+        self.assertNotIn("ACC9", self.bank.ledger)
+        self.assertTrue(self.bank.transfer_money("user123", "ACC9", 20, "regular"))
+        self.assertEqual(self.bank.ledger.balance("ACC9"), 20)
+
+
+class TestTransferBatch(unittest.TestCase):
+    """
+    Ledger.transfer_batch and BankingSystem.transfer_batch unit tests.
+    """
+
+    def setUp(self):
+        """
+        A bank with its mock user logged in.
+        """
+        with patch("builtins.print"):
+            self.bank = BankingSystem()
+            self.bank.authenticate("user123", "pass123")
+        self.ledger = self.bank.ledger
+
+    def test_matches_single_transfers(self):
+        """
+        Checks a batch ends like transfer_money called row by row when no
+        transfer fails.
+        """
+        rng = np.random.default_rng(0)
+        amounts = rng.integers(1, 20, 50).astype(float)
+        types = rng.choice(["regular", "express", "scheduled"], 50)
+        receivers = [f"payee{number % 7}" for number in range(50)]
+        status = self.bank.transfer_batch(["user123"] * 50, receivers, amounts, types)
+        self.assertTrue((status == TRANSFER_OK).all())
+
+        with patch("builtins.print"):
+            single = BankingSystem()
+            single.authenticate("user123", "pass123")
+            for receiver, amount, kind in zip(receivers, amounts.tolist(), types):
+                single.transfer_money("user123", receiver, amount, kind)
+        for account in single.ledger:
+            self.assertEqual(
+                self.ledger.balance(account), single.ledger.balance(account)
+            )
+
+    def test_status_codes(self):
+        """
+        Checks every kind of rejected row.
+        """
+        self.ledger.open_account("stranger", 500)
+        status = self.bank.transfer_batch(
+            ["user123", "user123", "user123", "stranger", "ghost", "user123"],
+            ["a", "b", "c", "d", "e", "f"],
+            [10, 10, -5, 10, 10, 5000],
+            ["regular", "wire", "regular", "regular", "regular", "regular"],
+        )
+        self.assertEqual(
+            status.tolist(),
+            [
+                TRANSFER_OK,
+                INVALID_TRANSACTION_TYPE,
+                INVALID_AMOUNT,
+                NOT_AUTHENTICATED,
+                NOT_AUTHENTICATED,
+                INSUFFICIENT_FUNDS,
+            ],
+        )
+        self.assertEqual(self.ledger.balance("user123"), 989.8)
+        self.assertNotIn("b", self.ledger)
+
+    def test_unknown_sender_without_authorization(self):
+        """
+        Checks the ledger reports unknown senders.
+        """
+        status = self.ledger.transfer_batch(
+            ["ghost"], ["a"], [1], ["regular"], {"regular": 0.02}
+        )
+        self.assertEqual(status.tolist(), [UNKNOWN_ACCOUNT])
+
+    def test_netting_uses_incoming_money(self):
+        """
+        Checks a sender may spend what it receives in the same batch, and
+        that its later transfers fail once it runs out.
+        """
+        ledger = Ledger()
+        ledger.open_account("a", 100)
+        ledger.open_account("b", 0)
+        status = ledger.transfer_batch(
+            ["b", "a", "b", "b"],
+            ["a", "b", "a", "a"],
+            [80, 100, 20, 1],
+            ["free"] * 4,
+            {"free": 0},
+        )
+        self.assertEqual(
+            status.tolist(),
+            [TRANSFER_OK, TRANSFER_OK, TRANSFER_OK, INSUFFICIENT_FUNDS],
+        )
+        self.assertEqual((ledger.balance("a"), ledger.balance("b")), (100, 0))
+
+    def test_rejections_cascade(self):
+        """
+        Checks money that is not received cannot be spent.
+        """
+        ledger = Ledger()
+        ledger.open_account("a", 10)
+        ledger.open_account("b", 0)
+        ledger.open_account("c", 0)
+        status = ledger.transfer_batch(
+            ["a", "b", "c"], ["b", "c", "a"], [50, 50, 5], ["free"] * 3, {"free": 0}
+        )
+        self.assertEqual(status.tolist(), [INSUFFICIENT_FUNDS] * 3)
+        self.assertEqual(ledger.balance("a"), 10)
+
+    def test_rejected_rows_open_nothing(self):
+        """
+        Checks receivers outside the bank only get an account when paid.
+        """
+        status = self.bank.transfer_batch(
+            ["user123", "user123", "user123"],
+            ["PAID", "PAID", "GHOST"],
+            [5, 1, 5000],
+            ["regular"] * 3,
+        )
+        self.assertEqual(
+            status.tolist(), [TRANSFER_OK, TRANSFER_OK, INSUFFICIENT_FUNDS]
+        )
+        self.assertNotIn("GHOST", self.ledger)
+        self.assertEqual(self.ledger.balance("PAID"), 6)
+        self.assertEqual(list(self.ledger)[-1], "PAID")
+
+    def test_funding_chains(self):
+        """
+        Checks long chains of accounts funding each other are accepted or
+        rejected as a whole.
+        """
+        count = 8000
+        for opening, expected in ((1, TRANSFER_OK), (0, INSUFFICIENT_FUNDS)):
+            ledger = Ledger()
+            for number in range(count + 1):
+                ledger.open_account(number, opening if number == 0 else 0)
+            status = ledger.transfer_batch(
+                list(range(count - 1, -1, -1)),
+                list(range(count, 0, -1)),
+                [1] * count,
+                ["free"] * count,
+                {"free": 0},
+            )
+            self.assertTrue((status == expected).all())
+            self.assertEqual(ledger.balance(count), opening)
+
+    def test_matches_fixed_point(self):
+        """
+        Checks acceptance matches recomputing it until it stops changing.
+        """
+        rng = np.random.default_rng(0)
+        ledger = Ledger()
+        for number in range(20):
+            ledger.open_account(number, int(rng.integers(0, 50)))
+        balances = ledger.balances().copy()
+        senders = rng.integers(0, 20, 500)
+        receivers = rng.integers(0, 20, 500)
+        amounts = rng.integers(1, 20, 500)
+        status = ledger.transfer_batch(
+            senders, receivers, amounts, ["free"] * 500, {"free": 0}
+        )
+
+        accepted = np.ones(500, dtype=bool)
+        while True:
+            received = np.bincount(
+                receivers[accepted] + 1, amounts[accepted] * 100, minlength=21
+            )
+            now_accepted = np.zeros(500, dtype=bool)
+            for sender in range(20):
+                rows = np.flatnonzero(senders == sender)
+                limit = balances[sender + 1] + received[sender + 1]
+                now_accepted[rows] = np.cumsum(amounts[rows] * 100) <= limit
+            if (now_accepted == accepted).all():
+                break
+            accepted = now_accepted
+        self.assertEqual((status == TRANSFER_OK).tolist(), accepted.tolist())
+        self.assertIn(INSUFFICIENT_FUNDS, status)
+        self.assertIn(TRANSFER_OK, status)
+
+    def test_empty_batch(self):
+        """
+        Checks an empty batch changes nothing.
+        """
+        status = self.bank.transfer_batch([], [], [], [])
+        self.assertEqual(status.size, 0)
+        self.assertEqual(self.ledger.balance("user123"), 1000)
+
+    def test_huge_amounts(self):
+        """
+        Checks infinite amounts, and amounts whose cents overflow int64,
+        are rejected instead of wrapping around.
+        """
+        status = self.bank.transfer_batch(
+            ["user123"] * 3,
+            ["a", "b", "c"],
+            [np.inf, 1e17, 10],
+            ["regular"] * 3,
+        )
+        self.assertEqual(status.tolist(), [INVALID_AMOUNT, INVALID_AMOUNT, TRANSFER_OK])
+        self.assertEqual(self.ledger.balance("user123"), 989.8)
+        self.assertEqual(self.ledger.balance("c"), 10)
+        self.assertEqual(self.ledger.balance(FEE_ACCOUNT), 0.2)
+        self.assertNotIn("a", self.ledger)
+
+    def test_long_batch_of_large_amounts(self):
+        """
+        Checks many large transfers of one sender are refused rather than
+        overflowing the running total.
+        """
+        count = 2000
+        status = self.bank.transfer_batch(
+            ["user123"] * count,
+            ["a"] * count,
+            [8e13] * count,
+            ["regular"] * count,
+        )
+        self.assertTrue((status == INSUFFICIENT_FUNDS).all())
+        self.assertEqual(self.ledger.balance("user123"), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming loan-eligibility scoring unit tests.
+"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import check_loan_eligibility
+from white_box.loans import score_applicants, score_file, score_lines
+
+APPLICANTS = [
+    (20000, 800),
+    (29999, 700),
+    (30000, 701),
+    (30000, 700),
+    (60000, 650),
+    (60000, 750),
+    (60001, 750),
+    (60001, 751),
+    (100000, 500),
+]
+
+
+class TestScoreApplicants(unittest.TestCase):
+    """
+    score_applicants unit tests.
+    """
+
+    def test_matches_scalar(self):
+        """
+        Checks every branch against check_loan_eligibility.
+        """
+        incomes, credit_scores = zip(*APPLICANTS)
+        self.assertEqual(
+            score_applicants(incomes, credit_scores, labels=True).tolist(),
+            [check_loan_eligibility(*applicant) for applicant in APPLICANTS],
+        )
+
+    def test_random_applicants(self):
+        """
+        Checks random applicants against check_loan_eligibility.
+        """
+        rng = np.random.default_rng(0)
+        incomes = rng.integers(0, 100000, 2000)
+        credit_scores = rng.integers(300, 850, 2000)
+        expected = [
+            check_loan_eligibility(income, score)
+            for income, score in zip(incomes.tolist(), credit_scores.tolist())
+        ]
+        result = score_applicants(incomes, credit_scores, labels=True)
+        self.assertEqual(result.tolist(), expected)
+
+    def test_score_lines_counts(self):
+        """
+        Checks a JSON Lines chunk is scored and counted.
+        """
+        lines = [json.dumps({"income": 20000, "credit_score": 800}) + "\n", "\n"]
+        text, counts = score_lines(lines)
+        self.assertEqual(json.loads(text)["loan"], "Not Eligible")
+        self.assertEqual(counts, {"Not Eligible": 1})
+
+
+class TestScoreFile(unittest.TestCase):
+    """
+    score_file unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates a scratch directory and the expected decisions.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.applicants = APPLICANTS * 30
+        self.expected = [check_loan_eligibility(*row) for row in self.applicants]
+
+    def tearDown(self):
+        """
+        Removes the scratch directory.
+        """
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        """
+        Returns a path inside the scratch directory.
+        """
+        return os.path.join(self.directory, name)
+
+    def write_csv(self):
+        """
+        Writes the applicants as CSV with an id column.
+        """
+        with open(self.path("in.csv"), "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["id", "income", "credit_score"])
+            for number, (income, score) in enumerate(self.applicants):
+                writer.writerow([number, income, score])
+
+    def test_csv(self):
+        """
+        Checks a CSV file is scored in chunks, keeping its columns.
+        """
+        self.write_csv()
+        counts = score_file(self.path("in.csv"), self.path("out.csv"), chunksize=7)
+
+        with open(self.path("out.csv"), encoding="utf-8", newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row["loan"] for row in rows], self.expected)
+        self.assertEqual([row["id"] for row in rows][:3], ["0", "1", "2"])
+        self.assertEqual(sum(counts.values()), len(self.applicants))
+
+    def test_jsonl_with_processes(self):
+        """
+        Checks the worker pool keeps the input order.
+        """
+        with open(self.path("in.jsonl"), "w", encoding="utf-8") as file:
+            for income, score in self.applicants:
+                file.write(json.dumps({"income": income, "credit_score": score}))
+                file.write("\n")
+
+        counts = score_file(
+            self.path("in.jsonl"), self.path("out.jsonl"), chunksize=16, processes=2
+        )
+
+        with open(self.path("out.jsonl"), encoding="utf-8") as file:
+            decisions = [json.loads(line)["loan"] for line in file]
+        self.assertEqual(decisions, self.expected)
+        self.assertEqual(counts["Premium Loan"], self.expected.count("Premium Loan"))
+
+    def test_unsupported_format(self):
+        """
+        Checks unknown file extensions raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            score_file(self.path("in.xlsx"), self.path("out.xlsx"))
+
+
+if __name__ == "__main__":
+    unittest.main()
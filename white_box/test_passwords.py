@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk password validation unit tests.
+"""
+import unittest
+
+from white_box.class_exercises import validate_password
+from white_box.passwords import (
+    RULE_DIGIT,
+    RULE_LENGTH,
+    RULE_LOWER,
+    RULE_SPECIAL,
+    RULE_UPPER,
+    describe_failures,
+    password_failures,
+    validate_passwords,
+)
+
+PASSWORDS = [
+    "",
+    "Ab1!",
+    "abcdefgh",
+    "ABCDEFGH1!",
+    "abcdefgh1!",
+    "Abcdefgh!",
+    "Abcdefgh1",
+    "Abcdefg1!",
+    "Abcdefg٣!",
+    "Abc defg 1 %",
+    "Pässwörd1&",
+]
+
+
+class TestPasswordFailures(unittest.TestCase):
+    """
+    password_failures unit tests.
+    """
+
+    def test_valid_password(self):
+        """
+        Checks a valid password has no failures.
+        """
+        self.assertEqual(password_failures("Abcdefg1!"), 0)
+
+    def test_every_rule_fails(self):
+        """
+        Checks an empty password fails every rule.
+        """
+        self.assertEqual(
+            password_failures(""),
+            RULE_LENGTH | RULE_UPPER | RULE_LOWER | RULE_DIGIT | RULE_SPECIAL,
+        )
+
+    def test_single_rule_fails(self):
+        """
+        Checks only the missing character class is reported.
+        """
+        self.assertEqual(password_failures("abcdefgh1!"), RULE_UPPER)
+        self.assertEqual(password_failures("ABCDEFGH1!"), RULE_LOWER)
+        self.assertEqual(password_failures("Abcdefgh!"), RULE_DIGIT)
+        self.assertEqual(password_failures("Abcdefgh1"), RULE_SPECIAL)
+        self.assertEqual(password_failures("Ab1!"), RULE_LENGTH)
+
+    def test_matches_validate_password(self):
+        """
+        Checks a zero mask is equivalent to validate_password returning True.
+        """
+        for password in PASSWORDS:
+            with self.subTest(password=password):
+                self.assertEqual(
+                    password_failures(password) == 0, validate_password(password)
+                )
+
+    def test_describe_failures(self):
+        """
+        Checks failure masks are turned into rule names.
+        """
+        self.assertEqual(
+            describe_failures(RULE_LENGTH | RULE_SPECIAL), ["length", "special"]
+        )
+        self.assertEqual(describe_failures(0), [])
+
+
+class TestValidatePasswords(unittest.TestCase):
+    """
+    validate_passwords unit tests.
+    """
+
+    def test_is_lazy(self):
+        """
+        Checks results are streamed without consuming the whole input.
+        """
+        consumed = []
+
+        def source():
+            for password in PASSWORDS:
+                consumed.append(password)
+                yield password
+
+        results = validate_passwords(source())
+        self.assertEqual(next(results), password_failures(PASSWORDS[0]))
+        self.assertEqual(len(consumed), 1)
+
+    def test_sequential(self):
+        """
+        Checks every password gets its mask, in input order.
+        """
+        expected = [password_failures(password) for password in PASSWORDS]
+        self.assertEqual(list(validate_passwords(PASSWORDS)), expected)
+
+    def test_multiprocessing(self):
+        """
+        Checks the process pool mode returns the same masks in the same order.
+        """
+        passwords = PASSWORDS * 50
+        expected = [password_failures(password) for password in passwords]
+        result = validate_passwords(iter(passwords), processes=2, chunksize=16)
+        self.assertEqual(list(result), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""
+Elevator event-log replay unit tests.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import ElevatorSystem
+from white_box.replay import ElevatorReplay, checkpoints
+
+
+def random_events(count, cars=5, seed=0):
+    """
+    Random (car_id, event) pairs, valid or not.
+    """
+    rng = np.random.default_rng(seed)
+    names = ("move_up", "move_down", "stop")
+    return [
+        (f"car{car}", names[event])
+        for car, event in zip(rng.integers(0, cars, count), rng.integers(0, 3, count))
+    ]
+
+
+def direct_states(events):
+    """
+    Final state of every car when the events are applied one by one.
+    """
+    cars = {}
+    invalid = 0
+    for car_id, event in events:
+        elevator = cars.setdefault(car_id, ElevatorSystem())
+        if getattr(elevator, event)() == elevator.INVALID_MESSAGE:
+            invalid += 1
+    return {car_id: car.state for car_id, car in cars.items()}, invalid
+
+
+class TestElevatorReplay(unittest.TestCase):
+    """
+    ElevatorReplay unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates a scratch directory with an event log.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.log = os.path.join(self.directory, "events.log")
+        self.checkpoint_dir = os.path.join(self.directory, "checkpoints")
+        self.events = random_events(1000)
+
+    def tearDown(self):
+        """
+        Removes the scratch directory.
+        """
+        shutil.rmtree(self.directory)
+
+    def write_log(self, events, mode="w"):
+        """
+        Writes events to the log, one "car_id,event" line each.
+        """
+        with open(self.log, mode, encoding="utf-8") as file:
+            file.writelines(f"{car_id},{event}\n" for car_id, event in events)
+
+    def test_matches_direct_calls(self):
+        """
+        Checks the replay ends like calling the events directly.
+        """
+        self.write_log(self.events)
+        replay = ElevatorReplay()
+        self.assertEqual(replay.replay(self.log), 1000)
+        states, invalid = direct_states(self.events)
+        self.assertEqual(
+            {car_id: car.state for car_id, car in replay.cars.items()}, states
+        )
+        self.assertEqual(replay.invalid_count, invalid)
+        self.assertEqual(len(replay.invalid), invalid)
+
+    def test_invalid_operation_record(self):
+        """
+        Checks an invalid event is recorded with its offset and state.
+        """
+        self.write_log([("a", "move_up"), ("a", "move_down")])
+        replay = ElevatorReplay()
+        replay.replay(self.log)
+        self.assertEqual(replay.invalid[0].offset, len("a,move_up\n"))
+        self.assertEqual(replay.invalid[0].state, "Moving Up")
+        self.assertEqual(replay.invalid[0].event, "move_down")
+
+    def test_resume_from_checkpoint(self):
+        """
+        Checks a replay resumed from a checkpoint ends like a full one.
+        """
+        self.write_log(self.events[:600])
+        first = ElevatorReplay(self.checkpoint_dir, checkpoint_every=250, keep=2)
+        first.replay(self.log)
+        self.assertEqual(len(checkpoints(self.checkpoint_dir)), 2)
+
+        self.write_log(self.events[600:], mode="a")
+        resumed = ElevatorReplay.resume(self.checkpoint_dir, checkpoint_every=250)
+        self.assertEqual(resumed.events, 600)
+        self.assertEqual(resumed.replay(self.log), 400)
+
+        states, invalid = direct_states(self.events)
+        self.assertEqual(
+            {car_id: car.state for car_id, car in resumed.cars.items()}, states
+        )
+        self.assertEqual(resumed.invalid_count, invalid)
+
+    def test_resume_without_checkpoint(self):
+        """
+        Checks resuming from an empty directory starts from the beginning.
+        """
+        replay = ElevatorReplay.resume(self.checkpoint_dir)
+        self.assertEqual((replay.offset, replay.events), (0, 0))
+
+    def test_unknown_event(self):
+        """
+        Checks an unknown event name raises ValueError.
+        """
+        self.write_log([("a", "jump")])
+        with self.assertRaises(ValueError):
+            ElevatorReplay().replay(self.log)
+
+    def test_retry_after_unknown_event(self):
+        """
+        Checks the offset stays on a rejected line, so that a replay can go
+        on once the line is fixed.
+        """
+        self.write_log([("a", "move_up"), ("a", "jump"), ("a", "stop")])
+        replay = ElevatorReplay()
+        with self.assertRaises(ValueError):
+            replay.replay(self.log)
+        self.assertEqual((replay.offset, replay.events), (len("a,move_up\n"), 1))
+
+        self.write_log([("a", "move_up"), ("a", "stop"), ("a", "stop")])
+        self.assertEqual(replay.replay(self.log), 2)
+        self.assertEqual(replay.car("a").state, "Idle")
+        self.assertEqual(replay.invalid_count, 1)
+
+    def test_bad_checkpoint_version(self):
+        """
+        Checks unknown checkpoint versions are refused.
+        """
+        with self.assertRaises(ValueError):
+            ElevatorReplay().restore({"version": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
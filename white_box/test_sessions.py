@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Sharded session store unit tests.
+"""
+import concurrent.futures
+import unittest
+
+from white_box.class_exercises import UserAuthentication
+from white_box.sessions import SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+    """
+    SessionStore unit tests.
+    """
+
+    def test_messages_match_user_authentication(self):
+        """
+        Checks every call returns what UserAuthentication returns.
+        """
+        store = SessionStore(shards=4)
+        user = UserAuthentication()
+        for event in ["logout", "login", "login", "logout", "logout", "login"]:
+            self.assertEqual(getattr(store, event)(7), getattr(user, event)())
+            self.assertEqual(store.state(7), user.state)
+
+    def test_only_logged_in_users_are_stored(self):
+        """
+        Checks logged-out users do not take memory.
+        """
+        store = SessionStore()
+        for user_id in range(100):
+            store.login(user_id)
+        for user_id in range(0, 100, 2):
+            store.logout(user_id)
+        self.assertEqual(len(store), 50)
+        self.assertTrue(store.is_logged_in(1))
+        self.assertFalse(store.is_logged_in(2))
+
+    def test_concurrent_logins(self):
+        """
+        Checks each user logs in exactly once from many threads.
+        """
+        store = SessionStore(shards=8)
+        users = [f"user{number}" for number in range(500)] * 8
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            messages = list(pool.map(store.login, users))
+        self.assertEqual(messages.count("Login successful"), 500)
+        self.assertEqual(len(store), 500)
+
+    def test_invalid_shards(self):
+        """
+        Checks a store needs at least one shard.
+        """
+        with self.assertRaises(ValueError):
+            SessionStore(shards=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
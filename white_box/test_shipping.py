@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batched shipping rate engine unit tests.
+"""
+import math
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import (
+    calculate_items_shipping_cost,
+    calculate_shipping_cost,
+)
+from white_box.shipping import INVALID_METHOD, OK, RateCardEngine, quote_packages
+from white_box.tiers import TierTable
+
+
+class TestRateCardEngine(unittest.TestCase):
+    """
+    RateCardEngine unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates an engine with the default rate cards.
+        """
+        self.engine = RateCardEngine()
+
+    def test_method_codes(self):
+        """
+        Checks known methods get their index and unknown ones -1.
+        """
+        self.assertEqual(
+            self.engine.method_codes(["express", "standard", "drone"]).tolist(),
+            [self.engine.methods.index("express"), 0, -1],
+        )
+
+    def test_quote_weights_boundaries(self):
+        """
+        Checks the 5 and 10 weight boundaries of both methods.
+        """
+        weights = [5, 5.01, 10, 10.01] * 2
+        methods = ["standard"] * 4 + ["express"] * 4
+        costs, status = self.engine.quote_weights(weights, methods)
+        self.assertEqual(costs.tolist(), [10, 15, 15, 20, 20, 30, 30, 40])
+        self.assertEqual(status.tolist(), [OK] * 8)
+
+    def test_quote_orders_matches_scalar(self):
+        """
+        Checks grouped quotes match calculate_items_shipping_cost per order.
+        """
+        rng = np.random.default_rng(0)
+        order_ids = rng.integers(0, 300, 2000)
+        weights = rng.uniform(0, 2, 2000).round(2)
+        methods = {
+            order_id: ("standard", "express")[order_id % 2] for order_id in range(300)
+        }
+
+        quotes = self.engine.quote_orders(order_ids, weights, methods)
+
+        for order_id, cost in zip(quotes.order_ids.tolist(), quotes.costs.tolist()):
+            items = [{"weight": weight} for weight in weights[order_ids == order_id]]
+            expected = calculate_items_shipping_cost(items, methods[order_id])
+            self.assertEqual(cost, expected)
+        self.assertTrue((quotes.status == OK).all())
+
+    def test_invalid_method_reported_per_row(self):
+        """
+        Checks an unknown method only flags its own order.
+        """
+        quotes = self.engine.quote_orders(
+            ["b", "a", "b", "c"], [1, 2, 3, 20], ["standard", "teleport", "express"]
+        )
+        self.assertEqual(quotes.order_ids.tolist(), ["a", "b", "c"])
+        self.assertEqual(quotes.total_weights.tolist(), [2, 4, 20])
+        self.assertEqual(quotes.status.tolist(), [OK, INVALID_METHOD, OK])
+        self.assertEqual(quotes.costs[0], 10)
+        self.assertTrue(math.isnan(quotes.costs[1]))
+        self.assertEqual(quotes.costs[2], 40)
+
+    def test_missing_method_in_mapping(self):
+        """
+        Checks orders missing from a method mapping are invalid.
+        """
+        quotes = self.engine.quote_orders([1, 2], [1, 1], {1: "express"})
+        self.assertEqual(quotes.status.tolist(), [OK, INVALID_METHOD])
+
+    def test_custom_rate_cards(self):
+        """
+        Checks the engine prices through any rate card mapping.
+        """
+        engine = RateCardEngine({"flat": TierTable([], default=7)})
+        costs, status = engine.quote_weights([1, 100], ["flat", "flat"])
+        self.assertEqual(costs.tolist(), [7, 7])
+        self.assertEqual(status.tolist(), [OK, OK])
+
+    def test_empty_batch(self):
+        """
+        Checks an empty batch returns empty results.
+        """
+        quotes = self.engine.quote_orders([], [], [])
+        self.assertEqual(quotes.costs.tolist(), [])
+
+
+class TestQuotePackages(unittest.TestCase):
+    """
+    quote_packages unit tests.
+    """
+
+    def test_matches_scalar(self):
+        """
+        Checks package costs against calculate_shipping_cost.
+        """
+        rng = np.random.default_rng(1)
+        weights = rng.choice([0.5, 1, 3, 5, 6], 500)
+        lengths, widths, heights = rng.choice([5, 10, 11, 20, 30, 31], (3, 500))
+        expected = [
+            calculate_shipping_cost(*package)
+            for package in zip(weights, lengths, widths, heights)
+        ]
+        self.assertEqual(
+            quote_packages(weights, lengths, widths, heights).tolist(), expected
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+State machine snapshot unit tests.
+"""
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from white_box import snapshots
+from white_box.class_exercises import ElevatorSystem, TrafficLight, VendingMachine
+from white_box.documents import Document
+from white_box.traffic import TrafficLightFleet
+
+
+class TestSnapshots(unittest.TestCase):
+    """
+    dump/load unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates a scratch directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "machines.snap")
+
+    def tearDown(self):
+        """
+        Removes the scratch directory.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_round_trip_mixed_classes(self):
+        """
+        Checks instances of several classes come back in their state.
+        """
+        light = TrafficLight()
+        light.change_state()
+        elevator = ElevatorSystem()
+        elevator.move_down()
+        machines = [light, elevator, VendingMachine(), TrafficLight()]
+        snapshots.dump(self.path, machines)
+        with snapshots.load(self.path) as snapshot:
+            restored = list(snapshot)
+            self.assertIs(snapshot[-1], restored[-1])
+        self.assertEqual(
+            [(type(machine), machine.state) for machine in restored],
+            [(type(machine), machine.state) for machine in machines],
+        )
+        self.assertEqual(os.path.getsize(self.path) - self.header_size(), 8)
+
+    def header_size(self):
+        """
+        Size of the header and class table of the snapshot file.
+        """
+        with open(self.path, "rb") as file:
+            header = file.read(20)
+        return 20 + struct.unpack("<4sHHQI", header)[-1]
+
+    def test_columns_from_fleet(self):
+        """
+        Checks a fleet array can be dumped without building instances.
+        """
+        fleet = TrafficLightFleet(1000)
+        fleet.change_state(np.arange(1000) % 3 == 0)
+        snapshots.dump_columns(
+            self.path, [TrafficLight], np.zeros(1000, np.uint8), fleet.states
+        )
+        with snapshots.load(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 1000)
+            self.assertTrue((snapshot.codes == fleet.states).all())
+            self.assertEqual(snapshot[3].get_current_state(), "Green")
+            self.assertEqual(snapshot[4].get_current_state(), "Red")
+
+    def test_lazy_rehydration(self):
+        """
+        Checks only the accessed instances are built.
+        """
+        snapshots.dump_columns(
+            self.path, [VendingMachine], np.zeros(10, np.uint8), np.ones(10)
+        )
+        with snapshots.load(self.path) as snapshot:
+            self.assertEqual(snapshot[5].state, "Dispensing")
+            self.assertEqual(snapshot.rehydrated, 1)
+
+    def test_empty(self):
+        """
+        Checks an empty snapshot can be written and read.
+        """
+        snapshots.dump(self.path, [])
+        with snapshots.load(self.path) as snapshot:
+            self.assertEqual(list(snapshot), [])
+
+    def test_rejects_bad_files(self):
+        """
+        Checks bad magic, versions, truncation and changed states.
+        """
+        snapshots.dump(self.path, [TrafficLight()])
+        with open(self.path, "rb") as file:
+            content = file.read()
+        table_end = len(content) - 2
+        cases = [
+            b"NOPE" + content[4:],
+            content[:4] + struct.pack("<H", 99) + content[6:],
+            content[:-1],
+            content[:table_end].replace(b'"Yellow"', b'"Amber!"') + content[table_end:],
+        ]
+        for case in cases:
+            with open(self.path, "wb") as file:
+                file.write(case)
+            with self.assertRaises(ValueError):
+                snapshots.load(self.path)
+
+    def test_rejects_unknown_classes(self):
+        """
+        Checks only known StateMachine classes are restored, without
+        importing anything.
+        """
+        for name in ("subprocess:Popen", "white_box.ledger:Ledger"):
+            table = json.dumps([{"class": name, "states": []}]).encode("utf-8")
+            with open(self.path, "wb") as file:
+                file.write(struct.pack("<4sHHQI", b"WBSM", 1, 0, 1, len(table)))
+                file.write(table + b"\0\0")
+            with self.assertRaises(ValueError):
+                snapshots.load(self.path)
+
+    def test_rejects_classes_needing_arguments(self):
+        """
+        Checks classes that cannot be built without arguments, or are not
+        state machines, are refused when dumping.
+        """
+        document = Document(os.path.join(self.directory, "notes.txt"))
+        try:
+            with self.assertRaises(ValueError):
+                snapshots.dump(self.path, [document])
+        finally:
+            document.close()
+        with self.assertRaises(ValueError):
+            snapshots.dump_columns(self.path, [dict], [0], [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tier table engine unit tests.
+"""
+import math
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import (
+    GRADE_TIERS,
+    PRODUCT_CATEGORY_TIERS,
+    QUANTITY_DISCOUNT_TIERS,
+    TOTAL_DISCOUNT_TIERS,
+    calculate_quantity_discount,
+    calculate_total_discount,
+    categorize_product,
+    get_grade,
+)
+from white_box.tiers import Tier, TierTable
+
+VALUES = [
+    -math.inf,
+    -5,
+    0,
+    1,
+    5,
+    5.5,
+    6,
+    9.99,
+    10,
+    11,
+    50,
+    50.5,
+    51,
+    69.99,
+    70,
+    79.99,
+    80,
+    89.99,
+    90,
+    100,
+    100.5,
+    101,
+    200,
+    200.5,
+    500,
+    500.5,
+    math.inf,
+]
+
+
+class TestTierTable(unittest.TestCase):
+    """
+    TierTable unit tests.
+    """
+
+    def test_closed_and_open_bounds(self):
+        """
+        Checks inclusive and exclusive bounds on both sides.
+        """
+        table = TierTable(
+            [Tier(0, 10, "low", high_closed=False), Tier(10, 20, "high")],
+            default="none",
+        )
+        self.assertEqual(table.lookup(-1), "none")
+        self.assertEqual(table.lookup(0), "low")
+        self.assertEqual(table.lookup(9.9), "low")
+        self.assertEqual(table.lookup(10), "high")
+        self.assertEqual(table.lookup(20), "high")
+        self.assertEqual(table.lookup(20.1), "none")
+
+    def test_open_low_bound_after_point_tier(self):
+        """
+        Checks a value equal to an open low bound falls to the tier before it.
+        """
+        table = TierTable(
+            [Tier(5, 10, "above", low_closed=False), Tier(5, 5, "five")], default="-"
+        )
+        self.assertEqual(table.lookup(5), "five")
+        self.assertEqual(table.index_many([5, 6]).tolist(), [1, 0])
+
+    def test_overlap_rejected(self):
+        """
+        Checks overlapping tiers raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            TierTable([Tier(0, 10, "a"), Tier(10, 20, "b")], default="-")
+        with self.assertRaises(ValueError):
+            TierTable([Tier(0, 30, "a"), Tier(10, 20, "b")], default="-")
+
+    def test_empty_tier_rejected(self):
+        """
+        Checks tiers containing no value raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            TierTable([Tier(10, 0, "a")], default="-")
+        with self.assertRaises(ValueError):
+            TierTable([Tier(5, 5, "a", high_closed=False)], default="-")
+
+    def test_gaps_require_default(self):
+        """
+        Checks gaps raise ValueError unless a default covers them.
+        """
+        tiers = [Tier(-math.inf, 10, "a"), Tier(11, math.inf, "b")]
+        with self.assertRaises(ValueError):
+            TierTable(tiers)
+        self.assertEqual(
+            TierTable(tiers, default="gap").gaps,
+            [Tier(10, 11, "gap", False, False)],
+        )
+
+    def test_full_coverage_has_no_gaps(self):
+        """
+        Checks tiers covering the whole line need no default.
+        """
+        table = TierTable(
+            [Tier(0, math.inf, "+"), Tier(-math.inf, 0, "-", high_closed=False)]
+        )
+        self.assertEqual(table.gaps, [])
+        self.assertEqual(table.lookup(-0.1), "-")
+        self.assertEqual(table.lookup_many([-1, 0, 1]).tolist(), ["-", "+", "+"])
+
+    def test_category_gaps(self):
+        """
+        Checks the product categories report the gaps between them.
+        """
+        self.assertEqual(
+            [(gap.low, gap.high) for gap in PRODUCT_CATEGORY_TIERS.gaps],
+            [(-math.inf, 10), (50, 51), (100, 101), (200, math.inf)],
+        )
+
+    def test_index_many_uses_given_order(self):
+        """
+        Checks indexes refer to the tiers in the order they were given.
+        """
+        self.assertEqual(GRADE_TIERS.labels(), ("A", "B", "C", "F"))
+        self.assertEqual(
+            GRADE_TIERS.index_many([95, 85, 75, 65]).tolist(), [0, 1, 2, 3]
+        )
+
+    def test_nan_gets_default(self):
+        """
+        Checks NaN falls in no tier, like it fails every comparison.
+        """
+        self.assertEqual(GRADE_TIERS.lookup(math.nan), "F")
+        self.assertEqual(GRADE_TIERS.lookup_many([math.nan]).tolist(), ["F"])
+
+
+class TestReimplementedFunctions(unittest.TestCase):
+    """
+    Checks the functions built on tier tables keep their results.
+    """
+
+    def test_batch_matches_scalar(self):
+        """
+        Checks lookup_many agrees with lookup for every table.
+        """
+        for table in (
+            GRADE_TIERS,
+            PRODUCT_CATEGORY_TIERS,
+            QUANTITY_DISCOUNT_TIERS,
+            TOTAL_DISCOUNT_TIERS,
+        ):
+            with self.subTest(table=table.labels()):
+                self.assertEqual(
+                    table.lookup_many(np.array(VALUES)).tolist(),
+                    [table.lookup(value) for value in VALUES],
+                )
+
+    def test_results_unchanged(self):
+        """
+        Checks the reimplemented functions against the original ladders.
+        """
+        for value in VALUES:
+            with self.subTest(value=value):
+                grade = (
+                    "A"
+                    if value >= 90
+                    else "B" if value >= 80 else "C" if value >= 70 else "F"
+                )
+                self.assertEqual(get_grade(value), grade)
+
+                if 10 <= value <= 50:
+                    category = "Category A"
+                elif 51 <= value <= 100:
+                    category = "Category B"
+                elif 101 <= value <= 200:
+                    category = "Category C"
+                else:
+                    category = "Category D"
+                self.assertEqual(categorize_product(value), category)
+
+                if 1 <= value <= 5:
+                    discount = "No Discount"
+                elif 6 <= value <= 10:
+                    discount = "5% Discount"
+                else:
+                    discount = "10% Discount"
+                self.assertEqual(calculate_quantity_discount(value), discount)
+
+                if value < 100:
+                    total = 0
+                elif value <= 500:
+                    total = 0.1 * value
+                else:
+                    total = 0.2 * value
+                self.assertEqual(calculate_total_discount(value), total)
+
+
+if __name__ == "__main__":
+    unittest.main()
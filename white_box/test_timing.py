@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Timing wheel and traffic light phase scheduler unit tests.
+"""
+import random
+import unittest
+
+from white_box.class_exercises import TrafficLight
+from white_box.timing import ManualClock, PhaseScheduler, TimingWheel
+
+PLAN = {"Red": 3, "Green": 2, "Yellow": 1}
+
+
+class TestTimingWheel(unittest.TestCase):
+    """
+    TimingWheel unit tests.
+    """
+
+    def test_fires_on_time_across_levels(self):
+        """
+        Checks random timers fire at their tick on a small three-level wheel.
+        """
+        clock = ManualClock()
+        wheel = TimingWheel(tick=1.0, slots=(4, 4, 4), clock=clock)
+        fired = []
+        rng = random.Random(0)
+        expected = []
+        for _ in range(200):
+            delay = rng.randint(1, 63)
+            expected.append(delay)
+            wheel.schedule(delay, lambda delay=delay: fired.append((delay, wheel.now)))
+        wheel.advance_to(100)
+        self.assertEqual(sorted(delay for delay, _ in fired), sorted(expected))
+        self.assertTrue(all(delay == now for delay, now in fired))
+        self.assertEqual(len(wheel), 0)
+
+    def test_timers_scheduled_later(self):
+        """
+        Checks delays are counted from the time reached by the wheel.
+        """
+        wheel = TimingWheel(tick=1.0, slots=(4, 4), clock=ManualClock())
+        fired = []
+        wheel.advance_to(13)
+        wheel.schedule(7, lambda: fired.append(wheel.now))
+        wheel.advance_to(19)
+        self.assertEqual(fired, [])
+        wheel.advance_to(20)
+        self.assertEqual(fired, [20])
+
+    def test_cancel(self):
+        """
+        Checks cancelled timers never fire.
+        """
+        wheel = TimingWheel(tick=1.0, slots=(4, 4), clock=ManualClock())
+        fired = []
+        wheel.schedule(2, fired.append, "short").cancel()
+        wheel.schedule(9, fired.append, "long").cancel()
+        wheel.schedule(5, fired.append, "kept")
+        wheel.advance_to(15)
+        self.assertEqual(fired, ["kept"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_delay_out_of_range(self):
+        """
+        Checks delays beyond the wheel raise ValueError.
+        """
+        wheel = TimingWheel(tick=1.0, slots=(4, 4), clock=ManualClock())
+        with self.assertRaises(ValueError):
+            wheel.schedule(16, print)
+
+
+class TestPhaseScheduler(unittest.TestCase):
+    """
+    PhaseScheduler unit tests.
+    """
+
+    def test_plan(self):
+        """
+        Checks a light follows its timing plan on a manual clock.
+        """
+        clock = ManualClock()
+        wheel = TimingWheel(tick=1.0, clock=clock)
+        light = TrafficLight()
+        PhaseScheduler(wheel).add(light, PLAN)
+        states = []
+        for second in range(1, 13):
+            wheel.advance_to(second)
+            states.append(light.get_current_state())
+        self.assertEqual(
+            states,
+            ["Red", "Red", "Green", "Green", "Yellow", "Red"] * 2,
+        )
+
+    def test_run_until_faster_than_real_time(self):
+        """
+        Checks run_until with a manual clock drives many lights.
+        """
+        clock = ManualClock()
+        wheel = TimingWheel(tick=0.5, clock=clock)
+        scheduler = PhaseScheduler(wheel)
+        lights = [TrafficLight() for _ in range(100)]
+        for number, light in enumerate(lights):
+            scheduler.add(light, PLAN, elapsed=number % 3)
+        scheduler.remove(lights[0])
+        wheel.run_until(60.0, sleep=clock.sleep)
+        self.assertEqual(clock(), 60.0)
+        # 60 seconds are ten whole cycles.
+        self.assertEqual(lights[0].get_current_state(), "Red")
+        self.assertEqual(lights[1].get_current_state(), "Red")
+        self.assertEqual(lights[2].get_current_state(), "Red")
+        self.assertEqual(len(wheel), 99)
+
+    def test_incomplete_plan(self):
+        """
+        Checks a plan must give every state a duration.
+        """
+        scheduler = PhaseScheduler(TimingWheel(clock=ManualClock()))
+        with self.assertRaises(ValueError):
+            scheduler.add(TrafficLight(), {"Red": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""
+Traffic light fleet unit tests.
+"""
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import TrafficLight
+from white_box.traffic import TrafficLightFleet
+
+
+class TestTrafficLightFleet(unittest.TestCase):
+    """
+    TrafficLightFleet unit tests.
+    """
+
+    def test_initial_state(self):
+        """
+        Checks every light starts like a new TrafficLight.
+        """
+        fleet = TrafficLightFleet(4)
+        self.assertEqual(fleet.get_current_state().tolist(), ["Red"] * 4)
+        self.assertEqual(fleet.counts(), {"Red": 4, "Green": 0, "Yellow": 0})
+
+    def test_matches_single_objects(self):
+        """
+        Checks random masked steps against TrafficLight objects.
+        """
+        rng = np.random.default_rng(0)
+        fleet = TrafficLightFleet(50)
+        lights = [TrafficLight() for _ in range(50)]
+        for _ in range(20):
+            mask = rng.random(50) < 0.5
+            fleet.change_state(mask)
+            for light in np.asarray(lights)[mask]:
+                light.change_state()
+        self.assertEqual(
+            [fleet[i].get_current_state() for i in range(50)],
+            [light.get_current_state() for light in lights],
+        )
+
+    def test_steps_and_indexes(self):
+        """
+        Checks several steps at once on an index mask.
+        """
+        fleet = TrafficLightFleet(3)
+        fleet.change_state(np.array([0, 2]), steps=5)
+        self.assertEqual(
+            fleet.get_current_state().tolist(), ["Yellow", "Red", "Yellow"]
+        )
+        fleet.change_state(steps=3)
+        self.assertEqual(fleet.get_current_state(1), "Red")
+        fleet.change_state(steps=0)
+        self.assertEqual(fleet.get_current_state(1), "Red")
+        with self.assertRaises(ValueError):
+            fleet.change_state(steps=-1)
+
+    def test_view_writes_through(self):
+        """
+        Checks a per-light view changes the fleet array.
+        """
+        fleet = TrafficLightFleet(2)
+        view = fleet[-1]
+        view.change_state()
+        self.assertEqual(view.get_current_state(), "Green")
+        self.assertEqual(fleet.get_current_state(1), "Green")
+        with self.assertRaises(IndexError):
+            fleet[2].get_current_state()
+
+    def test_initial_states(self):
+        """
+        Checks lights can start from state names and invalid ones are refused.
+        """
+        fleet = TrafficLightFleet(2, ["Yellow", "Green"])
+        fleet.change_state()
+        self.assertEqual(fleet.get_current_state().tolist(), ["Red", "Yellow"])
+        with self.assertRaises(ValueError):
+            TrafficLightFleet(1, ["Blue"])
+        with self.assertRaises(ValueError):
+            TrafficLightFleet(3, ["Red"])
+
+
+if __name__ == "__main__":
+    unittest.main()
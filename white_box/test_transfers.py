@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Concurrent transfer engine unit tests.
+"""
+import concurrent.futures
+import math
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import BankingSystem
+from white_box.ledger import (
+    INSUFFICIENT_FUNDS,
+    INVALID_AMOUNT,
+    INVALID_TRANSACTION_TYPE,
+    NOT_AUTHENTICATED,
+    TRANSFER_OK,
+    UNKNOWN_ACCOUNT,
+    Ledger,
+)
+from white_box.transfers import TransferEngine
+
+ACCOUNTS = [f"ACC{number:02d}" for number in range(8)]
+
+
+class TestTransferEngine(unittest.TestCase):
+    """
+    TransferEngine unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates an engine whose mock user is logged in.
+        """
+        self.engine = TransferEngine()
+        self.assertTrue(self.engine.authenticate("user123", "pass123"))
+
+    def test_transfer_posts_fee(self):
+        """
+        Checks the amount reaches the receiver and the fee the fee account.
+        """
+        engine = self.engine
+        status = engine.transfer_money("user123", "ACC1", 100, "express")
+        self.assertEqual(status, TRANSFER_OK)
+        self.assertEqual(engine.balance("user123"), 895)
+        self.assertEqual(engine.balance("ACC1"), 100)
+        self.assertEqual(engine.balance(engine.ledger.fee_account), 5)
+
+    def test_status_codes(self):
+        """
+        Checks rejected transfers move nothing.
+        """
+        engine = self.engine
+        cases = [
+            (("nobody", "ACC1", 10, "regular"), NOT_AUTHENTICATED),
+            (("user123", "ACC1", 10, "wire"), INVALID_TRANSACTION_TYPE),
+            (("user123", "ACC1", -10, "regular"), INVALID_AMOUNT),
+            (("user123", "ACC1", math.nan, "regular"), INVALID_AMOUNT),
+            (("user123", "ACC1", math.inf, "regular"), INVALID_AMOUNT),
+            (("user123", "ACC1", 1e17, "regular"), INVALID_AMOUNT),
+            (("user123", "ACC1", 2000, "regular"), INSUFFICIENT_FUNDS),
+        ]
+        for arguments, status in cases:
+            self.assertEqual(engine.transfer_money(*arguments), status)
+        self.assertEqual(engine.balance("user123"), 1000)
+
+        engine.bank.users.set_password("ghost", "secret")
+        engine.authenticate("ghost", "secret")
+        self.assertEqual(
+            engine.transfer_money("ghost", "ACC1", 1, "regular"), UNKNOWN_ACCOUNT
+        )
+
+    def test_rejected_transfer_opens_nothing(self):
+        """
+        Checks a receiver gets an account only once a transfer is accepted.
+        """
+        engine = self.engine
+        for number in range(10):
+            status = engine.transfer_money("user123", f"GHOST{number}", 2000, "regular")
+            self.assertEqual(status, INSUFFICIENT_FUNDS)
+        self.assertFalse(any(f"GHOST{number}" in engine.ledger for number in range(10)))
+        self.assertEqual(
+            engine.transfer_money("user123", "GHOST0", 20, "regular"), TRANSFER_OK
+        )
+        self.assertEqual(engine.balance("GHOST0"), 20)
+        self.assertEqual(engine.balance("user123"), 979.6)
+
+    def test_sessions(self):
+        """
+        Checks logins are tracked in the session store.
+        """
+        engine = self.engine
+        self.assertFalse(engine.authenticate("user123", "pass123"))
+        self.assertFalse(engine.authenticate("user123", "wrong"))
+        self.assertTrue(engine.logout("user123"))
+        self.assertEqual(
+            engine.transfer_money("user123", "ACC1", 1, "regular"), NOT_AUTHENTICATED
+        )
+
+    def test_fee_account_sender(self):
+        """
+        Checks a transfer out of the fee account does not lock it twice.
+        """
+        engine = self.engine
+        engine.transfer_money("user123", "ACC1", 100, "express")
+        fees = engine.ledger.fee_account
+        engine.sessions.login(fees)
+        status = engine.transfer_money(fees, "ACC1", 1, "regular")
+        self.assertEqual(status, TRANSFER_OK)
+        self.assertEqual(engine.balance(fees), 4)
+
+    def run_concurrently(self, engine, transfers, threads=8):
+        """
+        Runs (sender, receiver, amount) transfers from a thread pool.
+        """
+        with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+            return list(
+                pool.map(lambda row: engine.transfer_money(*row, "regular"), transfers)
+            )
+
+    def check_concurrent(self, engine, receivers):
+        """
+        Runs random transfers between hot accounts, and to receivers, from
+        many threads and checks no money is created or lost.
+
+        Returns the transfers and their statuses.
+        """
+        ledger = engine.ledger
+        for account in ACCOUNTS:
+            engine.ensure_account(account, 500)
+            engine.sessions.login(account)
+        total = int(ledger.balances().sum())
+
+        rng = np.random.default_rng(0)
+        senders = rng.choice(ACCOUNTS, 4000).tolist()
+        amounts = rng.integers(1, 100, 4000).tolist()
+        transfers = list(zip(senders, rng.choice(receivers, 4000).tolist(), amounts))
+        statuses = self.run_concurrently(engine, transfers)
+
+        self.assertEqual(set(statuses) - {TRANSFER_OK, INSUFFICIENT_FUNDS}, set())
+        self.assertIn(TRANSFER_OK, statuses)
+        self.assertEqual(int(ledger.balances().sum()), total)
+        self.assertGreaterEqual(ledger.balances().min(), 0)
+        fees = sum(
+            round(amount * 2)
+            for (_, _, amount), status in zip(transfers, statuses)
+            if status == TRANSFER_OK
+        )
+        self.assertEqual(ledger.balances()[ledger.row(ledger.fee_account)], fees)
+        return transfers, statuses
+
+    def test_concurrent_hot_accounts(self):
+        """
+        Checks concurrent transfers between a few accounts keep the books.
+        """
+        self.check_concurrent(self.engine, ACCOUNTS)
+
+    def test_concurrent_blocking(self):
+        """
+        Checks the same without optimistic retries.
+        """
+        self.check_concurrent(TransferEngine(retries=0), ACCOUNTS)
+
+    def test_concurrent_growth(self):
+        """
+        Checks receivers opened while other threads transfer are kept,
+        even when the ledger grows, and that only accepted transfers open
+        them.
+        """
+        engine = TransferEngine(BankingSystem(Ledger(capacity=2)))
+        receivers = ACCOUNTS + [f"NEW{number:03d}" for number in range(300)]
+        transfers, statuses = self.check_concurrent(engine, receivers)
+        paid = {
+            receiver
+            for (_, receiver, _), status in zip(transfers, statuses)
+            if status == TRANSFER_OK
+        }
+        self.assertGreater(len(paid - set(ACCOUNTS)), 50)
+        self.assertEqual(
+            set(engine.ledger),
+            paid | set(ACCOUNTS) | {"user123", engine.ledger.fee_account},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
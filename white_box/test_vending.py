@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""
+asyncio vending machine service unit tests.
+"""
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from white_box.class_exercises import VendingMachine
+from white_box.vending import VendingService
+
+COIN = "Coin Inserted. Select your drink."
+DRINK = "Drink Dispensed. Thank you!"
+INVALID = "Invalid operation in current state."
+
+
+class TestVendingService(unittest.IsolatedAsyncioTestCase):
+    """
+    VendingService unit tests.
+    """
+
+    async def test_events_applied_in_order(self):
+        """
+        Checks concurrent events of one machine are applied in send order.
+        """
+        async with VendingService() as service:
+            events = ["insert_coin", "insert_coin", "select_drink"] * 50
+            futures = [await service.send("kiosk", event) for event in events]
+            messages = await asyncio.gather(*futures)
+        self.assertEqual(messages, [COIN, INVALID, DRINK] * 50)
+        self.assertEqual(service.machines["kiosk"].state, "Ready")
+
+    async def test_many_machines(self):
+        """
+        Checks interleaved kiosks do not disturb each other.
+        """
+
+        async def kiosk(service, machine_id):
+            """
+            Buys three drinks.
+            """
+            results = []
+            for _ in range(3):
+                results.append(await service.submit(machine_id, "insert_coin"))
+                await asyncio.sleep(0)
+                results.append(await service.submit(machine_id, "select_drink"))
+            return results
+
+        async with VendingService(queue_size=2) as service:
+            results = await asyncio.gather(
+                *(kiosk(service, number) for number in range(200))
+            )
+        self.assertEqual(results, [[COIN, DRINK] * 3] * 200)
+        self.assertEqual(len(service.machines), 200)
+
+    async def test_unknown_event(self):
+        """
+        Checks unknown events raise ValueError.
+        """
+        async with VendingService() as service:
+            with self.assertRaises(ValueError):
+                await service.submit("kiosk", "refund")
+
+    async def test_failing_event(self):
+        """
+        Checks an event that raises fails its future and later events of
+        the machine are still applied.
+        """
+
+        def jam(machine):
+            """
+            Event that always fails.
+            """
+            raise RuntimeError(f"{machine.state} machine jammed")
+
+        with patch.dict(VendingMachine.EVENTS, {"jam": jam}):
+            async with VendingService() as service:
+                with self.assertRaises(RuntimeError):
+                    await asyncio.wait_for(service.submit("kiosk", "jam"), 1)
+                message = await asyncio.wait_for(
+                    service.submit("kiosk", "insert_coin"), 1
+                )
+        self.assertEqual(message, COIN)
+
+    async def test_closed_service(self):
+        """
+        Checks a closed service refuses events after draining the queues.
+        """
+        service = VendingService()
+        future = await service.send("kiosk", "insert_coin")
+        await service.close()
+        self.assertEqual(future.result(), COIN)
+        with self.assertRaises(RuntimeError):
+            await service.submit("kiosk", "select_drink")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+Write-ahead log and crash recovery unit tests.
+"""
+import concurrent.futures
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import BankingSystem
+from white_box.credentials import CredentialStore, Pbkdf2Hasher
+from white_box.ledger import INSUFFICIENT_FUNDS, NOT_AUTHENTICATED, TRANSFER_OK
+from white_box.wal import DurableBank, read_segment, recover, segments, snapshots
+
+ACCOUNTS = [f"ACC{number:02d}" for number in range(8)]
+
+
+class TestDurableBank(unittest.TestCase):
+    """
+    DurableBank unit tests.
+    """
+
+    def setUp(self):
+        """
+        Creates a scratch directory.
+        """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Removes the scratch directory.
+        """
+        shutil.rmtree(self.directory)
+
+    def reopen(self, bank, **kwargs):
+        """
+        Closes a bank and recovers it from its directory.
+        """
+        bank.close()
+        return DurableBank(self.directory, **kwargs)
+
+    def test_restart_keeps_state(self):
+        """
+        Checks balances, accounts and logins survive a restart.
+        """
+        bank = DurableBank(self.directory)
+        self.assertTrue(bank.authenticate("user123", "pass123"))
+        self.assertEqual(
+            bank.transfer_money("user123", "ACC1", 100, "express"), TRANSFER_OK
+        )
+        bank.open_account("ACC2", 50)
+
+        bank = self.reopen(bank)
+        self.assertEqual(bank.balance("user123"), 895)
+        self.assertEqual(bank.balance("ACC1"), 100)
+        self.assertEqual(bank.balance("ACC2"), 50)
+        self.assertEqual(bank.balance(bank.ledger.fee_account), 5)
+        self.assertFalse(bank.authenticate("user123", "pass123"))
+
+        self.assertTrue(bank.logout("user123"))
+        bank = self.reopen(bank)
+        self.assertEqual(
+            bank.transfer_money("user123", "ACC1", 1, "regular"), NOT_AUTHENTICATED
+        )
+        bank.close()
+
+    def test_restart_with_custom_users(self):
+        """
+        Checks the users of a bank, and the rows of accounts opened after a
+        restart, survive later restarts.
+        """
+        users = CredentialStore(Pbkdf2Hasher(iterations=1_000))
+        users.set_password("alice", "s3cret")
+        bank = DurableBank(self.directory, BankingSystem(users=users))
+        bank.close()
+
+        bank = DurableBank(self.directory)
+        self.assertNotIn("user123", bank.ledger)
+        bank.open_account("bob", 50)
+        self.assertTrue(bank.authenticate("alice", "s3cret"))
+        self.assertEqual(
+            bank.transfer_money("alice", "bob", 10, "regular"), TRANSFER_OK
+        )
+        bank.bank.users.set_password("carol", "pw")
+
+        bank = self.reopen(bank)
+        self.assertEqual(bank.balance("bob"), 60)
+        self.assertEqual(bank.balance("alice"), 989.8)
+        self.assertTrue(bank.bank.users.verify("alice", "s3cret"))
+        self.assertTrue(bank.bank.users.verify("carol", "pw"))
+        self.assertNotIn("user123", bank.bank.users)
+        bank.close()
+
+    def test_new_directory_only(self):
+        """
+        Checks a bank is only saved in a directory that holds none.
+        """
+        DurableBank(self.directory).close()
+        with self.assertRaises(ValueError):
+            DurableBank(self.directory, BankingSystem())
+
+    def test_torn_tail(self):
+        """
+        Checks a record cut short by a crash is dropped, and the bank keeps
+        logging after it.
+        """
+        bank = DurableBank(self.directory)
+        bank.authenticate("user123", "pass123")
+        bank.transfer_money("user123", "ACC1", 100, "regular")
+        bank.transfer_money("user123", "ACC1", 200, "regular")
+        bank.close()
+        path = segments(self.directory)[-1]
+        with open(path, "r+b") as file:
+            file.truncate(file.seek(0, 2) - 3)
+        self.assertEqual(len(list(read_segment(path))), 3)
+
+        bank = DurableBank(self.directory)
+        self.assertEqual(bank.balance("ACC1"), 100)
+        bank.transfer_money("user123", "ACC1", 300, "regular")
+        bank = self.reopen(bank)
+        self.assertEqual(bank.balance("ACC1"), 400)
+        self.assertEqual(bank.balance("user123"), 1000 - 400 * 1.02)
+        bank.close()
+
+    def test_snapshots_bound_the_log(self):
+        """
+        Checks snapshots replace the records they cover.
+        """
+        bank = DurableBank(self.directory, snapshot_every=10)
+        bank.authenticate("user123", "pass123")
+        for number in range(95):
+            bank.transfer_money("user123", ACCOUNTS[number % 8], 1, "scheduled")
+        self.assertEqual(len(snapshots(self.directory)), 1)
+        self.assertLessEqual(len(segments(self.directory)), 1)
+        self.assertLess(bank.wal.lsn - recover(self.directory).lsn + 1, 20)
+
+        expected = bank.ledger.balances().tolist()
+        bank = self.reopen(bank)
+        self.assertEqual(bank.ledger.balances().tolist(), expected)
+        self.assertEqual(bank.balance("user123"), 1000 - 95 * 1.01)
+        bank.close()
+
+    def test_group_commit(self):
+        """
+        Checks concurrent transfers share fsyncs and are all recovered.
+        """
+        bank = DurableBank(self.directory, snapshot_every=500)
+        for account in ACCOUNTS:
+            bank.ensure_account(account, 500)
+            bank.sessions.login(account)
+        rng = np.random.default_rng(0)
+        transfers = list(
+            zip(
+                rng.choice(ACCOUNTS, 2000).tolist(),
+                rng.choice(ACCOUNTS, 2000).tolist(),
+                rng.integers(1, 100, 2000).tolist(),
+            )
+        )
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            statuses = list(
+                pool.map(lambda row: bank.transfer_money(*row, "regular"), transfers)
+            )
+        self.assertEqual(set(statuses) - {TRANSFER_OK, INSUFFICIENT_FUNDS}, set())
+        self.assertLess(bank.wal.syncs, statuses.count(TRANSFER_OK))
+
+        expected = bank.ledger.balances().tolist()
+        bank = self.reopen(bank)
+        self.assertEqual(bank.ledger.balances().tolist(), expected)
+        bank.close()
+
+    def test_concurrent_open_and_transfer(self):
+        """
+        Checks credits to accounts opened by concurrent transfers are
+        recovered.
+        """
+        bank = DurableBank(self.directory, sync=False)
+        for account in ACCOUNTS[:4]:
+            bank.ensure_account(account, 500)
+            bank.sessions.login(account)
+        receivers = [f"NEW{number:03d}" for number in range(200)]
+        transfers = [
+            (sender, receiver, 1) for receiver in receivers for sender in ACCOUNTS[:4]
+        ]
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            statuses = list(
+                pool.map(lambda row: bank.transfer_money(*row, "regular"), transfers)
+            )
+        self.assertEqual(set(statuses), {TRANSFER_OK})
+
+        expected = bank.ledger.balances().tolist()
+        bank = self.reopen(bank)
+        self.assertEqual(bank.ledger.balances().tolist(), expected)
+        self.assertEqual(bank.balance("NEW000"), 4)
+        bank.close()
+
+    def test_logins_logged_in_order(self):
+        """
+        Checks concurrent logins and logouts of a user are recovered in the
+        order they happened.
+        """
+        bank = DurableBank(self.directory, sync=False)
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            list(
+                pool.map(
+                    lambda number: (
+                        bank.sessions.logout("user123")
+                        if number % 2
+                        else bank.sessions.login("user123")
+                    ),
+                    range(2000),
+                )
+            )
+        logged_in = bank.sessions.is_logged_in("user123")
+        bank = self.reopen(bank)
+        self.assertEqual(bank.sessions.is_logged_in("user123"), logged_in)
+        bank.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Weather advisory time-series unit tests.
+"""
+import unittest
+
+import numpy as np
+
+from white_box.class_exercises import get_weather_advisory
+from white_box.weather import (
+    ADVISORY_LABELS,
+    COLD,
+    HEAT,
+    NO_ADVISORY,
+    SustainedAdvisoryMonitor,
+    advisory_codes,
+    advisory_intervals,
+    sustained_mask,
+)
+
+
+class TestAdvisoryCodes(unittest.TestCase):
+    """
+    advisory_codes unit tests.
+    """
+
+    def test_matches_scalar(self):
+        """
+        Checks labels agree with get_weather_advisory, boundaries included.
+        """
+        readings = [(31, 71), (30, 71), (31, 70), (-0.5, 90), (0, 10), (35, 100)]
+        temperatures, humidities = zip(*readings)
+        codes = advisory_codes(temperatures, humidities)
+        self.assertEqual(
+            [ADVISORY_LABELS[code] for code in codes],
+            [get_weather_advisory(*reading) for reading in readings],
+        )
+
+    def test_no_rounding_near_thresholds(self):
+        """
+        Checks float64 readings just past a threshold are not rounded back
+        onto it, while float32 readings stay float32.
+        """
+        readings = [(30.00000001, 80), (31, 70.000001), (-1e-46, 50)]
+        temperatures, humidities = zip(*readings)
+        codes = advisory_codes(temperatures, humidities)
+        self.assertEqual(
+            [ADVISORY_LABELS[code] for code in codes],
+            [get_weather_advisory(*reading) for reading in readings],
+        )
+        self.assertEqual(codes.tolist(), [HEAT, HEAT, COLD])
+        codes = advisory_codes(np.float32(temperatures), np.float32(humidities))
+        self.assertEqual(codes.tolist(), [NO_ADVISORY, NO_ADVISORY, NO_ADVISORY])
+
+
+class TestAdvisoryIntervals(unittest.TestCase):
+    """
+    advisory_intervals unit tests.
+    """
+
+    def test_runs(self):
+        """
+        Checks runs of identical codes become intervals.
+        """
+        codes = [HEAT, HEAT, NO_ADVISORY, COLD, COLD, COLD]
+        intervals = advisory_intervals(codes)
+        self.assertEqual(intervals.starts.tolist(), [0, 2, 3])
+        self.assertEqual(intervals.ends.tolist(), [2, 3, 6])
+        self.assertEqual(intervals.codes.tolist(), [HEAT, NO_ADVISORY, COLD])
+
+    def test_timestamps(self):
+        """
+        Checks interval bounds can be expressed as timestamps.
+        """
+        intervals = advisory_intervals([HEAT, HEAT, COLD], timestamps=[10, 20, 30])
+        self.assertEqual(intervals.starts.tolist(), [10, 30])
+        self.assertEqual(intervals.ends.tolist(), [30, 30])
+
+    def test_empty(self):
+        """
+        Checks an empty series has no intervals.
+        """
+        self.assertEqual(len(advisory_intervals([]).starts), 0)
+
+
+class TestSustainedAdvisory(unittest.TestCase):
+    """
+    Sliding-window unit tests.
+    """
+
+    def test_monitor_whole_window(self):
+        """
+        Checks the advisory is sustained only after window heat samples.
+        """
+        monitor = SustainedAdvisoryMonitor(window=3)
+        results = [
+            monitor.update(temperature, 80) for temperature in (35, 35, 35, 20, 35)
+        ]
+        self.assertEqual(results, [False, False, True, False, False])
+
+    def test_monitor_matches_batch(self):
+        """
+        Checks the streaming monitor agrees with sustained_mask.
+        """
+        rng = np.random.default_rng(0)
+        temperatures = rng.uniform(25, 40, 500).astype(np.float32)
+        humidities = rng.uniform(60, 90, 500).astype(np.float32)
+        codes = advisory_codes(temperatures, humidities)
+
+        monitor = SustainedAdvisoryMonitor(window=10, min_count=7)
+        streamed = [monitor.update_code(code) for code in codes]
+
+        self.assertEqual(streamed, sustained_mask(codes, 10, 7).tolist())
+        self.assertTrue(any(streamed))
+
+    def test_invalid_window(self):
+        """
+        Checks a window shorter than one sample is rejected.
+        """
+        with self.assertRaises(ValueError):
+            SustainedAdvisoryMonitor(window=0)
+        with self.assertRaises(ValueError):
+            sustained_mask([HEAT] * 5, window=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tier tables: threshold ladders compiled into sorted-array lookups.
+
+A tier maps a numeric range to a value. A TierTable sorts its tiers by lower
+bound once, rejects overlapping tiers, and then finds the tier of a value with
+a binary search: bisect for one value, np.searchsorted for a whole array.
+Values that fall in no tier get the table default.
+"""
+import bisect
+import collections
+import math
+
+import numpy as np
+
+Tier = collections.namedtuple(
+    "Tier", "low high value low_closed high_closed", defaults=(True, True)
+)
+Tier.__doc__ = """
+A range of inputs mapped to a value. Both bounds are inclusive unless
+low_closed or high_closed is False; use math.inf for open-ended tiers.
+"""
+
+_NO_DEFAULT = object()
+
+
+def _is_empty(tier):
+    """
+    Tells whether a tier's range contains no value at all.
+    """
+    if tier.low == tier.high:
+        return not (tier.low_closed and tier.high_closed)
+    return tier.low > tier.high
+
+
+def _touching(first, second):
+    """
+    Tells how two consecutive tiers meet: "overlap", "gap" or "adjacent".
+    """
+    if second.low < first.high:
+        return "overlap"
+    if second.low > first.high:
+        return "gap"
+    if first.high_closed and second.low_closed:
+        return "overlap"
+    if not first.high_closed and not second.low_closed:
+        return "gap"
+    return "adjacent"
+
+
+class TierTable:  # pylint: disable=too-many-instance-attributes
+    """
+    A set of non-overlapping tiers compiled for fast lookups.
+    """
+
+    def __init__(self, tiers, default=_NO_DEFAULT):
+        """
+        Validates and compiles the tiers.
+
+        Raises ValueError for empty or overlapping tiers, and for gaps between
+        tiers when no default is given.
+        """
+        self.tiers = tuple(Tier(*tier) for tier in tiers)
+        self.default = None if default is _NO_DEFAULT else default
+
+        for tier in self.tiers:
+            if _is_empty(tier):
+                raise ValueError(f"Empty tier: {tier}")
+
+        order = sorted(
+            range(len(self.tiers)),
+            key=lambda i: (self.tiers[i].low, not self.tiers[i].low_closed),
+        )
+        ordered = [self.tiers[i] for i in order]
+        for first, second in zip(ordered, ordered[1:]):
+            if _touching(first, second) == "overlap":
+                raise ValueError(f"Overlapping tiers: {first} and {second}")
+
+        self.gaps = self._find_gaps(ordered)
+        if self.gaps and default is _NO_DEFAULT:
+            raise ValueError(f"Tiers leave gaps and have no default: {self.gaps}")
+
+        # Sorted columns for bisect and np.searchsorted. Positions point back
+        # at the tier order given by the caller; len(tiers) is the default.
+        self._lows = [tier.low for tier in ordered]
+        self._low_closed = [tier.low_closed for tier in ordered]
+        self._highs = [tier.high for tier in ordered]
+        self._high_closed = [tier.high_closed for tier in ordered]
+        self._values = [tier.value for tier in ordered]
+
+        self._position_array = np.array(order + [len(self.tiers)], dtype=np.intp)
+        self._low_array = np.array(self._lows, dtype=np.float64)
+        self._low_open_array = ~np.array(self._low_closed, dtype=bool)
+        self._high_array = np.array(self._highs, dtype=np.float64)
+        self._high_closed_array = np.array(self._high_closed, dtype=bool)
+        self._value_array = np.asarray(self.labels())
+
+    def _find_gaps(self, ordered):
+        """
+        Lists the ranges no tier covers, as tiers carrying the default value.
+        """
+        gaps = []
+        if not ordered:
+            return [Tier(-math.inf, math.inf, self.default)]
+        first, last = ordered[0], ordered[-1]
+        if first.low > -math.inf or not first.low_closed:
+            gaps.append(Tier(-math.inf, first.low, self.default, True, False))
+        for lower, upper in zip(ordered, ordered[1:]):
+            if _touching(lower, upper) == "gap":
+                gaps.append(
+                    Tier(
+                        lower.high,
+                        upper.low,
+                        self.default,
+                        not lower.high_closed,
+                        not upper.low_closed,
+                    )
+                )
+        if last.high < math.inf or not last.high_closed:
+            gaps.append(Tier(last.high, math.inf, self.default, False, True))
+        return gaps
+
+    def labels(self):
+        """
+        Returns the tier values in the given order followed by the default,
+        so that the indexes returned by index_many select from it.
+        """
+        return tuple(tier.value for tier in self.tiers) + (self.default,)
+
+    def lookup(self, value):
+        """
+        Returns the value of the tier containing value, or the default.
+        """
+        i = bisect.bisect_right(self._lows, value) - 1
+        if i >= 0 and value == self._lows[i] and not self._low_closed[i]:
+            i -= 1
+        if i >= 0 and (
+            value < self._highs[i] or (value == self._highs[i] and self._high_closed[i])
+        ):
+            return self._values[i]
+        return self.default
+
+    def index_many(self, values):
+        """
+        Returns, for every value, the index of its tier in the given order,
+        or len(tiers) for values that get the default.
+        """
+        values = np.asarray(values)
+        if not self._lows:
+            return np.full(values.shape, 0, dtype=np.intp)
+        i = np.searchsorted(self._low_array, values, side="right") - 1
+        clipped = np.maximum(i, 0)
+        i -= (
+            (i >= 0)
+            & (values == self._low_array[clipped])
+            & (self._low_open_array[clipped])
+        )
+        clipped = np.maximum(i, 0)
+        highs = self._high_array[clipped]
+        inside = (i >= 0) & (
+            (values < highs) | ((values == highs) & self._high_closed_array[clipped])
+        )
+        return self._position_array[np.where(inside, i, len(self._lows))]
+
+    def lookup_many(self, values):
+        """
+        Returns an array with the tier value of every input value.
+        """
+        return self._value_array[self.index_many(values)]
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hierarchical timing wheel and a TrafficLight phase scheduler built on it.
+
+The wheel counts time in ticks. Level 0 has one slot per tick; each slot of
+a higher level covers a whole turn of the level below it. A timer goes to
+the lowest level whose turn covers its delay, so scheduling and cancelling
+are O(1). When the wheel reaches the start of a higher-level slot, the
+timers of that slot are spread over the lower levels, and timers of the
+current level-0 slot fire.
+
+Time comes from an injectable clock: ManualClock makes runs deterministic
+and lets a simulation go as fast as the callbacks allow.
+"""
+import math
+import time
+
+
+class ManualClock:
+    """
+    Clock that only moves when told to.
+    """
+
+    def __init__(self, now=0.0):
+        """
+        Starts at the given time, in seconds.
+        """
+        self.now = now
+
+    def __call__(self):
+        """
+        Current time, like time.monotonic.
+        """
+        return self.now
+
+    def sleep(self, seconds):
+        """
+        Moves the clock forward instead of waiting, like time.sleep.
+        """
+        self.now += max(0.0, seconds)
+
+
+class Timer:  # pylint: disable=too-few-public-methods
+    """
+    Handle of a scheduled callback.
+    """
+
+    __slots__ = ("expires", "callback", "args", "cancelled")
+
+    def __init__(self, expires, callback, args):
+        """
+        Calls callback(*args) at tick expires.
+        """
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Prevents the callback from being called.
+        """
+        self.cancelled = True
+
+
+class TimingWheel:  # pylint: disable=too-many-instance-attributes
+    """
+    Hierarchical timing wheel.
+    """
+
+    def __init__(self, tick=0.1, slots=(256, 64, 64, 64), clock=time.monotonic):
+        """
+        Ticks last tick seconds; slots gives the number of slots per level.
+        Delays are rounded up to whole ticks.
+        """
+        self.tick = tick
+        self.clock = clock
+        self._start = clock()
+        self._current = 0
+        self._levels = [[[] for _ in range(count)] for count in slots]
+        self._spans = [math.prod(slots[:level]) for level in range(len(slots))]
+        self._range = self._spans[-1] * slots[-1]
+        self._pending = 0
+
+    def __len__(self):
+        """
+        Number of scheduled timers, including cancelled ones not yet dropped.
+        """
+        return self._pending
+
+    @property
+    def now(self):
+        """
+        Time reached by the wheel, on the clock's scale.
+        """
+        return self._start + self._current * self.tick
+
+    def schedule(self, delay, callback, *args):
+        """
+        Calls callback(*args) after delay seconds (at least one tick) and
+        returns its Timer.
+        """
+        ticks = max(1, math.ceil(delay / self.tick - 1e-9))
+        if ticks >= self._range:
+            raise ValueError("delay beyond the range of the wheel")
+        timer = Timer(self._current + ticks, callback, args)
+        self._insert(timer)
+        self._pending += 1
+        return timer
+
+    def _insert(self, timer):
+        """
+        Puts a timer in the slot of the lowest level covering its delay.
+        """
+        delay = timer.expires - self._current
+        for level, span in enumerate(self._spans):
+            slots = self._levels[level]
+            if delay < span * len(slots):
+                slots[timer.expires // span % len(slots)].append(timer)
+                return
+
+    def _step(self):
+        """
+        Moves one tick forward, cascading and firing timers.
+        """
+        self._current += 1
+        current = self._current
+        for level in range(len(self._levels) - 1, 0, -1):
+            span = self._spans[level]
+            if current % span == 0:
+                slots = self._levels[level]
+                index = current // span % len(slots)
+                timers, slots[index] = slots[index], []
+                for timer in timers:
+                    if timer.cancelled:
+                        self._pending -= 1
+                    else:
+                        self._insert(timer)
+        slots = self._levels[0]
+        index = current % len(slots)
+        timers, slots[index] = slots[index], []
+        for timer in timers:
+            self._pending -= 1
+            if not timer.cancelled:
+                timer.callback(*timer.args)
+
+    def advance_to(self, when):
+        """
+        Fires every timer due up to the given clock time.
+        """
+        target = math.floor((when - self._start) / self.tick + 1e-9)
+        while self._current < target:
+            if not self._pending:
+                self._current = target
+                break
+            self._step()
+
+    def poll(self):
+        """
+        Fires every timer due at the current clock time.
+        """
+        self.advance_to(self.clock())
+
+    def run_until(self, deadline, sleep=time.sleep):
+        """
+        Keeps firing timers on time until the clock reaches deadline.
+
+        Pass the sleep method of a ManualClock to run faster than real time.
+        """
+        while True:
+            self.poll()
+            now = self.clock()
+            if now >= deadline:
+                return
+            sleep(min(self.now + self.tick, deadline) - now)
+
+
+class PhaseScheduler:
+    """
+    Changes traffic lights at the end of each of their phases.
+    """
+
+    def __init__(self, wheel):
+        """
+        Uses the given TimingWheel.
+        """
+        self.wheel = wheel
+        self._timers = {}
+
+    def add(self, light, durations, elapsed=0.0):
+        """
+        Drives a light with a {state name: seconds} timing plan. elapsed is
+        the time already spent in the current phase.
+        """
+        missing = set(light.STATES) - set(durations)
+        if missing:
+            raise ValueError(f"No duration for {sorted(missing)}")
+        delay = durations[light.get_current_state()] - elapsed
+        self._timers[id(light)] = self.wheel.schedule(
+            delay, self._change, light, durations
+        )
+
+    def remove(self, light):
+        """
+        Stops driving a light.
+        """
+        self._timers.pop(id(light)).cancel()
+
+    def _change(self, light, durations):
+        """
+        Ends the current phase of a light and schedules the next one.
+        """
+        light.change_state()
+        self._timers[id(light)] = self.wheel.schedule(
+            durations[light.get_current_state()], self._change, light, durations
+        )
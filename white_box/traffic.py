@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+Array-backed simulation of many traffic lights.
+
+TrafficLightFleet keeps the state code of every light (see
+TrafficLight.STATES) in a single int8 array and advances all of them, or a
+masked subset, with one gather through the compiled change_state row.
+"""
+import numpy as np
+
+from white_box.class_exercises import TrafficLight
+
+# next_state[code] is the code TrafficLight.change_state moves to.
+NEXT_STATE = np.array(
+    [code for code, _ in TrafficLight.change_state.fsm_row], dtype=np.int8
+)
+STATE_LABELS = np.array(TrafficLight.STATES)
+
+
+def _power(table, steps):
+    """
+    Composes a transition table with itself steps times.
+    """
+    if steps < 0:
+        raise ValueError("steps must not be negative")
+    result = np.arange(table.size, dtype=table.dtype)
+    while steps:
+        if steps & 1:
+            result = table[result]
+        table = table[table]
+        steps >>= 1
+    return result
+
+
+class TrafficLightView:
+    """
+    One light of a fleet, usable like a TrafficLight.
+    """
+
+    __slots__ = ("fleet", "index")
+
+    def __init__(self, fleet, index):
+        """
+        Refers to light index of fleet; no state is copied.
+        """
+        self.fleet = fleet
+        self.index = index
+
+    @property
+    def state(self):
+        """
+        Name of the current state.
+        """
+        return TrafficLight.STATES[self.fleet.states[self.index]]
+
+    def change_state(self):
+        """
+        Function that changes the traffic light state.
+        """
+        states = self.fleet.states
+        states[self.index] = NEXT_STATE[states[self.index]]
+
+    def get_current_state(self):
+        """
+        Provides the current traffic light state.
+        """
+        return self.state
+
+
+class TrafficLightFleet:
+    """
+    Many traffic lights stored as one int8 array of state codes.
+    """
+
+    def __init__(self, size, states=None):
+        """
+        Creates size lights in the TrafficLight initial state, or with the
+        given state names or codes.
+        """
+        if states is None:
+            self.states = np.full(size, TrafficLight().state_code, dtype=np.int8)
+        else:
+            self.states = self.encode(states)
+            if self.states.shape != (size,):
+                raise ValueError("states must have one entry per light")
+
+    @staticmethod
+    def encode(states):
+        """
+        Converts state names or codes to an int8 code array.
+        """
+        states = np.asarray(states)
+        if states.dtype.kind in "USO":
+            codes = np.full(states.shape, -1, dtype=np.int8)
+            for code, name in enumerate(TrafficLight.STATES):
+                codes[states == name] = code
+        else:
+            codes = states.astype(np.int8)
+        if codes.size and (codes.min() < 0 or codes.max() >= NEXT_STATE.size):
+            raise ValueError("Unknown traffic light state")
+        return codes
+
+    def __len__(self):
+        """
+        Number of lights.
+        """
+        return self.states.size
+
+    def __getitem__(self, index):
+        """
+        Per-light view backed by the fleet array.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("light index out of range")
+        return TrafficLightView(self, index % len(self))
+
+    def change_state(self, mask=None, steps=1):
+        """
+        Advances every light, or only those selected by mask (a boolean
+        array or an array of indexes), by steps changes. Raises ValueError
+        for negative steps.
+        """
+        table = NEXT_STATE if steps == 1 else _power(NEXT_STATE, steps)
+        if mask is None:
+            np.take(table, self.states, out=self.states)
+        elif np.asarray(mask).dtype == bool:
+            # Lights left out keep their code: look them up in an identity
+            # table stored in front of the transition table.
+            size = np.int8(table.size)
+            masked = np.concatenate((np.arange(size, dtype=np.int8), table))
+            offsets = np.asarray(mask).view(np.int8) * size
+            np.take(masked, offsets + self.states, out=self.states)
+        else:
+            self.states[mask] = table[self.states[mask]]
+
+    def get_current_state(self, index=None):
+        """
+        Provides the state name of one light, or of every light as an array.
+        """
+        if index is None:
+            return STATE_LABELS[self.states]
+        return TrafficLight.STATES[self.states[index]]
+
+    def counts(self):
+        """
+        Number of lights in each state, as a {name: count} dict.
+        """
+        counts = np.bincount(self.states, minlength=NEXT_STATE.size)
+        return dict(zip(TrafficLight.STATES, counts.tolist()))
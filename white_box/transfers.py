@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""
+Concurrent money transfers over the ledger of a BankingSystem.
+
+TransferEngine lets many threads call transfer_money on one bank. Every
+account has its own lock, and a transfer holds the locks of its sender and
+receiver while it moves the money. Locks are always taken in one canonical
+order (ledger row order, the fee account last), so two transfers never wait
+on each other in a cycle.
+
+Hot accounts are locked optimistically: a transfer first tries to take its
+locks without blocking and, when one is busy, releases what it holds and
+retries after an exponential backoff, so it does not sit on a lock while
+queueing behind another. After the given number of retries it waits for the
+locks in canonical order.
+
+Every transfer posts a fee, so the fee account is locked on its own, only
+for that posting. Opening an account that makes the ledger grow replaces its
+balance array, so it takes every account lock first. A receiver outside the
+bank gets its account only once the sender has been debited, so rejected
+transfers open nothing. Login state lives in a
+thread-safe SessionStore instead of the logged_in_users set.
+"""
+import threading
+import time
+
+from white_box.class_exercises import TRANSFER_FEE_RATES, BankingSystem
+from white_box.ledger import (
+    INSUFFICIENT_FUNDS,
+    INVALID_AMOUNT,
+    INVALID_TRANSACTION_TYPE,
+    NOT_AUTHENTICATED,
+    TRANSFER_OK,
+    UNKNOWN_ACCOUNT,
+    is_valid_amount,
+    to_cents,
+)
+from white_box.sessions import SessionStore
+
+
+def _release(locks):
+    """
+    Releases held locks in reverse acquisition order.
+    """
+    for lock in reversed(locks):
+        lock.release()
+
+
+class TransferEngine:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe money transfers of a BankingSystem.
+    """
+
+    def __init__(self, bank=None, retries=4, backoff=0.0):
+        """
+        Wraps a bank (a new BankingSystem by default). A transfer tries to
+        take busy locks retries times, sleeping backoff seconds the first
+        time and twice as long after each failure, before it waits for them;
+        with no backoff it only yields to the other threads between tries.
+        """
+        self.bank = BankingSystem() if bank is None else bank
+        self.ledger = self.bank.ledger
+        self.retries = retries
+        self.backoff = backoff
+        self.sessions = SessionStore()
+        for username in self.bank.logged_in_users:
+            self.sessions.login(username)
+        self.sessions.on_change = self._session_changed
+        self.bank.users.on_change = self._user_changed
+        self._fee_row = self.ledger.row(self.ledger.fee_account)
+        self._open_lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(len(self.ledger))]
+
+    def _lock_key(self, row):
+        """
+        Sort key of the canonical lock order.
+        """
+        return row == self._fee_row, row
+
+    def _acquire(self, rows):
+        """
+        Takes the locks of rows, given in canonical order, and returns them.
+        """
+        locks = [self._locks[row] for row in rows]
+        delay = self.backoff
+        for _ in range(self.retries):
+            held = []
+            for lock in locks:
+                if not lock.acquire(blocking=False):
+                    break
+                held.append(lock)
+            else:
+                return locks
+            _release(held)
+            time.sleep(delay)
+            delay *= 2
+        for lock in locks:
+            lock.acquire()
+        return locks
+
+    def _open(self, account_number, balance):
+        """
+        Opens an account while the open lock is held.
+        """
+        if account_number in self.ledger:
+            raise ValueError(f"Account {account_number} already exists")
+        rows = sorted(range(len(self._locks)), key=self._lock_key)
+        self._locks.append(threading.Lock())
+        self._opening(account_number, to_cents(balance))
+        if len(self.ledger) < self.ledger.capacity:
+            return self.ledger.open_account(account_number, balance)
+        locks = [self._locks[row] for row in rows]
+        for lock in locks:
+            lock.acquire()
+        try:
+            return self.ledger.open_account(account_number, balance)
+        finally:
+            _release(locks)
+
+    def open_account(self, account_number, balance=0):
+        """
+        Opens an account with an opening balance and returns its row.
+
+        Accounts of a bank wrapped by an engine must be opened through it,
+        so that they get a lock and the ledger grows safely.
+        """
+        with self._open_lock:
+            return self._open(account_number, balance)
+
+    def ensure_account(self, account_number, balance=0):
+        """
+        Returns the row of an account, opening it when missing.
+        """
+        if account_number not in self.ledger:
+            with self._open_lock:
+                if account_number not in self.ledger:
+                    return self._open(account_number, balance)
+        return self.ledger.row(account_number)
+
+    def authenticate(self, username, password):
+        """
+        User authentication function, without printing.
+        """
+        if not self.bank.users.verify(username, password):
+            return False
+        return self.sessions.login(username) == "Login successful"
+
+    def logout(self, username):
+        """
+        Logs a user out, telling whether they were logged in.
+        """
+        return self.sessions.logout(username) == "Logout successful"
+
+    def transfer_money(self, sender, receiver, amount, transaction_type):
+        """
+        Function to perform a money transfer, safe to call from many
+        threads.
+
+        Returns a status code, indexing white_box.ledger.TRANSFER_STATUS_LABELS.
+        """
+        if not self.sessions.is_logged_in(sender):
+            return NOT_AUTHENTICATED
+        fee_rate = TRANSFER_FEE_RATES.get(transaction_type)
+        if fee_rate is None:
+            return INVALID_TRANSACTION_TYPE
+        fee = fee_rate * amount
+        if not is_valid_amount(amount, fee):
+            return INVALID_AMOUNT
+        if sender not in self.ledger:
+            return UNKNOWN_ACCOUNT
+        sender_row = self.ledger.row(sender)
+        amount_cents = to_cents(amount)
+        fee_cents = to_cents(fee)
+        if receiver in self.ledger:
+            moved = self._move(
+                sender_row, self.ledger.row(receiver), amount_cents, fee_cents
+            )
+        else:
+            moved = self._move_to_new(sender_row, receiver, amount_cents, fee_cents)
+        return TRANSFER_OK if moved else INSUFFICIENT_FUNDS
+
+    def _move_to_new(self, sender_row, receiver, amount_cents, fee_cents):
+        """
+        Moves the amount and the fee to a receiver outside the bank, which
+        gets an empty account only once the sender has been debited.
+        """
+        with self._locks[sender_row]:
+            if not self.ledger.debit_row(sender_row, amount_cents + fee_cents):
+                return False
+        # Opening may take every account lock, so the sender lock is released
+        # first; the transfer is logged once the money reaches the receiver.
+        receiver_row = self.ensure_account(receiver)
+        return self._move(
+            sender_row, receiver_row, amount_cents, fee_cents, debited=True
+        )
+
+    def _move(  # pylint: disable=too-many-arguments
+        self, sender_row, receiver_row, amount_cents, fee_cents, debited=False
+    ):
+        """
+        Moves the amount and the fee under the account locks, all or nothing.
+        With debited, the sender has already been debited under its lock.
+        """
+        ledger = self.ledger
+        rows = sorted({sender_row, receiver_row}, key=self._lock_key)
+        locks = self._acquire(rows)
+        try:
+            if not (debited or ledger.debit_row(sender_row, amount_cents + fee_cents)):
+                return False
+            ledger.credit_row(receiver_row, amount_cents)
+            self._moved(sender_row, receiver_row, amount_cents, fee_cents)
+            if self._fee_row in rows:
+                ledger.credit_row(self._fee_row, fee_cents)
+                return True
+        finally:
+            _release(locks)
+        with self._locks[self._fee_row]:
+            ledger.credit_row(self._fee_row, fee_cents)
+        return True
+
+    def _opening(self, account_number, cents):
+        """
+        Called with the open lock held just before an account is opened,
+        while no transfer can reach it yet. Does nothing here.
+        """
+
+    def _session_changed(self, username, logged_in):
+        """
+        Called with the session shard lock held when a user logs in or out.
+        Does nothing here.
+        """
+
+    def _user_changed(self, username, encoded):
+        """
+        Called with the credential store lock held when the password hash
+        of a user is stored. Does nothing here.
+        """
+
+    def _moved(self, sender_row, receiver_row, amount_cents, fee_cents):
+        """
+        Called with the sender and receiver locks held once a transfer has
+        moved its money, so that transfers touching the same account are
+        seen in the order they happened. Does nothing here.
+        """
+
+    def balance(self, account_number):
+        """
+        Balance of an account.
+        """
+        return self.ledger.balance(account_number)
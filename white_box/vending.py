@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+asyncio front-end serializing the events of many vending machines.
+
+Each machine gets its own queue and worker task: events for one machine are
+applied one at a time in arrival order, while the workers of different
+machines run concurrently on the same event loop.
+"""
+import asyncio
+
+from white_box.class_exercises import VendingMachine
+
+
+class VendingService:
+    """
+    Routes kiosk events to per-machine queues.
+
+    Use it as an async context manager, or call close when done.
+    """
+
+    def __init__(self, queue_size=0):
+        """
+        queue_size bounds each machine queue (0 for unbounded), so that a
+        flooding kiosk waits instead of growing memory.
+        """
+        self.queue_size = queue_size
+        self.machines = {}
+        self._queues = {}
+        self._workers = {}
+        self._closed = False
+
+    async def __aenter__(self):
+        """
+        Returns the service itself.
+        """
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+        Drains the queues and stops the workers.
+        """
+        await self.close()
+
+    def _queue(self, machine_id):
+        """
+        Returns the queue of a machine, starting its worker on first use.
+        """
+        queue = self._queues.get(machine_id)
+        if queue is None:
+            if self._closed:
+                raise RuntimeError("VendingService is closed")
+            queue = self._queues[machine_id] = asyncio.Queue(self.queue_size)
+            machine = self.machines[machine_id] = VendingMachine()
+            self._workers[machine_id] = asyncio.create_task(self._work(machine, queue))
+        return queue
+
+    @staticmethod
+    async def _work(machine, queue):
+        """
+        Applies the queued events of one machine in order. An event that
+        raises fails its own future and the worker goes on.
+        """
+        while True:
+            event, future = await queue.get()
+            try:
+                if not future.cancelled():
+                    try:
+                        future.set_result(event(machine))
+                    except Exception as exc:  # pylint: disable=broad-exception-caught
+                        # The caller gets the traceback without the frame of
+                        # this worker, whose clearing would stop it.
+                        future.set_exception(
+                            exc.with_traceback(exc.__traceback__.tb_next)
+                        )
+            finally:
+                queue.task_done()
+
+    async def submit(self, machine_id, event):
+        """
+        Queues an event ("insert_coin" or "select_drink") for a machine
+        and returns the message of the machine once it has been applied.
+        """
+        return await (await self.send(machine_id, event))
+
+    async def send(self, machine_id, event):
+        """
+        Queues an event for a machine and returns a future of its message
+        without waiting for it to be applied.
+        """
+        if self._closed:
+            raise RuntimeError("VendingService is closed")
+        function = VendingMachine.EVENTS.get(event)
+        if function is None:
+            raise ValueError(f"Unknown vending machine event: {event!r}")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue(machine_id).put((function, future))
+        return future
+
+    async def join(self):
+        """
+        Waits until every queued event has been applied.
+        """
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    async def close(self):
+        """
+        Applies the pending events, then stops the workers.
+        """
+        self._closed = True
+        await self.join()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
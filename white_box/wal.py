@@ -0,0 +1,464 @@
+# -*- coding: utf-8 -*-
+
+"""
+Write-ahead log, group commit and crash recovery of a banking system.
+
+DurableBank is a TransferEngine that appends every state change (account
+openings, password hashes, logins, logouts and transfers) to an append-only
+log before
+telling its caller the change happened. A record is a 16-byte header (log
+sequence number, payload length, CRC-32 of the payload) followed by a
+compact JSON payload; transfers are logged with the ledger rows and the
+amounts in cents that were actually moved, so replaying them does not depend
+on fee rates or balances.
+
+Durability uses group commit: a writer waiting for its record to reach the
+disk either finds an fsync already covering it, waits for the one in flight,
+or becomes the leader and flushes and fsyncs everything appended so far, so
+one fsync acknowledges all the writers that queued up behind it. Transfers
+append while they hold their account locks, so the log orders the transfers
+of every account as they happened, but wait for the fsync after releasing
+them. For the same reason an account is logged before it can receive
+transfers, and logins and logouts are logged under their session lock.
+
+Every snapshot_every records the log moves on to a new segment and a JSON
+snapshot of the balances, password hashes and logged-in users is built from the previous
+snapshot and the closed segments, which are then deleted. Recovery loads the
+newest snapshot and replays the segments after it, stopping at the first
+torn or corrupt record, so it is bounded by the snapshot interval.
+
+Accounts are logged by ledger row, so they must be opened through the bank;
+a recovered bank gets its users back from the log rather than from a new
+BankingSystem, which would open the accounts of its mock users unlogged.
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+
+from white_box.class_exercises import BankingSystem
+from white_box.credentials import CredentialStore
+from white_box.ledger import TRANSFER_OK, Ledger
+from white_box.transfers import TransferEngine
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_PREFIX = "snapshot-"
+SEGMENT_PREFIX = "wal-"
+
+_HEADER = struct.Struct("<QII")
+
+_OPEN = "open"
+_USER = "user"
+_LOGIN = "login"
+_LOGOUT = "logout"
+_TRANSFER = "transfer"
+
+
+def _files(directory, prefix, suffix):
+    """
+    Paths of the files of a directory with the given prefix and suffix,
+    in name order.
+    """
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        name
+        for name in os.listdir(directory)
+        if name.startswith(prefix) and name.endswith(suffix)
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+def snapshots(directory):
+    """
+    Paths of the snapshots in a directory, oldest first.
+    """
+    return _files(directory, SNAPSHOT_PREFIX, ".json")
+
+
+def segments(directory):
+    """
+    Paths of the log segments in a directory, oldest first.
+    """
+    return _files(directory, SEGMENT_PREFIX, ".log")
+
+
+def _fsync_directory(directory):
+    """
+    Makes the creation, renaming and removal of files in a directory durable.
+    """
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def read_segment(path):
+    """
+    Yields the (lsn, record) pairs of a segment, up to its end or its first
+    torn or corrupt record.
+    """
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            lsn, length, checksum = _HEADER.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            yield lsn, json.loads(payload)
+
+
+class State:
+    """
+    Balances, password hashes and logged-in users rebuilt from a snapshot
+    and log records.
+    """
+
+    def __init__(self, lsn=0, ledger=None, logged_in=(), users=None):
+        """
+        State as of the record lsn; users maps usernames to encoded password
+        hashes.
+        """
+        self.lsn = lsn
+        self.ledger = Ledger() if ledger is None else ledger
+        self.logged_in = set(logged_in)
+        self.users = {} if users is None else dict(users)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a snapshot file.
+        """
+        with open(path, encoding="utf-8") as file:
+            snapshot = json.load(file)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot version")
+        accounts = snapshot["accounts"]
+        ledger = Ledger(capacity=len(accounts), fee_account=accounts[0][0])
+        ledger.credit_row(0, accounts[0][1])
+        for account_number, cents in accounts[1:]:
+            ledger.credit_row(ledger.open_account(account_number), cents)
+        return cls(snapshot["lsn"], ledger, snapshot["logged_in"], snapshot["users"])
+
+    def dump(self, path, sync=True):
+        """
+        Writes a snapshot file atomically.
+        """
+        balances = self.ledger.balances().tolist()
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "lsn": self.lsn,
+            "accounts": [
+                [account_number, balances[row]]
+                for row, account_number in enumerate(self.ledger)
+            ],
+            "logged_in": sorted(self.logged_in, key=str),
+            "users": self.users,
+        }
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def apply(self, lsn, record):
+        """
+        Applies one log record.
+        """
+        kind = record[0]
+        if kind == _TRANSFER:
+            _, sender_row, receiver_row, amount_cents, fee_cents = record
+            ledger = self.ledger
+            ledger.credit_row(sender_row, -(amount_cents + fee_cents))
+            ledger.credit_row(receiver_row, amount_cents)
+            ledger.credit_row(ledger.row(ledger.fee_account), fee_cents)
+        elif kind == _OPEN:
+            self.ledger.credit_row(self.ledger.open_account(record[1]), record[2])
+        elif kind == _USER:
+            self.users[record[1]] = record[2]
+        elif kind == _LOGIN:
+            self.logged_in.add(record[1])
+        elif kind == _LOGOUT:
+            self.logged_in.discard(record[1])
+        else:
+            raise ValueError(f"Unknown log record at lsn {lsn}: {kind!r}")
+        self.lsn = lsn
+
+    def replay(self, paths, until=None):
+        """
+        Applies the records of segments that follow the state, up to the
+        record until when given.
+        """
+        for path in paths:
+            for lsn, record in read_segment(path):
+                if until is not None and lsn > until:
+                    return
+                if lsn > self.lsn:
+                    self.apply(lsn, record)
+
+
+def recover(directory):
+    """
+    Rebuilds the state saved in a directory, or returns None when it holds
+    no snapshot.
+    """
+    paths = snapshots(directory)
+    if not paths:
+        return None
+    state = State.load(paths[-1])
+    state.replay(segments(directory))
+    return state
+
+
+class WriteAheadLog:  # pylint: disable=too-many-instance-attributes
+    """
+    Append-only log segments with group commit.
+    """
+
+    def __init__(self, directory, lsn=0, sync=True):
+        """
+        Starts a new segment after the record lsn. Without sync, records
+        are written to the operating system but never fsynced.
+        """
+        self.directory = directory
+        self.sync = sync
+        self.lsn = lsn
+        self.durable_lsn = lsn
+        self.syncs = 0
+        self._syncing = False
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._file = self._segment(lsn + 1)
+
+    def _segment(self, first_lsn):
+        """
+        Creates the segment starting with the record first_lsn.
+        """
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{first_lsn:012d}.log")
+        file = open(path, "wb")  # pylint: disable=consider-using-with
+        if self.sync:
+            _fsync_directory(self.directory)
+        return file
+
+    def append(self, record):
+        """
+        Appends a record and returns its log sequence number.
+
+        The record is durable once commit(lsn) returns.
+        """
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self.lsn += 1
+            self._file.write(
+                _HEADER.pack(self.lsn, len(payload), zlib.crc32(payload)) + payload
+            )
+            return self.lsn
+
+    def commit(self, lsn=None):
+        """
+        Waits until the record lsn (the last one appended by default) is on
+        disk, fsyncing on behalf of every waiting writer when no other
+        writer does.
+        """
+        with self._lock:
+            lsn = self.lsn if lsn is None else lsn
+            while self.durable_lsn < lsn:
+                if self._syncing:
+                    self._synced.wait()
+                    continue
+                self._syncing = True
+                target = self.lsn
+                self._file.flush()
+                try:
+                    if self.sync:
+                        # Writers keep appending while the leader syncs.
+                        self._lock.release()
+                        try:
+                            os.fsync(self._file.fileno())
+                        finally:
+                            self._lock.acquire()  # pylint: disable=consider-using-with
+                finally:
+                    self._syncing = False
+                    self._synced.notify_all()
+                self.durable_lsn = max(self.durable_lsn, target)
+                self.syncs += 1
+
+    def rotate(self):
+        """
+        Makes every appended record durable and moves on to a new segment.
+
+        Returns the lsn of the last record of the closed segments.
+        """
+        with self._lock:
+            while self._syncing:
+                self._synced.wait()
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self.durable_lsn = self.lsn
+            self._file = self._segment(self.lsn + 1)
+            self._synced.notify_all()
+            return self.lsn
+
+    def close(self):
+        """
+        Makes every appended record durable and closes the log.
+        """
+        self.commit()
+        with self._lock:
+            self._file.close()
+
+
+class DurableBank(TransferEngine):
+    """
+    A TransferEngine whose state survives restarts.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, directory, bank=None, snapshot_every=100_000, sync=True, **kwargs
+    ):
+        """
+        Recovers the bank saved in directory or, when there is none, saves
+        bank (a new BankingSystem by default) there. Other keyword arguments
+        go to TransferEngine.
+        """
+        os.makedirs(directory, exist_ok=True)
+        state = recover(directory)
+        if state is None:
+            bank = BankingSystem() if bank is None else bank
+            state = State(0, bank.ledger, bank.logged_in_users, bank.users.hashes())
+            state.dump(self._snapshot_path(directory, 0), sync)
+        elif bank is not None:
+            raise ValueError(f"{directory} already holds a bank")
+        else:
+            # Users are added once the bank is built, so that it opens no
+            # account of its own.
+            bank = BankingSystem(state.ledger, CredentialStore())
+            for username, encoded in state.users.items():
+                bank.users.set_hash(username, encoded)
+            bank.logged_in_users = state.logged_in
+        super().__init__(bank, **kwargs)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.snapshot_lsn = state.lsn
+        self._snapshot_lock = threading.Lock()
+        self.wal = WriteAheadLog(directory, state.lsn, sync)
+
+    @staticmethod
+    def _snapshot_path(directory, lsn):
+        """
+        Path of the snapshot of the state as of the record lsn.
+        """
+        return os.path.join(directory, f"{SNAPSHOT_PREFIX}{lsn:012d}.json")
+
+    def _opening(self, account_number, cents):
+        """
+        Logs an account before it is opened, so that it comes before any
+        transfer to it.
+        """
+        self.wal.append([_OPEN, account_number, cents])
+
+    def _session_changed(self, username, logged_in):
+        """
+        Logs a login or logout while the session shard lock is held.
+        """
+        self.wal.append([_LOGIN if logged_in else _LOGOUT, username])
+
+    def _user_changed(self, username, encoded):
+        """
+        Logs the new password hash of a user while the store lock is held;
+        the record is made durable by the next commit.
+        """
+        self.wal.append([_USER, username, encoded])
+
+    def _moved(self, sender_row, receiver_row, amount_cents, fee_cents):
+        """
+        Logs a transfer while its account locks are held.
+        """
+        self.wal.append([_TRANSFER, sender_row, receiver_row, amount_cents, fee_cents])
+
+    def _commit(self):
+        """
+        Waits for the records appended so far, then snapshots the state if
+        the log has grown by snapshot_every records.
+        """
+        self.wal.commit()
+        if self.wal.lsn - self.snapshot_lsn >= self.snapshot_every:
+            self.snapshot(blocking=False)
+
+    def open_account(self, account_number, balance=0):
+        """
+        Opens an account with an opening balance and returns its row.
+        """
+        row = super().open_account(account_number, balance)
+        self._commit()
+        return row
+
+    def authenticate(self, username, password):
+        """
+        User authentication function, without printing.
+        """
+        if not super().authenticate(username, password):
+            return False
+        self._commit()
+        return True
+
+    def logout(self, username):
+        """
+        Logs a user out, telling whether they were logged in.
+        """
+        if not super().logout(username):
+            return False
+        self._commit()
+        return True
+
+    def transfer_money(self, sender, receiver, amount, transaction_type):
+        """
+        Function to perform a money transfer, returning once it is durable.
+        """
+        status = super().transfer_money(sender, receiver, amount, transaction_type)
+        if status == TRANSFER_OK:
+            self._commit()
+        return status
+
+    def snapshot(self, blocking=True):
+        """
+        Writes a snapshot of everything logged so far and deletes the log
+        segments and older snapshots it replaces.
+
+        Returns the snapshot path, or None when another snapshot is running
+        and blocking is false.
+        """
+        # pylint: disable-next=consider-using-with
+        if not self._snapshot_lock.acquire(blocking):
+            return None
+        try:
+            if self.wal.lsn == self.snapshot_lsn:
+                return self._snapshot_path(self.directory, self.snapshot_lsn)
+            closed = segments(self.directory)
+            lsn = self.wal.rotate()
+            state = State.load(self._snapshot_path(self.directory, self.snapshot_lsn))
+            state.replay(closed, until=lsn)
+            path = self._snapshot_path(self.directory, lsn)
+            state.dump(path, self.wal.sync)
+            for old in closed + snapshots(self.directory)[:-1]:
+                os.remove(old)
+            if self.wal.sync:
+                _fsync_directory(self.directory)
+            self.snapshot_lsn = lsn
+            return path
+        finally:
+            self._snapshot_lock.release()
+
+    def close(self):
+        """
+        Makes every logged change durable and closes the log.
+        """
+        self.wal.close()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+Weather advisories over sensor time series.
+
+advisory_codes classifies whole temperature/humidity arrays at once,
+advisory_intervals collapses runs of identical advisories into intervals, and
+SustainedAdvisoryMonitor tracks a sliding window over a live stream of
+readings with O(1) work per new sample.
+"""
+import collections
+
+import numpy as np
+
+NO_ADVISORY, HEAT, COLD = range(3)
+ADVISORY_LABELS = (
+    "No Specific Advisory",
+    "High Temperature and Humidity. Stay Hydrated.",
+    "Low Temperature. Bundle Up!",
+)
+
+Intervals = collections.namedtuple("Intervals", "starts ends codes")
+Intervals.__doc__ = """
+Runs of identical advisories. Run i covers samples starts[i] up to, but not
+including, ends[i] (or the matching timestamps when they were given).
+"""
+
+
+def _is_heat(temperature, humidity):
+    """
+    The condition of the heat advisory in get_weather_advisory.
+    """
+    return (temperature > 30) & (humidity > 70)
+
+
+def _as_readings(values):
+    """
+    values as a float array: float32 stays float32, the usual sensor
+    resolution, while wider input is not rounded.
+    """
+    values = np.asarray(values)
+    return values.astype(np.result_type(values, np.float32), copy=False)
+
+
+def advisory_codes(temperatures, humidities):
+    """
+    Classifies every reading (batch version of get_weather_advisory).
+
+    Returns int8 codes indexing ADVISORY_LABELS.
+    """
+    temperatures = _as_readings(temperatures)
+    humidities = _as_readings(humidities)
+    codes = np.full(temperatures.shape, NO_ADVISORY, dtype=np.int8)
+    codes[temperatures < 0] = COLD
+    codes[_is_heat(temperatures, humidities)] = HEAT
+    return codes
+
+
+def advisory_intervals(codes, timestamps=None):
+    """
+    Collapses consecutive identical advisory codes into intervals.
+
+    With timestamps, interval bounds are timestamps instead of sample indexes;
+    the end of the last interval is then the timestamp of its last sample.
+    """
+    codes = np.asarray(codes)
+    if codes.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return Intervals(empty, empty, codes)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    ends = np.append(starts[1:], codes.size)
+    if timestamps is not None:
+        timestamps = np.asarray(timestamps)
+        return Intervals(
+            timestamps[starts],
+            timestamps[np.minimum(ends, codes.size - 1)],
+            codes[starts],
+        )
+    return Intervals(starts, ends, codes[starts])
+
+
+def sustained_mask(codes, window, min_count=None, code=HEAT):
+    """
+    Marks the samples at which at least min_count of the last window samples
+    (window by default) had the given advisory.
+
+    This is the batch counterpart of SustainedAdvisoryMonitor.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    min_count = window if min_count is None else min_count
+    hits = np.cumsum(np.asarray(codes) == code, dtype=np.int64)
+    in_window = hits.copy()
+    in_window[window:] -= hits[:-window]
+    return in_window >= min_count
+
+
+class SustainedAdvisoryMonitor:
+    """
+    Sliding-window detector for a sustained advisory, such as a heat
+    advisory lasting a whole window, over a live stream of readings.
+    """
+
+    def __init__(self, window, min_count=None, code=HEAT):
+        """
+        Watches the last window samples for min_count (window by default)
+        samples with the given advisory.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.min_count = window if min_count is None else min_count
+        self.code = code
+        self.count = 0
+        self._samples = collections.deque(maxlen=window)
+
+    def update(self, temperature, humidity):
+        """
+        Adds one reading and tells whether the advisory is now sustained.
+        """
+        if _is_heat(temperature, humidity):
+            current = HEAT
+        elif temperature < 0:
+            current = COLD
+        else:
+            current = NO_ADVISORY
+        return self.update_code(current)
+
+    def update_code(self, current):
+        """
+        Adds one already classified sample, in O(1).
+        """
+        hit = current == self.code
+        if len(self._samples) == self.window:
+            self.count -= self._samples[0]
+        self._samples.append(hit)
+        self.count += hit
+        return self.count >= self.min_count